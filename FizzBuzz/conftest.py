@@ -0,0 +1,5 @@
+import os
+import sys
+
+# fizzbuzz.py usa salida.py, que está en la carpeta de arriba
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,196 @@
+"""
+Motor de FizzBuzz con reglas arbitrarias (divisor, etiqueta)
+
+Cada número recibe la concatenación de las etiquetas de los divisores que
+lo dividen, en el orden de las reglas, o el propio número si ninguno lo
+divide. Como el resultado solo depende de i % mcm(divisores), las etiquetas
+se precalculan una vez para todo el ciclo y se repiten:
+- en texto, un bloque de varios ciclos se formatea con una sola plantilla
+- con NumPy, los códigos de todo un rango se obtienen repitiendo el ciclo
+
+    escribir_fizzbuzz(1, 51)                            # el ejercicio clásico
+    escribir_fizzbuzz(1, 10**6, [(2, "Par"), (7, "Siete")], "salida.txt")
+"""
+
+import argparse
+import math
+from itertools import islice
+
+from salida import EscritorFilas
+
+REGLAS_FIZZBUZZ = ((3, "Fizz"), (5, "Buzz"))
+
+# Ciclo más largo que se precalcula; con divisores cuyo mcm lo supera se
+# etiqueta número por número
+MAX_CICLO = 1 << 20
+
+# Números por bloque de texto (se redondea a ciclos completos)
+TAM_BLOQUE_FIZZBUZZ = 1 << 16
+
+# Como mucho 16 reglas: el código de cada número es una máscara de 16 bits
+MAX_REGLAS = 16
+
+
+def _validar_reglas(reglas):
+    """
+    Retorna las reglas como tupla de (divisor, etiqueta) validadas
+    """
+    reglas = tuple((int(divisor), str(etiqueta)) for divisor, etiqueta in reglas)
+    if not reglas:
+        raise ValueError("Se necesita al menos una regla")
+    if len(reglas) > MAX_REGLAS:
+        raise ValueError(f"Como mucho {MAX_REGLAS} reglas")
+    for divisor, _ in reglas:
+        if divisor < 1:
+            raise ValueError(f"Los divisores deben ser positivos: {divisor}")
+    return reglas
+
+
+def leer_regla(texto):
+    """
+    Convierte "DIVISOR=ETIQUETA" en (divisor, etiqueta), para argparse
+    """
+    divisor, separador, etiqueta = texto.partition("=")
+    if not separador or not etiqueta:
+        raise argparse.ArgumentTypeError(f"se esperaba DIVISOR=ETIQUETA: {texto!r}")
+    try:
+        divisor = int(divisor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"el divisor debe ser un entero: {divisor!r}") from None
+    if divisor < 1:
+        raise argparse.ArgumentTypeError(f"el divisor debe ser positivo: {divisor}")
+    return divisor, etiqueta
+
+
+def etiquetas_por_codigo(reglas):
+    """
+    Retorna la lista que traduce cada código (máscara de las reglas que se
+    cumplen) a su etiqueta; el código 0 no tiene etiqueta ("")
+    """
+    reglas = _validar_reglas(reglas)
+    return ["".join(etiqueta for k, (_, etiqueta) in enumerate(reglas) if codigo >> k & 1)
+            for codigo in range(1 << len(reglas))]
+
+
+def ciclo_codigos(reglas):
+    """
+    Retorna (longitud del ciclo, códigos de los restos 0..longitud-1)
+    El código de i es el de i % longitud
+    """
+    reglas = _validar_reglas(reglas)
+    longitud = math.lcm(*(divisor for divisor, _ in reglas))
+    if longitud > MAX_CICLO:
+        raise ValueError(f"El ciclo de {longitud} supera MAX_CICLO ({MAX_CICLO})")
+    codigos = [0] * longitud
+    for k, (divisor, _) in enumerate(reglas):
+        for resto in range(0, longitud, divisor):
+            codigos[resto] |= 1 << k
+    return longitud, codigos
+
+
+def etiquetar(i, reglas=REGLAS_FIZZBUZZ):
+    """
+    Etiqueta de un solo número (versión directa, sin precálculo)
+    """
+    etiqueta = "".join(texto for divisor, texto in _validar_reglas(reglas) if i % divisor == 0)
+    return etiqueta or str(i)
+
+
+def iter_fizzbuzz(inicio, fin, reglas=REGLAS_FIZZBUZZ):
+    """
+    Generador de las etiquetas de range(inicio, fin)
+    """
+    reglas = _validar_reglas(reglas)
+    try:
+        longitud, codigos = ciclo_codigos(reglas)
+    except ValueError:
+        for i in range(inicio, fin):
+            yield etiquetar(i, reglas)
+        return
+    etiquetas = etiquetas_por_codigo(reglas)
+    for i in range(inicio, fin):
+        codigo = codigos[i % longitud]
+        yield etiquetas[codigo] if codigo else str(i)
+
+
+def codigos_fizzbuzz(inicio, fin, reglas=REGLAS_FIZZBUZZ):
+    """
+    Códigos (máscaras uint16) de range(inicio, fin) en un arreglo de NumPy
+    etiquetas_por_codigo(reglas) traduce cada código; 0 significa "el número"
+    Si el ciclo entra en MAX_CICLO se repite; si no, se usan máscaras de módulo
+    """
+    import numpy as np
+
+    reglas = _validar_reglas(reglas)
+    cantidad = max(fin - inicio, 0)
+    try:
+        longitud, codigos = ciclo_codigos(reglas)
+    except ValueError:
+        numeros = np.arange(inicio, inicio + cantidad, dtype=np.int64)
+        resultado = np.zeros(cantidad, dtype=np.uint16)
+        for k, (divisor, _) in enumerate(reglas):
+            resultado[numeros % divisor == 0] |= np.uint16(1 << k)
+        return resultado
+    ciclo = np.roll(np.array(codigos, dtype=np.uint16), -(inicio % longitud))
+    return np.resize(ciclo, cantidad)
+
+
+def bloques_fizzbuzz(inicio, fin, reglas=REGLAS_FIZZBUZZ, tam_bloque=TAM_BLOQUE_FIZZBUZZ):
+    """
+    Genera el texto de range(inicio, fin) (una etiqueta por línea) en bloques
+    Los ciclos completos se formatean con una plantilla precalculada, así
+    que por número solo se calcula y se formatea el entero
+    """
+    reglas = _validar_reglas(reglas)
+    try:
+        longitud, codigos = ciclo_codigos(reglas)
+    except ValueError:
+        longitud = None
+    if longitud is None or fin - inicio < 2 * longitud:
+        etiquetas = iter_fizzbuzz(inicio, fin, reglas)
+        while True:
+            bloque = list(islice(etiquetas, tam_bloque))
+            if not bloque:
+                return
+            yield "\n".join(bloque) + "\n"
+
+    # Tramo inicial hasta el primer múltiplo de la longitud del ciclo
+    alineado = -(-inicio // longitud) * longitud
+    if alineado > inicio:
+        yield "".join(e + "\n" for e in iter_fizzbuzz(inicio, alineado, reglas))
+
+    # Plantilla de un ciclo: las etiquetas fijas y %d donde va el número
+    etiquetas = etiquetas_por_codigo(reglas)
+    partes = [etiquetas[codigo].replace("%", "%%") if codigo else "%d" for codigo in codigos]
+    plantilla_ciclo = "\n".join(partes) + "\n"
+    libres = [resto for resto, codigo in enumerate(codigos) if not codigo]
+
+    ciclos_por_bloque = max(1, tam_bloque // longitud)
+    plantilla = plantilla_ciclo * ciclos_por_bloque
+    paso = ciclos_por_bloque * longitud
+    ultimo = fin - (fin - alineado) % longitud
+    base = alineado
+    while base < ultimo:
+        if base + paso > ultimo:
+            ciclos_por_bloque = (ultimo - base) // longitud
+            plantilla = plantilla_ciclo * ciclos_por_bloque
+            paso = ciclos_por_bloque * longitud
+        numeros = tuple(b + resto for b in range(base, base + paso, longitud) for resto in libres)
+        yield plantilla % numeros
+        base += paso
+
+    # Tramo final incompleto
+    if ultimo < fin:
+        yield "".join(e + "\n" for e in iter_fizzbuzz(ultimo, fin, reglas))
+
+
+def escribir_fizzbuzz(inicio, fin, reglas=REGLAS_FIZZBUZZ, destino=None):
+    """
+    Escribe las etiquetas de range(inicio, fin) en bloques con el escritor
+    de salida.py: a stdout, a un archivo (ruta) o a un flujo abierto
+    Retorna la cantidad de líneas escritas
+    """
+    with EscritorFilas(destino) as escritor:
+        for bloque in bloques_fizzbuzz(inicio, fin, reglas):
+            escritor.escribir_texto(bloque)
+    return max(fin - inicio, 0)
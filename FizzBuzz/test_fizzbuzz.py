@@ -0,0 +1,103 @@
+import argparse
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from fizzbuzz import (
+    REGLAS_FIZZBUZZ,
+    bloques_fizzbuzz,
+    codigos_fizzbuzz,
+    escribir_fizzbuzz,
+    etiquetas_por_codigo,
+    iter_fizzbuzz,
+    leer_regla,
+)
+
+# Conjuntos de reglas: el clásico, uno con "%" en la etiqueta (la plantilla
+# usa formato %) y uno cuyo ciclo supera MAX_CICLO (etiqueta número por número)
+CONJUNTOS_REGLAS = [
+    REGLAS_FIZZBUZZ,
+    ((2, "Par"), (7, "Siete"), (4, "100%")),
+    ((1021, "A"), (1031, "B"), (2, "-")),
+]
+
+RANGOS = [(1, 51), (0, 1), (5, 5), (10, 3), (7, 500), (-30, 40), (999, 5000)]
+
+
+def fizzbuzz_ingenuo(inicio, fin, reglas):
+    """FizzBuzz con el bucle directo, como referencia"""
+    lineas = []
+    for i in range(inicio, fin):
+        etiqueta = ""
+        for divisor, texto in reglas:
+            if i % divisor == 0:
+                etiqueta += texto
+        lineas.append(etiqueta or str(i))
+    return lineas
+
+
+def test_fizzbuzz_contra_bucle_directo():
+    """Test del ciclo precalculado y la plantilla contra el bucle directo"""
+    for reglas in CONJUNTOS_REGLAS:
+        for inicio, fin in RANGOS:
+            esperado = fizzbuzz_ingenuo(inicio, fin, reglas)
+
+            # Test 1: Generador de etiquetas
+            assert list(iter_fizzbuzz(inicio, fin, reglas)) == esperado, f"Falla {reglas} en {inicio}..{fin}"
+
+            # Test 2: Bloques de texto con plantilla, con varios tamaños de bloque
+            for tam_bloque in (1, 7, 64, 1 << 16):
+                texto = "".join(bloques_fizzbuzz(inicio, fin, reglas, tam_bloque))
+                assert texto.splitlines() == esperado, f"Falla {reglas} con bloques de {tam_bloque}"
+
+
+def test_codigos_fizzbuzz():
+    """Test de los códigos vectorizados con NumPy"""
+    pytest.importorskip("numpy")
+    for reglas in CONJUNTOS_REGLAS:
+        etiquetas = etiquetas_por_codigo(reglas)
+        for inicio, fin in RANGOS:
+            codigos = codigos_fizzbuzz(inicio, fin, reglas).tolist()
+            traducidos = [etiquetas[c] if c else str(i) for i, c in zip(range(inicio, fin), codigos)]
+            assert traducidos == fizzbuzz_ingenuo(inicio, fin, reglas), f"Falla {reglas} en {inicio}..{fin}"
+
+
+def test_escribir_fizzbuzz(tmp_path):
+    """Test de la escritura por bloques a archivo y a flujos"""
+    esperado = "".join(f"{e}\n" for e in fizzbuzz_ingenuo(1, 100001, REGLAS_FIZZBUZZ))
+
+    # Test 1: A un archivo
+    ruta = tmp_path / "fizzbuzz.txt"
+    assert escribir_fizzbuzz(1, 100001, destino=ruta) == 100000
+    assert ruta.read_text(encoding="utf-8") == esperado
+
+    # Test 2: A un flujo de texto y a uno con otra codificación
+    texto = io.StringIO()
+    escribir_fizzbuzz(1, 16, ((3, "Façil"),), texto)
+    assert texto.getvalue().splitlines()[2] == "Façil"
+    consola = io.TextIOWrapper(io.BytesIO(), encoding="cp1252")
+    escribir_fizzbuzz(3, 4, ((3, "Façil"),), consola)
+    assert consola.buffer.getvalue() == "Façil\n".encode("cp1252")
+
+
+def test_reglas_por_linea_de_comandos():
+    """Test de las reglas DIVISOR=ETIQUETA del programa"""
+    assert leer_regla("7=Siete") == (7, "Siete")
+    assert leer_regla("4=a=b") == (4, "a=b")
+    for texto in ["3Fizz", "3=", "x=Fizz", "0=Cero", "-2=Neg"]:
+        with pytest.raises(argparse.ArgumentTypeError):
+            leer_regla(texto)
+
+    # El programa informa el error sin traza
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    resultado = subprocess.run([sys.executable, "ejercicio_fizzbuzz", "--regla", "3Fizz"],
+                               capture_output=True, text=True, cwd=carpeta)
+    assert resultado.returncode == 2 and "DIVISOR=ETIQUETA" in resultado.stderr
+    assert "Traceback" not in resultado.stderr
+
+    resultado = subprocess.run([sys.executable, "ejercicio_fizzbuzz", "--hasta", "15", "--regla", "2=Par"],
+                               capture_output=True, text=True, cwd=carpeta, check=True)
+    assert resultado.stdout.splitlines() == fizzbuzz_ingenuo(1, 16, [(2, "Par")])
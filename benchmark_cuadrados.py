@@ -0,0 +1,157 @@
+# Benchmark de las implementaciones de cuadrados de ejercicio.autocompletar.py
+# Mide throughput (timeit) y memoria pico (tracemalloc) para cada variante y
+# cada n, y muestra una tabla para elegir la implementación por defecto
+#
+#   python benchmark_cuadrados.py                 # n = 10 .. 10^8
+#   python benchmark_cuadrados.py --hasta 1e6 --csv resultados.csv
+
+import argparse
+import csv
+import gc
+import statistics
+import sys
+import timeit
+import tracemalloc
+from collections import deque
+
+from autocompletar import cargar_autocompletar
+
+# Por encima de este n las variantes que construyen una lista de Python
+# necesitan varios GB (unos 36 bytes por elemento); se omiten salvo --todas
+MAX_N_LISTA = 10**7
+
+
+def obtener_variantes(modulo):
+    """
+    Retorna un dict nombre -> (función de n, construye lista)
+    El generador se consume sin guardar los valores
+    """
+    variantes = {
+        "comprension": (modulo.generar_cuadrados, True),
+        "append": (modulo.generar_cuadrados_tradicional, True),
+        "map_lambda": (modulo.generar_cuadrados_map, True),
+        "cuadrados": (modulo.cuadrados, True),
+        "generador": (lambda n: deque(modulo.iter_cuadrados(n), maxlen=0), False),
+    }
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        variantes["numpy_int64"] = (modulo.cuadrados_numpy, False)
+    return variantes
+
+
+def medir_variante(funcion, n, repeticiones=5):
+    """
+    Mide funcion(n): tiempo por llamada (mediana de repeticiones, con
+    timeit calibrando cuántas llamadas entran en ~0.2 s) y memoria pico
+    en una llamada aparte con tracemalloc, que hace más lento el código
+    """
+    temporizador = timeit.Timer(lambda: funcion(n))
+    llamadas, _ = temporizador.autorange()
+    tiempos = [t / llamadas for t in temporizador.repeat(repeat=repeticiones, number=llamadas)]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        resultado = funcion(n)
+        _, pico = tracemalloc.get_traced_memory()
+        del resultado
+    finally:
+        tracemalloc.stop()
+
+    segundos = statistics.median(tiempos)
+    return {
+        "segundos": segundos,
+        "elementos_por_segundo": n / segundos if segundos > 0 else float("inf"),
+        "memoria_pico_bytes": pico,
+    }
+
+
+def ejecutar_benchmark_cuadrados(valores_n, variantes=None, todas=False, repeticiones=5):
+    """
+    Ejecuta el benchmark para cada n y variante
+    Retorna una lista de filas (dicts) con variante, n y las mediciones
+    """
+    variantes = variantes or obtener_variantes(cargar_autocompletar())
+    filas = []
+    for n in valores_n:
+        for nombre, (funcion, es_lista) in variantes.items():
+            if es_lista and n > MAX_N_LISTA and not todas:
+                continue
+            fila = {"variante": nombre, "n": n}
+            fila.update(medir_variante(funcion, n, repeticiones))
+            filas.append(fila)
+    return filas
+
+
+def _formatear_bytes(cantidad):
+    for unidad in ("B", "KiB", "MiB"):
+        if cantidad < 1024:
+            return f"{cantidad:.0f} {unidad}"
+        cantidad /= 1024
+    return f"{cantidad:.1f} GiB"
+
+
+def _formatear_segundos(segundos):
+    for unidad, escala in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if segundos >= escala:
+            return f"{segundos / escala:.2f} {unidad}"
+    return f"{segundos / 1e-9:.0f} ns"
+
+
+def mostrar_tabla(filas):
+    """
+    Muestra la tabla de resultados y la variante más rápida para cada n
+    """
+    print(f"{'n':>11}  {'variante':<12} {'tiempo':>10} {'Melem/s':>9} {'memoria pico':>13}")
+    print("-" * 60)
+    for fila in filas:
+        print(f"{fila['n']:>11,}  {fila['variante']:<12} {_formatear_segundos(fila['segundos']):>10} "
+              f"{fila['elementos_por_segundo'] / 1e6:>9.1f} {_formatear_bytes(fila['memoria_pico_bytes']):>13}")
+
+    print("\nMás rápida por n:")
+    for n in sorted({fila["n"] for fila in filas}):
+        de_n = [fila for fila in filas if fila["n"] == n]
+        rapida = min(de_n, key=lambda fila: fila["segundos"])
+        listas = [fila for fila in de_n if fila["variante"] in ("comprension", "append", "map_lambda", "cuadrados")]
+        texto = f"{n:>11,}: {rapida['variante']}"
+        if listas:
+            texto += f" (lista: {min(listas, key=lambda fila: fila['segundos'])['variante']})"
+        print(texto)
+
+
+def guardar_csv(filas, ruta):
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=list(filas[0]))
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de las implementaciones de cuadrados")
+    parser.add_argument("--desde", type=float, default=10, help="Primer n (potencia de 10)")
+    parser.add_argument("--hasta", type=float, default=1e8, help="Último n (potencia de 10)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--todas", action="store_true",
+                        help=f"Medir también las listas con n > {MAX_N_LISTA:,}")
+    parser.add_argument("--csv", help="Guardar los resultados en un archivo CSV")
+    args = parser.parse_args(argumentos)
+
+    valores_n = []
+    n = int(args.desde)
+    while n <= args.hasta:
+        valores_n.append(n)
+        n *= 10
+
+    filas = ejecutar_benchmark_cuadrados(valores_n, todas=args.todas, repeticiones=args.repeticiones)
+    mostrar_tabla(filas)
+    if args.csv:
+        guardar_csv(filas, args.csv)
+        print(f"\nResultados guardados en {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Tipos numéricos intercambiables para la calculadora
+
+- "float": rápido (aritmética del procesador), pero 0.1 + 0.2 != 0.3 y los
+  errores de redondeo se acumulan en sumas largas
+- "decimal": decimal.Decimal con un contexto configurable (precisión y
+  redondeo); exacto para importes en base 10 hasta la precisión elegida.
+  Unas 2 a 4 veces más lento que float en lotes de expresiones y en sumas
+  largas de importes. Ojo: // y % truncan hacia cero (-7 // 2 == -3)
+- "fraccion": fractions.Fraction, racionales exactos sin límite de
+  precisión; el más lento (unas 5 a 10 veces float en expresiones y unas
+  70 en sumas largas) y el tamaño de numerador y denominador crece con cada
+  operación. No tiene pi, e ni sqrt; ** con exponente no entero da float,
+  y ** rechaza los resultados de más de MAX_BITS_EXACTO bits
+
+Los números de cada tipo se crean desde el texto ("0.1" es exactamente un
+décimo en decimal y en fraccion). benchmark_backends.py mide el costo de
+cada tipo sobre lotes grandes.
+"""
+
+import contextlib
+import decimal
+import math
+import re
+from collections import namedtuple
+from fractions import Fraction
+
+TIPOS_NUMERICOS = ("float", "decimal", "fraccion")
+
+# Exponente máximo de ** con fracciones (el resultado exacto crece sin límite)
+MAX_EXPONENTE_EXACTO = 10_000
+
+# Bits máximos del numerador o el denominador de una potencia exacta
+# (unos 40.000 dígitos): (10**10000)**1000 se rechaza sin calcularlo
+MAX_BITS_EXACTO = 1 << 17
+
+# Exponente decimal máximo de un número exacto escrito como texto ("1e5"):
+# Fraction("1e999999999") construiría 10**999999999
+MAX_EXPONENTE_TEXTO = MAX_BITS_EXACTO * 3 // 10
+
+_EXPONENTE_TEXTO = re.compile(r"[eE]\s*([-+]?[\d_]+)")
+
+# Constantes con más dígitos que cualquier precisión habitual de Decimal
+_PI = "3.14159265358979323846264338327950288419716939937510582097494459"
+_E = "2.71828182845904523536028747135266249775724709369995957496696763"
+
+NOMBRES = {
+    "pi": math.pi,
+    "e": math.e,
+    "sqrt": math.sqrt,
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+}
+
+NOMBRES_DECIMAL = {
+    "pi": decimal.Decimal(_PI),
+    "e": decimal.Decimal(_E),
+    "sqrt": lambda x: decimal.Decimal(x).sqrt(),
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+}
+
+
+def _potencia_exacta(base, exponente):
+    """
+    base ** exponente con fracciones, rechazando exponentes enormes y
+    resultados demasiado grandes (estimados antes de calcularlos)
+    """
+    if abs(base) in (0, 1) or Fraction(exponente).denominator != 1:
+        # Resultado trivial, o exponente no entero (da float)
+        return base ** exponente
+    if abs(exponente) > MAX_EXPONENTE_EXACTO:
+        raise OverflowError(f"Exponente demasiado grande para un resultado exacto: {exponente}")
+    base = Fraction(base)
+    bits = max(base.numerator.bit_length(), base.denominator.bit_length()) * abs(int(exponente))
+    if bits > MAX_BITS_EXACTO:
+        raise OverflowError(f"Resultado demasiado grande para un resultado exacto (~{bits} bits)")
+    return base ** exponente
+
+
+def _fraccion(valor):
+    """
+    Fraction desde un número o un texto, rechazando exponentes enormes
+    """
+    if isinstance(valor, str):
+        exponente = _EXPONENTE_TEXTO.search(valor)
+        if exponente and abs(int(exponente.group(1).replace("_", ""))) > MAX_EXPONENTE_TEXTO:
+            raise OverflowError(f"Exponente demasiado grande para un número exacto: {valor.strip()!r}")
+    return Fraction(valor)
+
+
+NOMBRES_FRACCION = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "_potencia": _potencia_exacta,
+}
+
+
+class Backend(namedtuple("Backend", ["tipo", "convertir", "nombres", "contexto"])):
+    """
+    Tipo numérico de la calculadora
+    convertir: crea un número desde su texto; nombres: constantes y
+    funciones de las expresiones; contexto: decimal.Context (o None)
+    """
+
+    def entorno(self):
+        """
+        Contexto en el que hay que operar (el de Decimal, o ninguno)
+        """
+        if self.contexto is None:
+            return contextlib.nullcontext()
+        return decimal.localcontext(self.contexto)
+
+
+def crear_backend(tipo="float", precision=28, redondeo=decimal.ROUND_HALF_EVEN):
+    """
+    Crea el backend de un tipo numérico ("float", "decimal" o "fraccion")
+    precision y redondeo solo se usan con "decimal"
+    """
+    if tipo == "float":
+        return Backend("float", float, NOMBRES, None)
+    if tipo == "decimal":
+        contexto = decimal.Context(prec=precision, rounding=redondeo)
+        return Backend("decimal", decimal.Decimal, NOMBRES_DECIMAL, contexto)
+    if tipo == "fraccion":
+        return Backend("fraccion", _fraccion, NOMBRES_FRACCION, None)
+    raise ValueError(f"Tipo numérico no válido: {tipo!r} (opciones: {', '.join(TIPOS_NUMERICOS)})")
+
+
+BACKEND_FLOAT = crear_backend("float")
+
+
+def convertir_literal(tipo, texto, valor):
+    """
+    Convierte un literal de una expresión al tipo numérico, desde su texto
+    cuando se puede (así 0.1 no pasa por float); valor es el que leyó Python
+    Lanza OverflowError si el número exacto sería demasiado grande
+    """
+    if tipo == "float":
+        return float(valor)
+    constructor = decimal.Decimal if tipo == "decimal" else _fraccion
+    if isinstance(valor, int):
+        return constructor(valor)
+    try:
+        return constructor(texto.replace("_", ""))
+    except (ValueError, decimal.InvalidOperation, AttributeError):
+        return constructor(repr(valor))
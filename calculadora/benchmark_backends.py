@@ -0,0 +1,108 @@
+# Benchmark de los tipos numéricos de la calculadora (float, decimal, fraccion)
+# Mide cuántas expresiones por segundo evalúa cada tipo en un lote grande
+# (con la caché de compilación fría y caliente) y el costo y el error de
+# acumular muchos importes, para elegir el tipo según la carga
+#
+#   python benchmark_backends.py --expresiones 200000 --importes 1000000
+
+import argparse
+import random
+import sys
+import time
+from collections import deque
+from fractions import Fraction
+
+from backends import TIPOS_NUMERICOS, crear_backend
+from expresiones import compilar, evaluar_lote
+
+
+def generar_expresiones(cantidad, distintas, semilla=0):
+    """
+    Genera un lote de expresiones con importes de dos decimales; solo hay
+    `distintas` expresiones diferentes, repetidas al azar
+    """
+    azar = random.Random(semilla)
+    operadores = ["+", "-", "*", "/"]
+    base = [f"{azar.randint(1, 99999) / 100} {azar.choice(operadores)} "
+            f"({azar.randint(1, 9999) / 100} {azar.choice(operadores)} {azar.randint(1, 99) / 100})"
+            for _ in range(distintas)]
+    return [azar.choice(base) for _ in range(cantidad)]
+
+
+def medir_lote(backend, expresiones):
+    """
+    Evalúa el lote dos veces (caché de compilación fría y caliente)
+    Retorna las expresiones por segundo de cada pasada
+    """
+    compilar.cache_clear()
+    resultado = {}
+    for pasada in ("fria", "caliente"):
+        inicio = time.perf_counter()
+        deque(evaluar_lote(expresiones, backend), maxlen=0)
+        resultado[pasada] = len(expresiones) / (time.perf_counter() - inicio)
+    return resultado
+
+
+def medir_suma(backend, importes):
+    """
+    Suma los importes (textos con dos decimales) con el tipo numérico
+    Retorna los segundos y el error absoluto respecto de la suma exacta
+    """
+    exacta = sum(Fraction(importe) for importe in importes)
+    inicio = time.perf_counter()
+    with backend.entorno():
+        total = sum(map(backend.convertir, importes), backend.convertir("0"))
+    segundos = time.perf_counter() - inicio
+    return {"segundos": segundos, "error": abs(Fraction(total) - exacta)}
+
+
+def ejecutar_benchmark_backends(cantidad=200_000, distintas=5_000, importes=1_000_000, precision=28):
+    """
+    Ejecuta las mediciones para cada tipo numérico
+    Retorna una lista de filas (dicts)
+    """
+    expresiones = generar_expresiones(cantidad, distintas)
+    azar = random.Random(1)
+    montos = [f"{azar.randint(0, 10**7) / 100:.2f}" for _ in range(importes)]
+
+    filas = []
+    for tipo in TIPOS_NUMERICOS:
+        backend = crear_backend(tipo, precision)
+        fila = {"tipo": tipo}
+        fila.update(medir_lote(backend, expresiones))
+        suma = medir_suma(backend, montos)
+        fila["suma_segundos"] = suma["segundos"]
+        fila["suma_error"] = float(suma["error"])
+        filas.append(fila)
+    return filas
+
+
+def mostrar_tabla(filas):
+    """
+    Muestra los resultados, con la velocidad relativa a float
+    """
+    referencia = next(fila for fila in filas if fila["tipo"] == "float")
+    print(f"{'tipo':<10} {'expr/s (fría)':>14} {'expr/s (caliente)':>18} {'vs float':>9} "
+          f"{'suma (s)':>9} {'error de la suma':>17}")
+    print("-" * 82)
+    for fila in filas:
+        relativo = referencia["caliente"] / fila["caliente"]
+        print(f"{fila['tipo']:<10} {fila['fria']:>14,.0f} {fila['caliente']:>18,.0f} {relativo:>8.1f}x "
+              f"{fila['suma_segundos']:>9.3f} {fila['suma_error']:>17.3g}")
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los tipos numéricos de la calculadora")
+    parser.add_argument("--expresiones", type=int, default=200_000, help="Tamaño del lote")
+    parser.add_argument("--distintas", type=int, default=5_000, help="Expresiones diferentes en el lote")
+    parser.add_argument("--importes", type=int, default=1_000_000, help="Importes a sumar")
+    parser.add_argument("--precision", type=int, default=28, help="Precisión de Decimal")
+    args = parser.parse_args(argumentos)
+
+    filas = ejecutar_benchmark_backends(args.expresiones, args.distintas, args.importes, args.precision)
+    mostrar_tabla(filas)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,44 @@
-def calculadora():
+import argparse
+import operator
+import sys
+
+from backends import BACKEND_FLOAT, TIPOS_NUMERICOS, crear_backend
+from expresiones import ErrorExpresion, evaluar, procesar_lote
+
+# Operaciones de la calculadora: nombre -> (símbolo, función)
+OPERACIONES = {
+    "suma": ("+", operator.add),
+    "resta": ("-", operator.sub),
+    "multiplicación": ("*", operator.mul),
+    "división": ("/", operator.truediv),
+}
+
+
+def operar(operacion, num1, num2, backend=BACKEND_FLOAT):
+    """
+    Aplica una operación de la calculadora a dos números del tipo del backend
+    Lanza ZeroDivisionError al dividir por cero y ValueError si la operación no existe
+    """
+    if operacion not in OPERACIONES:
+        raise ValueError(f"Operación no válida: {operacion!r}")
+    if operacion == "división" and num2 == 0:
+        raise ZeroDivisionError("No se puede dividir por cero.")
+    # Operar en el contexto del tipo numérico (precisión de Decimal)
+    with backend.entorno():
+        return OPERACIONES[operacion][1](num1, num2)
+
+
+def calculadora(backend=BACKEND_FLOAT):
     """
     Calculadora simple que permite realizar operaciones básicas:
     suma, resta, multiplicación y división.
     El programa se ejecuta hasta que el usuario escriba "salir".
+    backend: tipo numérico (float por defecto, o Decimal / Fraction, ver backends.py)
     """
     
     print("=== CALCULADORA SIMPLE ===")
     print("Operaciones disponibles: suma, resta, multiplicación, división")
+    print("También puedes escribir una expresión completa, por ejemplo 2 * (3 + 4)")
     print("Escribe 'salir' para terminar el programa")
     print("-" * 40)
     
@@ -19,43 +51,98 @@ def calculadora():
             print("¡Gracias por usar la calculadora!")
             break
         
-        # Validar que la operación sea válida
-        operaciones_validas = ["suma", "resta", "multiplicación", "división"]
-        if operacion not in operaciones_validas:
-            print("❌ Operación no válida. Por favor, ingresa una operación válida.")
+        # Validar que la operación sea válida (o evaluarla como expresión)
+        if operacion not in OPERACIONES:
+            try:
+                print(f"\n✅ Resultado: {operacion} = {evaluar(operacion, backend)}")
+                print("-" * 40)
+            except ErrorExpresion:
+                print("❌ Operación no válida. Por favor, ingresa una operación o expresión válida.")
             continue
         
         # Solicitar los dos números
         try:
-            num1 = float(input("Ingresa el primer número: "))
-            num2 = float(input("Ingresa el segundo número: "))
-        except ValueError:
+            num1 = backend.convertir(input("Ingresa el primer número: ").strip())
+            num2 = backend.convertir(input("Ingresa el segundo número: ").strip())
+        except (ValueError, ArithmeticError):
             print("❌ Error: Por favor, ingresa números válidos.")
             continue
         
         # Realizar la operación según la selección del usuario
-        resultado = None
-        
-        if operacion == "suma":
-            resultado = num1 + num2
-            simbolo = "+"
-        elif operacion == "resta":
-            resultado = num1 - num2
-            simbolo = "-"
-        elif operacion == "multiplicación":
-            resultado = num1 * num2
-            simbolo = "*"
-        elif operacion == "división":
-            if num2 == 0:
-                print("❌ Error: No se puede dividir por cero.")
-                continue
-            resultado = num1 / num2
-            simbolo = "/"
+        try:
+            resultado = operar(operacion, num1, num2, backend)
+        except ArithmeticError as error:
+            print(f"❌ Error: {error}")
+            continue
+        simbolo = OPERACIONES[operacion][0]
         
         # Mostrar el resultado
         print(f"\n✅ Resultado: {num1} {simbolo} {num2} = {resultado}")
         print("-" * 40)
 
+def main(argumentos=None):
+    """
+    Sin argumentos abre la calculadora interactiva; con --lote evalúa un
+    archivo (o stdin) de expresiones, una por línea, y con --columnas evalúa
+    una expresión sobre todas las filas de un CSV
+    """
+    parser = argparse.ArgumentParser(description="Calculadora simple")
+    parser.add_argument("--lote", nargs="?", const="-", metavar="ARCHIVO",
+                        help="Evaluar expresiones de un archivo ('-' o nada: stdin)")
+    parser.add_argument("--columnas", metavar="CSV",
+                        help="Evaluar --expresion sobre las columnas de un CSV (vectorizado)")
+    parser.add_argument("--expresion", help="Expresión con los nombres de las columnas, ej. 'precio * cantidad'")
+    parser.add_argument("--division-cero", choices=("nan", "mascara", "error"), default="nan",
+                        help="Qué hacer en las filas que dividen por cero (modo --columnas)")
+    parser.add_argument("--salida", help="Archivo para los resultados (por defecto stdout)")
+    parser.add_argument("--tipo", choices=TIPOS_NUMERICOS, default="float",
+                        help="Tipo numérico de la calculadora y del modo --lote")
+    parser.add_argument("--precision", type=int, default=28, help="Dígitos significativos con --tipo decimal")
+    args = parser.parse_args(argumentos)
+    backend = crear_backend(args.tipo, args.precision)
+
+    if args.columnas is not None:
+        if args.expresion is None:
+            parser.error("--columnas necesita --expresion")
+        from columnas import evaluar_csv
+        try:
+            resultado = evaluar_csv(args.columnas, args.expresion, args.division_cero, args.salida)
+        except (ZeroDivisionError, ValueError) as error:
+            print(f"❌ Error: {error}", file=sys.stderr)
+            return 1
+        if args.salida is None:
+            # Las filas enmascaradas (tolist las da como None) quedan vacías
+            print("\n".join("" if valor is None else str(valor) for valor in resultado.tolist()))
+        return 0
+
+    if args.lote is None:
+        calculadora(backend)
+        return 0
+
+    try:
+        entrada = sys.stdin if args.lote == "-" else open(args.lote, encoding="utf-8")
+    except OSError as error:
+        parser.error(f"no se pudo abrir {args.lote}: {error.strerror}")
+    try:
+        salida = open(args.salida, "wb", buffering=1 << 20) if args.salida else None
+    except OSError as error:
+        if entrada is not sys.stdin:
+            entrada.close()
+        parser.error(f"no se pudo crear {args.salida}: {error.strerror}")
+    try:
+        estadisticas = procesar_lote(entrada, salida, backend=backend)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not None:
+            salida.close()
+
+    cache = estadisticas["cache"]
+    print(f"{estadisticas['expresiones']} expresiones ({estadisticas['errores']} con error) en "
+          f"{estadisticas['segundos']:.3f} s: {estadisticas['expresiones_por_segundo']:,.0f} expr/s; "
+          f"caché {cache['aciertos']} aciertos / {cache['fallos']} fallos", file=sys.stderr)
+    return 0
+
 # Ejecutar la calculadora si el archivo se ejecuta directamente
 if __name__ == "__main__":
-    calculadora()
+    sys.exit(main())
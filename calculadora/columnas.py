@@ -0,0 +1,174 @@
+"""
+Calculadora por columnas: aplica una operación o una expresión a columnas
+enteras (arreglos de NumPy o columnas de un CSV) en una sola pasada vectorizada
+
+La división por cero (/, // y %) sigue una política elemento a elemento:
+- "nan": el resultado de esas filas es NaN
+- "mascara": se retorna un numpy.ma.MaskedArray con esas filas enmascaradas
+- "error": se lanza ZeroDivisionError si alguna fila divide por cero
+
+    operar_columnas(precios, cantidades, "multiplicación")
+    evaluar_columnas("total / cantidad", {"total": t, "cantidad": c}, "mascara")
+    evaluar_csv("ventas.csv", "precio * cantidad")
+"""
+
+import ast
+import csv
+import math
+
+import numpy as np
+
+from expresiones import ErrorExpresion, analizar
+
+POLITICAS_DIVISION = ("nan", "mascara", "error")
+
+# Operaciones de la calculadora interactiva -> símbolo
+SIMBOLOS = {"suma": "+", "resta": "-", "multiplicación": "*", "división": "/"}
+
+# Funciones y constantes disponibles, en su versión vectorizada
+NOMBRES_COLUMNAS = {
+    "pi": math.pi,
+    "e": math.e,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "round": np.round,
+    "min": np.minimum,
+    "max": np.maximum,
+}
+
+_DIVISIONES = {ast.Div: "dividir", ast.FloorDiv: "dividir_entero", ast.Mod: "resto"}
+
+
+class _Divisiones(ast.NodeTransformer):
+    """
+    Reemplaza a / b, a // b y a % b por llamadas que aplican la política
+    """
+
+    def visit_BinOp(self, nodo):
+        self.generic_visit(nodo)
+        funcion = _DIVISIONES.get(type(nodo.op))
+        if funcion is None:
+            return nodo
+        llamada = ast.Call(ast.Name("_" + funcion, ast.Load()), [nodo.left, nodo.right], [])
+        return ast.copy_location(llamada, nodo)
+
+
+def evaluar_columnas(expresion, columnas, division_cero="nan"):
+    """
+    Evalúa una expresión sobre columnas (dict nombre -> arreglo) elemento a elemento
+    Las columnas deben tener la misma longitud; los resultados son float64
+    division_cero: "nan", "mascara" o "error" (ver el módulo)
+    """
+    if division_cero not in POLITICAS_DIVISION:
+        raise ValueError(f"Política no válida: {division_cero!r} (opciones: {', '.join(POLITICAS_DIVISION)})")
+    columnas = {nombre: np.asarray(valores, dtype=np.float64) for nombre, valores in columnas.items()}
+    largos = {len(valores) for valores in columnas.values()}
+    if len(largos) > 1:
+        raise ValueError("Todas las columnas deben tener la misma longitud")
+    filas = largos.pop() if largos else 1
+
+    nombres = dict(NOMBRES_COLUMNAS, **columnas)
+    arbol = ast.fix_missing_locations(_Divisiones().visit(analizar(expresion, nombres)))
+    codigo = compile(arbol, "<columnas>", "eval")
+
+    ceros = []
+
+    def dividir_con_politica(operacion):
+        def dividir(a, b):
+            cero = np.asarray(b) == 0
+            if cero.any():
+                if division_cero == "error":
+                    fila = int(np.flatnonzero(np.broadcast_to(cero, (filas,)))[0])
+                    cantidad = int(np.count_nonzero(np.broadcast_to(cero, (filas,))))
+                    raise ZeroDivisionError(f"División por cero en {cantidad} filas (primera: {fila})")
+                ceros.append(cero)
+            resultado = operacion(a, b)
+            if cero.any():
+                resultado = np.where(cero, np.nan, resultado)
+            return resultado
+        return dividir
+
+    nombres["_dividir"] = dividir_con_politica(np.true_divide)
+    nombres["_dividir_entero"] = dividir_con_politica(np.floor_divide)
+    nombres["_resto"] = dividir_con_politica(np.mod)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        try:
+            resultado = eval(codigo, {"__builtins__": {}}, nombres)
+        except (TypeError, ValueError) as error:
+            raise ErrorExpresion(str(error)) from error
+    resultado = np.array(np.broadcast_to(resultado, (filas,)), dtype=np.float64)
+
+    if division_cero == "mascara":
+        mascara = np.zeros(filas, dtype=bool)
+        for cero in ceros:
+            mascara |= np.broadcast_to(cero, (filas,))
+        return np.ma.MaskedArray(resultado, mask=mascara)
+    return resultado
+
+
+def operar_columnas(a, b, operacion, division_cero="nan"):
+    """
+    Aplica una de las operaciones de la calculadora (suma, resta,
+    multiplicación, división o su símbolo) a dos columnas completas
+    """
+    simbolo = SIMBOLOS.get(operacion, operacion)
+    if simbolo not in SIMBOLOS.values():
+        raise ValueError(f"Operación no válida: {operacion!r}")
+    return evaluar_columnas(f"a {simbolo} b", {"a": a, "b": b}, division_cero)
+
+
+def leer_columnas_csv(ruta, nombres=None, delimitador=","):
+    """
+    Lee columnas numéricas de un CSV con encabezado
+    Retorna un dict nombre -> arreglo float64 (solo las columnas pedidas)
+    """
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        encabezado = [nombre.strip() for nombre in next(csv.reader(archivo, delimiter=delimitador))]
+    nombres = encabezado if nombres is None else list(nombres)
+    faltantes = [nombre for nombre in nombres if nombre not in encabezado]
+    if faltantes:
+        raise ValueError(f"Columnas inexistentes en {ruta}: {', '.join(faltantes)}")
+    if not nombres:
+        return {}
+    indices = [encabezado.index(nombre) for nombre in nombres]
+    datos = np.loadtxt(ruta, delimiter=delimitador, skiprows=1, usecols=indices,
+                       dtype=np.float64, ndmin=2, encoding="utf-8")
+    return {nombre: datos[:, i] for i, nombre in enumerate(nombres)}
+
+
+def evaluar_csv(ruta, expresion, division_cero="nan", salida=None, columna="resultado",
+                delimitador=","):
+    """
+    Evalúa una expresión sobre las columnas de un CSV (por su encabezado)
+    Si se indica salida, escribe el resultado como una columna de un CSV
+    (las filas enmascaradas quedan vacías). Retorna el arreglo de resultados
+    """
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        encabezado = [nombre.strip() for nombre in next(csv.reader(archivo, delimiter=delimitador))]
+    usadas = [nombre for nombre in encabezado
+              if nombre.isidentifier() and nombre in _nombres_de(expresion)]
+    resultado = evaluar_columnas(expresion, leer_columnas_csv(ruta, usadas, delimitador), division_cero)
+
+    if salida is not None:
+        with open(salida, "w", encoding="utf-8", newline="") as archivo:
+            archivo.write(columna + "\n")
+            if np.ma.isMaskedArray(resultado) and resultado.mask.any():
+                texto = np.char.mod("%s", resultado.filled(np.nan))
+                texto[resultado.mask] = ""
+                archivo.write("\n".join(texto.tolist()) + "\n")
+            elif len(resultado):
+                np.asarray(resultado).tofile(archivo, sep="\n")
+                archivo.write("\n")
+    return resultado
+
+
+def _nombres_de(expresion):
+    """
+    Nombres que aparecen en una expresión (sin validarla)
+    """
+    try:
+        return {nodo.id for nodo in ast.walk(ast.parse(expresion.strip(), mode="eval"))
+                if isinstance(nodo, ast.Name)}
+    except SyntaxError as error:
+        raise ErrorExpresion(f"Expresión mal formada: {expresion.strip()!r}") from error
@@ -0,0 +1,262 @@
+"""
+Evaluación de expresiones aritméticas para la calculadora
+
+Cada expresión se analiza con el módulo ast, se valida contra una lista de
+nodos permitidos (números, + - * / // % **, paréntesis y algunas constantes
+y funciones matemáticas) y se compila a bytecode una sola vez. Las formas
+compiladas se guardan en una caché LRU indexada por el texto, así que las
+expresiones repetidas de un lote no se vuelven a analizar.
+
+Los números pueden ser float, Decimal o Fraction (ver backends.py).
+
+    evaluar("2 * (3 + 4)")                  # 14.0
+    evaluar("0.1 + 0.2", crear_backend("decimal"))  # Decimal('0.3')
+    procesar_lote(open("expresiones.txt"))  # un resultado por línea a stdout
+"""
+
+import ast
+import decimal
+import io
+import sys
+import time
+from functools import lru_cache
+from itertools import islice
+
+from backends import (
+    BACKEND_FLOAT,
+    NOMBRES,
+    NOMBRES_DECIMAL,
+    NOMBRES_FRACCION,
+    convertir_literal,
+    crear_backend,
+)
+
+# Expresiones compiladas que se conservan en la caché
+TAM_CACHE_EXPRESIONES = 1 << 16
+
+# Líneas que se evalúan y se escriben juntas en el modo por lotes
+TAM_BLOQUE_LOTE = 1 << 12
+
+# Nombres disponibles dentro de las expresiones, por tipo numérico
+_NOMBRES_POR_TIPO = {"float": NOMBRES, "decimal": NOMBRES_DECIMAL, "fraccion": NOMBRES_FRACCION}
+
+_OPERADORES_BINARIOS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_OPERADORES_UNARIOS = (ast.UAdd, ast.USub)
+
+
+class ErrorExpresion(ValueError):
+    """
+    La expresión no es válida o no se puede evaluar
+    """
+
+
+class _Validador(ast.NodeTransformer):
+    """
+    Rechaza todo lo que no sea aritmética y convierte los literales al tipo
+    numérico: con float los enteros también pasan a float, como hace la
+    calculadora interactiva (así 9**9**9 desborda en vez de colgarse); con
+    Decimal o Fraction cada literal se reemplaza por un nombre _cN cuyo valor
+    queda en constantes, y con Fraction ** pasa por _potencia
+    nombres: los nombres que puede usar la expresión
+    """
+
+    def __init__(self, nombres=NOMBRES, tipo="float", texto=""):
+        self.nombres = nombres
+        self.tipo = tipo
+        self.texto = texto
+        self.constantes = {}
+
+    def visit_Expression(self, nodo):
+        self.generic_visit(nodo)
+        return nodo
+
+    def visit_Constant(self, nodo):
+        if isinstance(nodo.value, bool) or not isinstance(nodo.value, (int, float)):
+            raise ErrorExpresion(f"Constante no permitida: {nodo.value!r}")
+        if self.tipo == "float":
+            return ast.copy_location(ast.Constant(float(nodo.value)), nodo)
+        literal = ast.get_source_segment(self.texto, nodo) or repr(nodo.value)
+        nombre = f"_c{len(self.constantes)}"
+        try:
+            self.constantes[nombre] = convertir_literal(self.tipo, literal, nodo.value)
+        except (ArithmeticError, ValueError) as error:
+            raise ErrorExpresion(f"Número no válido: {literal} ({error})") from error
+        return ast.copy_location(ast.Name(nombre, ast.Load()), nodo)
+
+    def visit_BinOp(self, nodo):
+        if not isinstance(nodo.op, _OPERADORES_BINARIOS):
+            raise ErrorExpresion(f"Operador no permitido: {type(nodo.op).__name__}")
+        self.generic_visit(nodo)
+        if self.tipo == "fraccion" and isinstance(nodo.op, ast.Pow):
+            llamada = ast.Call(ast.Name("_potencia", ast.Load()), [nodo.left, nodo.right], [])
+            return ast.copy_location(llamada, nodo)
+        return nodo
+
+    def visit_UnaryOp(self, nodo):
+        if not isinstance(nodo.op, _OPERADORES_UNARIOS):
+            raise ErrorExpresion(f"Operador no permitido: {type(nodo.op).__name__}")
+        self.generic_visit(nodo)
+        return nodo
+
+    def _validar_nombre(self, nodo):
+        if nodo.id not in self.nombres or nodo.id.startswith("_"):
+            raise ErrorExpresion(f"Nombre desconocido: {nodo.id}")
+        return self.nombres[nodo.id]
+
+    def visit_Name(self, nodo):
+        # Fuera de una llamada solo valen constantes y columnas (sqrt sola no)
+        if callable(self._validar_nombre(nodo)):
+            raise ErrorExpresion(f"La función {nodo.id} debe llamarse con argumentos: {nodo.id}(...)")
+        return nodo
+
+    def visit_Call(self, nodo):
+        if not isinstance(nodo.func, ast.Name) or nodo.keywords:
+            raise ErrorExpresion("Solo se permiten llamadas simples a funciones conocidas")
+        if not callable(self._validar_nombre(nodo.func)):
+            raise ErrorExpresion(f"{nodo.func.id} no es una función")
+        nodo.args = [self.visit(argumento) for argumento in nodo.args]
+        return nodo
+
+    def generic_visit(self, nodo):
+        if not isinstance(nodo, (ast.Expression, ast.Constant, ast.BinOp, ast.UnaryOp,
+                                 ast.Name, ast.Call, ast.Load, ast.operator, ast.unaryop)):
+            raise ErrorExpresion(f"Elemento no permitido: {type(nodo).__name__}")
+        return super().generic_visit(nodo)
+
+
+def _analizar(texto, nombres, tipo):
+    """
+    Retorna el árbol validado y las constantes de los literales (si no es float)
+    """
+    texto = texto.strip()
+    try:
+        arbol = ast.parse(texto, mode="eval")
+    except (SyntaxError, ValueError, RecursionError, MemoryError) as error:
+        raise ErrorExpresion(f"Expresión mal formada: {texto!r}") from error
+    validador = _Validador(nombres, tipo, texto)
+    try:
+        return ast.fix_missing_locations(validador.visit(arbol)), validador.constantes
+    except (RecursionError, MemoryError) as error:
+        raise ErrorExpresion("Expresión demasiado anidada") from error
+
+
+def analizar(texto, nombres=NOMBRES):
+    """
+    Analiza y valida una expresión; retorna el árbol (ast.Expression)
+    nombres: los nombres permitidos (por defecto NOMBRES)
+    """
+    return _analizar(texto, nombres, "float")[0]
+
+
+@lru_cache(maxsize=TAM_CACHE_EXPRESIONES)
+def compilar(texto, tipo="float"):
+    """
+    Retorna el bytecode de una expresión y el espacio de nombres con el que
+    se evalúa (cacheados por texto y tipo numérico)
+    """
+    nombres = _NOMBRES_POR_TIPO[tipo]
+    arbol, constantes = _analizar(texto, nombres, tipo)
+    espacio = dict(nombres, **constantes) if constantes else nombres
+    try:
+        return compile(arbol, "<expresion>", "eval"), espacio
+    except (RecursionError, MemoryError) as error:
+        raise ErrorExpresion("Expresión demasiado anidada") from error
+
+
+def evaluar(texto, backend=BACKEND_FLOAT):
+    """
+    Evalúa una expresión y retorna su valor
+    backend: el tipo numérico (ver backends.crear_backend; por defecto float)
+    Lanza ErrorExpresion si no es válida o falla (por ejemplo, división por cero)
+    """
+    codigo, espacio = compilar(texto, backend.tipo)
+    try:
+        if backend.contexto is None:
+            return eval(codigo, {"__builtins__": {}}, espacio)
+        with backend.entorno():
+            return eval(codigo, {"__builtins__": {}}, espacio)
+    except (ArithmeticError, ValueError, TypeError, RecursionError) as error:
+        # Las excepciones de Decimal no traen un mensaje legible
+        mensaje = type(error).__name__ if isinstance(error, decimal.DecimalException) else str(error)
+        raise ErrorExpresion(mensaje) from error
+
+
+def estadisticas_cache():
+    """
+    Retorna aciertos, fallos y tamaño de la caché de expresiones compiladas
+    """
+    info = compilar.cache_info()
+    return {"aciertos": info.hits, "fallos": info.misses, "tamaño": info.currsize,
+            "maximo": info.maxsize}
+
+
+def evaluar_lote(lineas, backend=BACKEND_FLOAT):
+    """
+    Evalúa un iterable de expresiones (una por elemento)
+    Genera (expresión, resultado, error) para cada línea, en orden;
+    resultado es None si hubo error, y las líneas vacías y los comentarios
+    (#) generan (texto, None, None) para que la salida siga alineada
+    """
+    for linea in lineas:
+        texto = linea.strip()
+        if not texto or texto.startswith("#"):
+            yield texto, None, None
+            continue
+        try:
+            yield texto, evaluar(texto, backend), None
+        except ErrorExpresion as error:
+            yield texto, None, str(error)
+
+
+def procesar_lote(entrada, salida=None, tam_bloque=TAM_BLOQUE_LOTE, backend=BACKEND_FLOAT):
+    """
+    Lee expresiones de entrada (archivo o flujo de texto, una por línea) y
+    escribe un resultado por línea ("error: ..." si falla) en salida (un
+    archivo binario o de texto; por defecto stdout), en bloques. La línea k
+    de la salida corresponde a la línea k de la entrada: las líneas vacías y
+    los comentarios dan una línea vacía
+    Retorna las estadísticas: líneas, expresiones, errores, segundos y
+    expresiones por segundo
+    """
+    if salida is None:
+        sys.stdout.flush()
+        salida = sys.stdout
+    # Bytes con la codificación del flujo, o str si es de texto sin .buffer
+    codificacion = getattr(salida, "encoding", None) or "utf-8"
+    errores_codificacion = getattr(salida, "errors", None) or "strict"
+    destino = getattr(salida, "buffer", salida)
+    como_texto = destino is salida and isinstance(salida, io.TextIOBase)
+
+    lineas = expresiones = errores = 0
+    inicio = time.perf_counter()
+    resultados = evaluar_lote(entrada, backend)
+    while True:
+        bloque = list(islice(resultados, tam_bloque))
+        if not bloque:
+            break
+        partes = []
+        for _, resultado, error in bloque:
+            if error is None and resultado is None:
+                # Línea vacía o comentario
+                partes.append("\n")
+                continue
+            expresiones += 1
+            if error is None:
+                partes.append(f"{resultado}\n")
+            else:
+                partes.append(f"error: {error}\n")
+                errores += 1
+        texto = "".join(partes)
+        destino.write(texto if como_texto else texto.encode(codificacion, errores_codificacion))
+        lineas += len(bloque)
+    destino.flush()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "lineas": lineas,
+        "expresiones": expresiones,
+        "errores": errores,
+        "segundos": segundos,
+        "expresiones_por_segundo": expresiones / segundos if segundos > 0 else 0.0,
+        "cache": estadisticas_cache(),
+    }
@@ -0,0 +1,414 @@
+"""
+Servidor asyncio de la calculadora por líneas JSON, en un socket local
+
+Protocolo: una petición JSON por línea y una respuesta JSON por línea
+    {"id": 1, "op": "evaluar", "expresion": "2 * (3 + 4)"}
+    {"id": 1, "resultado": 14.0}
+    {"id": 2, "op": "suma", "a": "0.1", "b": "0.2", "tipo": "decimal"}
+    {"id": 2, "resultado": "0.3"}
+    {"id": 3, "op": "estadisticas"}
+Operaciones: evaluar, suma, resta, multiplicación, división y estadisticas
+"tipo" (opcional) elige float, decimal o fraccion; los resultados Decimal y
+Fraction se envían como texto para no perder precisión. Cada conexión puede
+encadenar peticiones sin esperar: las respuestas llegan en el mismo orden.
+
+Las expresiones y los operandos tienen un largo máximo. Con float se
+calcula en el mismo bucle de eventos (microsegundos); con decimal y
+fraccion el costo depende de la entrada, así que se calcula en procesos
+aparte con un tiempo máximo (al agotarse se responde con error y se
+termina solo el proceso de ese cálculo), sin frenar a las demás conexiones.
+Cualquier fallo de una petición se responde como error de esa petición.
+
+Los resultados se memorizan en una caché LRU acotada, y "estadisticas"
+informa la latencia (p50, p99: desde que se lee la línea de la petición
+hasta que se escribe su respuesta) y los aciertos de la caché.
+
+Uso:
+    python servidor.py --socket /tmp/calculadora.sock
+    python servidor.py --puerto 8766 --tipo decimal --precision 34
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import statistics
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from backends import TIPOS_NUMERICOS, crear_backend
+from calculadora import OPERACIONES, operar
+from expresiones import estadisticas_cache, evaluar
+
+# Resultados que se conservan en la caché LRU
+TAM_MEMO = 1 << 16
+
+# Latencias recientes con las que se calculan los percentiles
+MUESTRAS_LATENCIA = 1 << 14
+
+# Bytes pendientes de envío a partir de los cuales se espera al cliente
+LIMITE_ESCRITURA = 1 << 16
+
+# Caracteres máximos de una expresión y de un operando
+MAX_LARGO_EXPRESION = 1000
+MAX_LARGO_OPERANDO = 100
+
+# Segundos máximos de un cálculo con decimal o fraccion
+TIEMPO_MAXIMO = 2.0
+
+
+class MemoLRU:
+    """
+    Caché LRU acotada de respuestas, con contadores de aciertos y fallos
+    """
+
+    def __init__(self, tam_maximo=TAM_MEMO):
+        self.tam_maximo = tam_maximo
+        self._datos = OrderedDict()
+        self.aciertos = self.fallos = 0
+
+    def obtener(self, clave):
+        valor = self._datos.get(clave)
+        if valor is None:
+            self.fallos += 1
+            return None
+        self._datos.move_to_end(clave)
+        self.aciertos += 1
+        return valor
+
+    def guardar(self, clave, valor):
+        if self.tam_maximo <= 0:
+            return
+        self._datos[clave] = valor
+        self._datos.move_to_end(clave)
+        if len(self._datos) > self.tam_maximo:
+            self._datos.popitem(last=False)
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            "tamaño": len(self._datos),
+            "maximo": self.tam_maximo,
+        }
+
+
+def _a_json(valor):
+    """
+    Convierte un resultado a un valor JSON (Decimal y Fraction como texto)
+    """
+    if isinstance(valor, float):
+        return valor if math.isfinite(valor) else str(valor)
+    if isinstance(valor, int):
+        return valor
+    return str(valor)
+
+
+@lru_cache(maxsize=None)
+def _backend(tipo, precision):
+    return crear_backend(tipo, precision)
+
+
+def _calcular(tipo, precision, op, argumentos):
+    """
+    Calcula una operación validada y retorna el dict de respuesta
+    (se ejecuta en el bucle de eventos o en un proceso trabajador)
+    """
+    backend = _backend(tipo, precision)
+    try:
+        if op == "evaluar":
+            return {"resultado": _a_json(evaluar(argumentos[0], backend))}
+        num1, num2 = map(backend.convertir, argumentos)
+        return {"resultado": _a_json(operar(op, num1, num2, backend))}
+    except (ValueError, ArithmeticError) as error:
+        # ErrorExpresion, operandos inválidos o resultados de más de 4300 dígitos
+        return {"error": str(error) or type(error).__name__}
+
+
+def _bucle_trabajador(conexion):
+    """
+    Bucle de un proceso trabajador: recibe (tipo, precision, op, argumentos)
+    y envía el dict de respuesta, hasta que se cierra la conexión
+    """
+    while True:
+        try:
+            trabajo = conexion.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            respuesta = _calcular(*trabajo)
+        except Exception as error:
+            respuesta = {"error": f"{type(error).__name__}: {error}"}
+        conexion.send(respuesta)
+
+
+class _Trabajador:
+    """
+    Un proceso con su propia tubería, para poder terminarlo sin afectar a
+    los cálculos de los demás
+    """
+
+    def __init__(self):
+        self._conexion, extremo = multiprocessing.Pipe()
+        self.proceso = multiprocessing.Process(target=_bucle_trabajador, args=(extremo,), daemon=True)
+        self.proceso.start()
+        extremo.close()
+
+    def calcular(self, trabajo, tiempo_maximo):
+        """
+        Envía un trabajo y espera su respuesta; retorna None si se agota el
+        tiempo (el proceso sigue ocupado y hay que terminarlo)
+        """
+        self._conexion.send(trabajo)
+        if not self._conexion.poll(tiempo_maximo):
+            return None
+        return self._conexion.recv()
+
+    def terminar(self):
+        self.proceso.terminate()
+        self.proceso.join()
+        self._conexion.close()
+
+
+class ServidorCalculadora:
+    """
+    Resuelve peticiones de la calculadora con memoización y métricas
+    Con float se calcula en el bucle de eventos; con decimal y fraccion, en
+    hasta `procesos` trabajadores propios, con un tiempo máximo por cálculo
+    """
+
+    def __init__(self, tipo="float", precision=28, tam_memo=TAM_MEMO, procesos=None,
+                 tiempo_maximo=TIEMPO_MAXIMO):
+        if tipo not in TIPOS_NUMERICOS:
+            raise ValueError(f"Tipo numérico no válido: {tipo!r}")
+        self.tipo = tipo
+        self.precision = precision
+        self.procesos = procesos or os.cpu_count() or 1
+        self.tiempo_maximo = tiempo_maximo
+        self.memo = MemoLRU(tam_memo)
+        # Trabajadores libres; cada cálculo en curso espera en un hilo propio
+        self._libres = []
+        self._ocupados = set()
+        self._hilos = None
+        self._cupos = None
+        self._latencias = deque(maxlen=MUESTRAS_LATENCIA)
+        self.peticiones = self.errores = self.tiempos_agotados = 0
+        self.conexiones = 0
+        self._inicio = time.monotonic()
+
+    def cerrar(self):
+        """
+        Detiene los procesos trabajadores (si se crearon)
+        """
+        for trabajador in self._libres + list(self._ocupados):
+            trabajador.terminar()
+        self._libres.clear()
+        self._ocupados.clear()
+        if self._hilos is not None:
+            self._hilos.shutdown(wait=False, cancel_futures=True)
+            self._hilos = None
+
+    def _validar(self, peticion):
+        """
+        Valida una petición de cálculo; retorna (tipo, op, argumentos)
+        """
+        op = peticion.get("op")
+        tipo = peticion.get("tipo", self.tipo)
+        if tipo not in TIPOS_NUMERICOS:
+            raise ValueError(f"Tipo numérico no válido: {tipo!r}")
+
+        if op == "evaluar":
+            expresion = peticion.get("expresion")
+            if not isinstance(expresion, str):
+                raise ValueError("'expresion' debe ser un texto")
+            if len(expresion) > MAX_LARGO_EXPRESION:
+                raise ValueError(f"La expresión supera los {MAX_LARGO_EXPRESION} caracteres")
+            return tipo, op, (expresion,)
+
+        if op in OPERACIONES:
+            argumentos = []
+            for valor in (peticion.get("a"), peticion.get("b")):
+                if isinstance(valor, bool) or not isinstance(valor, (int, float, str)):
+                    raise ValueError(f"'a' y 'b' deben ser números o textos numéricos: {valor!r}")
+                texto = str(valor)
+                if len(texto) > MAX_LARGO_OPERANDO:
+                    raise ValueError(f"Los operandos no pueden superar los {MAX_LARGO_OPERANDO} caracteres")
+                argumentos.append(texto)
+            return tipo, op, tuple(argumentos)
+
+        raise ValueError(f"Operación desconocida: {op}")
+
+    async def _calcular_en_proceso(self, tipo, op, argumentos):
+        """
+        Calcula en un trabajador libre (o uno nuevo, hasta `procesos`);
+        retorna None si se agota el tiempo, y en ese caso termina solo ese
+        trabajador
+        """
+        if self._cupos is None:
+            self._cupos = asyncio.Semaphore(self.procesos)
+            self._hilos = ThreadPoolExecutor(self.procesos)
+        async with self._cupos:
+            trabajador = self._libres.pop() if self._libres else _Trabajador()
+            self._ocupados.add(trabajador)
+            trabajo = (tipo, self.precision, op, argumentos)
+            try:
+                resultado = await asyncio.get_running_loop().run_in_executor(
+                    self._hilos, trabajador.calcular, trabajo, self.tiempo_maximo)
+            except (EOFError, OSError):
+                resultado = {"error": "Falló el proceso trabajador"}
+            except asyncio.CancelledError:
+                # Conexión cerrada a mitad del cálculo: el hilo que espera
+                # recibe EOF al morir el proceso
+                self._ocupados.discard(trabajador)
+                trabajador.proceso.kill()
+                raise
+            self._ocupados.discard(trabajador)
+            if resultado is None:
+                self.tiempos_agotados += 1
+            if resultado is None or not trabajador.proceso.is_alive():
+                trabajador.terminar()
+            else:
+                self._libres.append(trabajador)
+            return resultado
+
+    async def resolver(self, peticion):
+        """
+        Resuelve una petición (dict) y retorna el dict de respuesta
+        """
+        respuesta = {"id": peticion.get("id") if isinstance(peticion, dict) else None}
+        try:
+            if not isinstance(peticion, dict):
+                raise ValueError("La petición debe ser un objeto JSON")
+            if peticion.get("op") == "estadisticas":
+                respuesta["resultado"] = self.estadisticas()
+            else:
+                tipo, op, argumentos = self._validar(peticion)
+                clave = (tipo, op, *argumentos)
+                resultado = self.memo.obtener(clave)
+                if resultado is None:
+                    if tipo == "float":
+                        resultado = _calcular(tipo, self.precision, op, argumentos)
+                    else:
+                        resultado = await self._calcular_en_proceso(tipo, op, argumentos)
+                    if resultado is None:
+                        resultado = {"error": f"Tiempo agotado ({self.tiempo_maximo} s)"}
+                    else:
+                        self.memo.guardar(clave, resultado)
+                respuesta.update(resultado)
+        except ValueError as error:
+            respuesta["error"] = str(error)
+        except Exception as error:
+            # Un fallo inesperado afecta solo a esta petición, no a la conexión
+            respuesta["error"] = f"{type(error).__name__}: {error}"
+        self.peticiones += 1
+        self.errores += "error" in respuesta
+        return respuesta
+
+    async def resolver_linea(self, linea):
+        """
+        Resuelve una línea JSON y retorna la línea JSON de respuesta
+        """
+        try:
+            peticion = json.loads(linea)
+        except ValueError as error:
+            # JSONDecodeError, o un entero de más de 4300 dígitos
+            self.peticiones += 1
+            self.errores += 1
+            return json.dumps({"id": None, "error": f"JSON inválido: {error}"}, ensure_ascii=False)
+        return json.dumps(await self.resolver(peticion), ensure_ascii=False)
+
+    def estadisticas(self):
+        """
+        Peticiones, errores, conexiones, latencias (µs, de la lectura de la
+        petición a la escritura de la respuesta) y aciertos de las cachés
+        """
+        muestras = sorted(self._latencias)
+        if len(muestras) > 1:
+            percentiles = statistics.quantiles(muestras, n=100, method="inclusive")
+            latencia = {"p50": percentiles[49] / 1000, "p99": percentiles[98] / 1000,
+                        "max": muestras[-1] / 1000}
+        else:
+            latencia = {clave: (muestras[0] / 1000 if muestras else 0.0) for clave in ("p50", "p99", "max")}
+        return {
+            "peticiones": self.peticiones,
+            "errores": self.errores,
+            "tiempos_agotados": self.tiempos_agotados,
+            "conexiones_activas": self.conexiones,
+            "segundos_activo": round(time.monotonic() - self._inicio, 3),
+            "latencia_us": latencia,
+            "memo": self.memo.estadisticas(),
+            "cache_compilacion": estadisticas_cache(),
+        }
+
+    async def atender(self, lector, escritor):
+        """
+        Atiende una conexión: responde cada línea en orden y solo espera al
+        cliente cuando se acumulan muchas respuestas sin enviar
+        La latencia de cada petición va de la lectura de su línea a la
+        escritura de su respuesta
+        """
+        self.conexiones += 1
+        try:
+            while linea := await lector.readline():
+                if not linea.strip():
+                    continue
+                inicio = time.perf_counter_ns()
+                escritor.write((await self.resolver_linea(linea)).encode() + b"\n")
+                self._latencias.append(time.perf_counter_ns() - inicio)
+                if escritor.transport.get_write_buffer_size() > LIMITE_ESCRITURA:
+                    await escritor.drain()
+            await escritor.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # Cliente desconectado, o servidor detenido con conexiones abiertas
+            pass
+        finally:
+            self.conexiones -= 1
+            escritor.close()
+
+
+async def servir(ruta=None, host="127.0.0.1", puerto=8766, **opciones):
+    """
+    Atiende la calculadora en un socket Unix (ruta) o TCP local (host, puerto)
+    """
+    servidor_calculadora = ServidorCalculadora(**opciones)
+    if ruta:
+        servidor = await asyncio.start_unix_server(servidor_calculadora.atender, path=ruta, backlog=4096)
+    else:
+        servidor = await asyncio.start_server(servidor_calculadora.atender, host, puerto, backlog=4096)
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servidor_calculadora.cerrar()
+
+
+def main():
+    """
+    Punto de entrada por línea de comandos
+    """
+    parser = argparse.ArgumentParser(description="Servidor de la calculadora por líneas JSON")
+    parser.add_argument("--socket", help="Ruta de un socket Unix")
+    parser.add_argument("--puerto", type=int, default=8766, help="Puerto TCP local (si no hay --socket)")
+    parser.add_argument("--tipo", choices=TIPOS_NUMERICOS, default="float", help="Tipo numérico por defecto")
+    parser.add_argument("--precision", type=int, default=28, help="Precisión de Decimal")
+    parser.add_argument("--memo", type=int, default=TAM_MEMO, help="Resultados en la caché LRU")
+    parser.add_argument("--procesos", type=int, help="Procesos para decimal y fraccion (default: uno por núcleo)")
+    parser.add_argument("--tiempo-maximo", type=float, default=TIEMPO_MAXIMO,
+                        help="Segundos máximos de un cálculo con decimal o fraccion")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(servir(args.socket, puerto=args.puerto, tipo=args.tipo, precision=args.precision,
+                           tam_memo=args.memo, procesos=args.procesos, tiempo_maximo=args.tiempo_maximo))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
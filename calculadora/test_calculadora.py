@@ -0,0 +1,269 @@
+import asyncio
+import io
+import json
+import os
+import time
+
+import pytest
+
+from expresiones import ErrorExpresion, compilar, estadisticas_cache, evaluar, procesar_lote
+
+
+def test_evaluar_expresiones():
+    """Test del analizador de expresiones"""
+
+    # Test 1: Operaciones y precedencia
+    assert evaluar("1 + 2") == 3.0, "Suma simple"
+    assert evaluar("2 * (3 + 4)") == 14.0, "Paréntesis"
+    assert evaluar("2 + 3 * 4 ** 2") == 50.0, "Precedencia"
+    assert evaluar("-7 // 2") == -4.0 and evaluar("-7 % 3") == 2.0
+    assert evaluar("sqrt(16) + max(1, 2)") == 6.0, "Funciones conocidas"
+
+    # Test 2: Los resultados son float, como en la calculadora interactiva
+    assert isinstance(evaluar("1 + 1"), float)
+
+    # Test 3: Errores de evaluación y expresiones no permitidas
+    for texto in ["1 / 0", "sqrt(-1)", "9 ** 9 ** 9", "2 +", "x + 1", "__import__('os')",
+                  "(1).real", "[1, 2]", "'a' * 3", "1 if 2 else 3", "lambda: 1", "True + 1",
+                  "sqrt", "max + 1", "pi(2)", "sqrt(sqrt)"]:
+        with pytest.raises(ErrorExpresion):
+            evaluar(texto)
+
+    # Test 4: Las expresiones muy anidadas son un error, no un RecursionError
+    from backends import crear_backend
+
+    for texto in ["+".join(["1"] * 400), "-" * 300 + "1", "2**" * 300 + "1"]:
+        for tipo in ("float", "decimal", "fraccion"):
+            with pytest.raises(ErrorExpresion):
+                evaluar(texto, crear_backend(tipo))
+    salida = io.StringIO()
+    procesar_lote(["1 + 1", "+".join(["1"] * 400), "2 * 3"], salida)
+    lineas = salida.getvalue().splitlines()
+    assert lineas[0] == "2.0" and lineas[1].startswith("error:") and lineas[2] == "6.0"
+
+
+def test_procesar_lote(tmp_path, capsys):
+    """Test del modo por lotes con caché de expresiones compiladas"""
+    compilar.cache_clear()
+    entrada = io.StringIO("1 + 2\n# comentario\n\n1 / 0\n2 * 3\n1 + 2\n" * 100)
+    salida = io.BytesIO()
+
+    # Test 1: Un resultado por línea, alineado con la entrada y con los errores marcados
+    estadisticas = procesar_lote(entrada, salida, tam_bloque=7)
+    esperado = ["3.0", "", "", "error: float division by zero", "6.0", "3.0"] * 100
+    assert salida.getvalue().decode().splitlines() == esperado
+    assert estadisticas["lineas"] == 600 and estadisticas["expresiones"] == 400
+    assert estadisticas["errores"] == 100
+    assert estadisticas["expresiones_por_segundo"] > 0
+
+    # Test 2: Cada expresión distinta se compila una sola vez
+    cache = estadisticas_cache()
+    assert cache["fallos"] == 3 and cache["aciertos"] == 397
+
+    # Test 3: A un flujo de texto (str) o con otra codificación (bytes)
+    texto = io.StringIO()
+    procesar_lote(io.StringIO("1 + 2\n2 +\n"), texto)
+    assert texto.getvalue() == "3.0\nerror: Expresión mal formada: '2 +'\n"
+    consola = io.TextIOWrapper(io.BytesIO(), encoding="cp1252")
+    procesar_lote(io.StringIO("2 +\n"), consola)
+    assert consola.buffer.getvalue() == "error: Expresión mal formada: '2 +'\n".encode("cp1252")
+
+    # Test 4: Un archivo inexistente se informa sin traza
+    from calculadora import main
+
+    with pytest.raises(SystemExit) as salida_programa:
+        main(["--lote", str(tmp_path / "no_existe.txt")])
+    assert salida_programa.value.code == 2 and "no_existe.txt" in capsys.readouterr().err
+    (tmp_path / "expresiones.txt").write_text("1 + 1\n", encoding="utf-8")
+    with pytest.raises(SystemExit) as salida_programa:
+        main(["--lote", str(tmp_path / "expresiones.txt"), "--salida", str(tmp_path / "no_existe" / "r.txt")])
+    assert salida_programa.value.code == 2
+
+
+def test_columnas(tmp_path):
+    """Test de la calculadora por columnas con las políticas de división por cero"""
+    np = pytest.importorskip("numpy")
+    from columnas import evaluar_columnas, evaluar_csv, operar_columnas
+
+    a = np.array([1.0, 2.0, 3.0, 0.0, 5.0])
+    b = np.array([2.0, 0.0, 1.0, 0.0, -5.0])
+
+    # Test 1: Las cuatro operaciones coinciden con la calculadora fila por fila
+    for operacion, esperado in [("suma", a + b), ("resta", a - b), ("multiplicación", a * b)]:
+        assert np.array_equal(operar_columnas(a, b, operacion), esperado), f"Falla {operacion}"
+
+    # Test 2: Políticas de división por cero, elemento a elemento
+    resultado = operar_columnas(a, b, "división", "nan")
+    assert np.isnan(resultado[[1, 3]]).all() and resultado[[0, 2, 4]].tolist() == [0.5, 3.0, -1.0]
+    enmascarado = operar_columnas(a, b, "/", "mascara")
+    assert enmascarado.mask.tolist() == [False, True, False, True, False]
+    with pytest.raises(ZeroDivisionError):
+        operar_columnas(a, b, "división", "error")
+    assert operar_columnas(a, b + 1, "división", "error").tolist() == (a / (b + 1)).tolist()
+
+    # Test 3: Expresiones con // y %, constantes y funciones vectorizadas
+    resultado = evaluar_columnas("a // b + a % b * 2 + sqrt(a) + max(a, b)", {"a": a, "b": b}, "mascara")
+    filas = [i for i in range(5) if b[i] != 0]
+    esperado = [a[i] // b[i] + a[i] % b[i] * 2 + a[i] ** 0.5 + max(a[i], b[i]) for i in filas]
+    assert resultado.compressed().tolist() == esperado
+    assert evaluar_columnas("2 * 3", {"a": a}).tolist() == [6.0] * 5
+
+    # Test 4: Columnas de un CSV por su encabezado
+    ruta = tmp_path / "ventas.csv"
+    ruta.write_text("id,precio,cantidad\n1,10.5,2\n2,3,0\n3,4,4\n", encoding="utf-8")
+    salida = tmp_path / "resultado.csv"
+    resultado = evaluar_csv(ruta, "precio / cantidad", "mascara", salida=salida)
+    assert resultado.filled(-1).tolist() == [5.25, -1, 1.0]
+    assert salida.read_text(encoding="utf-8").splitlines() == ["resultado", "5.25", "", "1.0"]
+    with pytest.raises(ValueError):
+        evaluar_csv(ruta, "precio * total")
+
+
+def test_tipos_numericos():
+    """Test de los tipos numéricos float, decimal y fraccion"""
+    from decimal import Decimal
+    from fractions import Fraction
+
+    from backends import crear_backend
+
+    decimal_ = crear_backend("decimal")
+    fraccion = crear_backend("fraccion")
+
+    # Test 1: Los literales se crean desde el texto, sin pasar por float
+    assert evaluar("0.1 + 0.2") != 0.3
+    assert evaluar("0.1 + 0.2", decimal_) == Decimal("0.3")
+    assert evaluar("0.1 + 0.2", fraccion) == Fraction(3, 10)
+    assert evaluar("1 / 3 * 3", fraccion) == 1
+
+    # Test 2: La precisión del contexto de Decimal se respeta
+    assert evaluar("1 / 3", crear_backend("decimal", precision=5)) == Decimal("0.33333")
+    assert evaluar("sqrt(2)", crear_backend("decimal", precision=10)) == Decimal("1.414213562")
+
+    # Test 3: Errores con cada tipo
+    for backend in (decimal_, fraccion):
+        for texto in ["1 / 0", "9 ** 9 ** 9", "_c0 + 1"]:
+            with pytest.raises(ErrorExpresion):
+                evaluar(texto, backend)
+    with pytest.raises(ErrorExpresion):
+        evaluar("sqrt(2)", fraccion)
+
+    # Test 4: Las potencias exactas enormes se rechazan antes de calcularlas
+    inicio = time.perf_counter()
+    for texto in ["(10**10000)**1000", "(10**10000)**10000", "(7**9999)**20", "1e999999999 + 1"]:
+        with pytest.raises(ErrorExpresion):
+            evaluar(texto, fraccion)
+    with pytest.raises(OverflowError):
+        fraccion.convertir("1e999999999")
+    assert time.perf_counter() - inicio < 1, "El rechazo debe ser inmediato"
+    assert evaluar("2**1000", fraccion) == 2**1000 and evaluar("(-1)**100001", fraccion) == -1
+    assert evaluar("4 ** (1/2)", fraccion) == 2.0
+    with pytest.raises(ValueError):
+        crear_backend("complejo")
+
+    # Test 5: El lote usa el tipo pedido
+    salida = io.BytesIO()
+    procesar_lote(io.StringIO("0.1 + 0.2\n1 / 3\n"), salida, backend=fraccion)
+    assert salida.getvalue().decode().split() == ["3/10", "1/3"]
+
+
+def test_servidor(tmp_path, monkeypatch):
+    """Test del servidor por líneas JSON con caché de resultados"""
+    import servidor as servidor_modulo
+    from servidor import ServidorCalculadora, servir
+
+    async def basicos():
+        servidor = ServidorCalculadora(tam_memo=4, procesos=2, tiempo_maximo=0.3)
+        try:
+            # Test 1: Operaciones, tipos numéricos y errores
+            assert await servidor.resolver({"id": 1, "op": "evaluar", "expresion": "2 * (3 + 4)"}) == {"id": 1, "resultado": 14.0}
+            assert (await servidor.resolver({"op": "suma", "a": "0.1", "b": "0.2", "tipo": "decimal"}))["resultado"] == "0.3"
+            assert (await servidor.resolver({"op": "división", "a": 1, "b": 3, "tipo": "fraccion"}))["resultado"] == "1/3"
+            for peticion in [{"op": "división", "a": 1, "b": 0}, {"op": "evaluar", "expresion": "x"},
+                             {"op": "raiz", "a": 4}, {"op": "suma", "a": [1], "b": 2}, [1, 2],
+                             {"op": "suma", "a": "1e999999999", "b": 1, "tipo": "fraccion"}]:
+                assert "error" in await servidor.resolver(peticion), f"Falla {peticion}"
+            assert "error" in json.loads(await servidor.resolver_linea("no es json"))
+
+            # Test 2: Un entero JSON de más de 4300 dígitos es un error, no una excepción
+            respuesta = json.loads(await servidor.resolver_linea('{"op": "suma", "a": 1%s, "b": 1}' % ("0" * 5000)))
+            assert "JSON inválido" in respuesta["error"]
+
+            # Test 3: Largo máximo de expresiones y operandos
+            respuesta = await servidor.resolver({"op": "evaluar", "expresion": "1+" * 600 + "1"})
+            assert "caracteres" in respuesta["error"]
+            respuesta = await servidor.resolver({"op": "suma", "a": "1" * 200, "b": 1, "tipo": "fraccion"})
+            assert "caracteres" in respuesta["error"]
+
+            # Test 4: Un cálculo exacto que tarda demasiado responde con error y no se
+            # memoriza, sin afectar a otro cálculo exacto en curso en otro trabajador
+            lenta = " + ".join(f"({i + 2}/{i + 3})**9999" for i in range(40))
+            peticion = {"op": "evaluar", "expresion": lenta, "tipo": "fraccion"}
+            otra = {"op": "evaluar", "expresion": "sqrt(2) + 1/3", "tipo": "decimal"}
+            respuesta, respuesta_otra = await asyncio.gather(servidor.resolver(peticion), servidor.resolver(otra))
+            assert "Tiempo agotado" in respuesta["error"]
+            assert respuesta_otra["resultado"].startswith("1.747546895706")
+            assert servidor.estadisticas()["tiempos_agotados"] == 1
+            assert servidor.memo.obtener(("fraccion", "evaluar", lenta)) is None
+            assert (await servidor.resolver({"op": "evaluar", "expresion": "1/3 + 1/6", "tipo": "fraccion"}))["resultado"] == "1/2"
+
+            # Test 5: Un fallo inesperado es un error de esa petición
+            monkeypatch.setattr(servidor_modulo, "_calcular", lambda *_: 1 / 0)
+            respuesta = await servidor.resolver({"id": 9, "op": "evaluar", "expresion": "7 * 7"})
+            assert respuesta["id"] == 9 and "ZeroDivisionError" in respuesta["error"]
+            monkeypatch.undo()
+
+            # Test 6: La caché LRU está acotada y cuenta los aciertos
+            aciertos = servidor.estadisticas()["memo"]["aciertos"]
+            for _ in range(3):
+                await servidor.resolver({"op": "evaluar", "expresion": "1 + 1"})
+            memo = servidor.estadisticas()["memo"]
+            assert memo["aciertos"] == aciertos + 2 and memo["tamaño"] == 4
+        finally:
+            servidor.cerrar()
+
+    asyncio.run(basicos())
+
+    # Test 7: Clientes concurrentes por socket Unix, con respuestas en orden
+    async def escenario():
+        ruta = str(tmp_path / "calculadora.sock")
+        tarea = asyncio.create_task(servir(ruta))
+        while not os.path.exists(ruta):
+            await asyncio.sleep(0.01)
+
+        async def cliente(i):
+            lector, escritor = await asyncio.open_unix_connection(ruta)
+            lineas = [json.dumps({"id": k, "op": "evaluar", "expresion": f"{k % 7} * 2 + {i}"}) for k in range(50)]
+            escritor.write(("\n".join(lineas) + "\n").encode())
+            await escritor.drain()
+            respuestas = [json.loads(await lector.readline()) for _ in range(50)]
+            escritor.close()
+            return respuestas
+
+        resultados = await asyncio.gather(*(cliente(i) for i in range(20)))
+        for i, respuestas in enumerate(resultados):
+            assert [r["id"] for r in respuestas] == list(range(50))
+            assert [r["resultado"] for r in respuestas] == [(k % 7) * 2 + i for k in range(50)]
+
+        lector, escritor = await asyncio.open_unix_connection(ruta)
+        escritor.write(b'{"op": "estadisticas"}\n')
+        estadisticas = json.loads(await lector.readline())["resultado"]
+
+        # Una expresión muy anidada entre dos válidas no corta la conexión
+        profunda = "+".join(["1"] * 400)
+        for peticion in [{"id": 1, "op": "evaluar", "expresion": "1 + 1"},
+                         {"id": 2, "op": "evaluar", "expresion": profunda},
+                         {"id": 3, "op": "evaluar", "expresion": "-" * 300 + "1", "tipo": "decimal"},
+                         {"id": 4, "op": "evaluar", "expresion": "2 * 3"}]:
+            escritor.write(json.dumps(peticion).encode() + b"\n")
+        respuestas = [json.loads(await lector.readline()) for _ in range(4)]
+        assert [r["id"] for r in respuestas] == [1, 2, 3, 4]
+        assert respuestas[0]["resultado"] == 2.0 and respuestas[3]["resultado"] == 6.0
+        assert "error" in respuestas[1] and "error" in respuestas[2]
+        escritor.close()
+        tarea.cancel()
+        return estadisticas
+
+    estadisticas = asyncio.run(escenario())
+    assert estadisticas["peticiones"] == 1000 and estadisticas["errores"] == 0
+    assert estadisticas["memo"]["fallos"] == 140 and estadisticas["memo"]["aciertos"] == 860
+    assert 0 <= estadisticas["latencia_us"]["p50"] <= estadisticas["latencia_us"]["p99"]
@@ -1,5 +1,10 @@
 import re
 
+# Caracteres que se leen por bloque en el modo por bloques
+TAM_BLOQUE = 1 << 20
+
+PATRON_PALABRA = re.compile(r'\w+')
+
 def contar_palabras(texto):
     """
     Cuenta las palabras en un texto dado.
@@ -33,19 +38,75 @@ def contar_lineas(texto):
     lineas = texto.split('\n')
     return len(lineas)
 
+def leer_por_bloques(archivo, tam_bloque=TAM_BLOQUE):
+    """
+    Lee un archivo de texto abierto en bloques de tamaño acotado.
+    
+    Cada bloque termina justo después de un espacio en blanco (salvo el
+    último), así que ninguna palabra queda partida entre dos bloques y
+    lower() da lo mismo que sobre el texto completo. Un tramo sin espacios
+    más largo que el bloque se acumula hasta el siguiente espacio.
+    
+    Args:
+        archivo: Archivo abierto en modo texto
+        tam_bloque (int): Caracteres a leer en cada lectura
+        
+    Yields:
+        str: Trozos consecutivos del texto
+        
+    Raises:
+        ValueError: Si tam_bloque no es positivo (read(0) no leería nada y
+            read(-1) cargaría el archivo completo)
+    """
+    if tam_bloque <= 0:
+        raise ValueError(f"El tamaño de bloque debe ser positivo: {tam_bloque}")
+    pendiente = []
+    while bloque := archivo.read(tam_bloque):
+        # Último salto de línea o, si no hay, último espacio del bloque
+        corte = bloque.rfind('\n') + 1 or max(map(bloque.rfind, ' \t\r\f\v')) + 1
+        if not corte:
+            pendiente.append(bloque)
+            continue
+        pendiente.append(bloque[:corte])
+        yield ''.join(pendiente)
+        pendiente = [bloque[corte:]]
+    resto = ''.join(pendiente)
+    if resto:
+        yield resto
+
+def contar_archivo(ruta, tam_bloque=TAM_BLOQUE):
+    """
+    Cuenta las líneas y las palabras de un archivo sin cargarlo entero.
+    
+    Da los mismos resultados que contar_lineas y contar_palabras sobre el
+    contenido completo, con memoria acotada por el tamaño del bloque.
+    
+    Args:
+        ruta (str): Ruta del archivo de texto (UTF-8)
+        tam_bloque (int): Caracteres a leer en cada lectura
+        
+    Returns:
+        tuple: (número de líneas, número de palabras)
+    """
+    num_lineas = num_palabras = 0
+    vacio = True
+    with open(ruta, "r", encoding='utf-8') as f:
+        for texto in leer_por_bloques(f, tam_bloque):
+            vacio = False
+            num_lineas += texto.count('\n')
+            num_palabras += len(PATRON_PALABRA.findall(texto.lower()))
+    return (0 if vacio else num_lineas + 1), num_palabras
+
 # Código principal para procesar archivos
 if __name__ == "__main__":
     archivo = input("Introduce la ruta del archivo de texto: ")
     try:
-        with open(archivo, "r", encoding='utf-8') as f:
-            contenido = f.read()
-            
-            num_lineas = contar_lineas(contenido)
-            num_palabras = contar_palabras(contenido)
-            
-            print(f"El archivo tiene {num_lineas} líneas.")
-            print(f"Total palabras: {num_palabras}")
-            
+        # Leer por bloques para no cargar archivos grandes en memoria
+        num_lineas, num_palabras = contar_archivo(archivo)
+        
+        print(f"El archivo tiene {num_lineas} líneas.")
+        print(f"Total palabras: {num_palabras}")
+        
     except FileNotFoundError:
         print("El archivo no existe.")
     except Exception as e:
@@ -11,6 +11,19 @@ import argparse
 from collections import Counter
 import re
 
+from contador import PATRON_PALABRA, TAM_BLOQUE, leer_por_bloques
+
+# Lista de palabras comunes a ignorar (stop words en español)
+PALABRAS_COMUNES = frozenset({
+    'el', 'la', 'de', 'que', 'y', 'a', 'en', 'un', 'es', 'se', 'no', 'te', 'lo', 'le', 'da',
+    'su', 'por', 'son', 'con', 'para', 'al', 'del', 'los', 'las', 'una', 'como', 'pero',
+    'sus', 'me', 'hasta', 'hay', 'donde', 'han', 'quien', 'están', 'estado', 'desde',
+    'todo', 'nos', 'durante', 'todos', 'uno', 'les', 'ni', 'contra', 'otros', 'ese',
+    'eso', 'ante', 'ellos', 'e', 'esto', 'mí', 'antes', 'algunos', 'qué', 'unos', 'yo',
+    'otro', 'otras', 'otra', 'él', 'tanto', 'esa', 'estos', 'mucho', 'quienes', 'nada',
+    'muchos', 'cual', 'poco', 'ella', 'estar', 'estas', 'algunas', 'algo', 'nosotros'
+})
+
 
 def limpiar_texto(texto):
     """
@@ -29,17 +42,6 @@ def contar_palabras(texto, ignorar_palabras_comunes=True):
     """
     Cuenta las palabras en el texto
     """
-    # Lista de palabras comunes a ignorar (stop words en español)
-    palabras_comunes = {
-        'el', 'la', 'de', 'que', 'y', 'a', 'en', 'un', 'es', 'se', 'no', 'te', 'lo', 'le', 'da',
-        'su', 'por', 'son', 'con', 'para', 'al', 'del', 'los', 'las', 'una', 'como', 'pero',
-        'sus', 'me', 'hasta', 'hay', 'donde', 'han', 'quien', 'están', 'estado', 'desde',
-        'todo', 'nos', 'durante', 'todos', 'uno', 'les', 'ni', 'contra', 'otros', 'ese',
-        'eso', 'ante', 'ellos', 'e', 'esto', 'mí', 'antes', 'algunos', 'qué', 'unos', 'yo',
-        'otro', 'otras', 'otra', 'él', 'tanto', 'esa', 'estos', 'mucho', 'quienes', 'nada',
-        'muchos', 'cual', 'poco', 'ella', 'estar', 'estas', 'algunas', 'algo', 'nosotros'
-    }
-    
     # Limpiar el texto
     texto_limpio = limpiar_texto(texto)
     
@@ -48,14 +50,44 @@ def contar_palabras(texto, ignorar_palabras_comunes=True):
     
     if ignorar_palabras_comunes:
         # Filtrar palabras comunes
-        palabras = [palabra for palabra in palabras if palabra not in palabras_comunes]
+        palabras = [palabra for palabra in palabras if palabra not in PALABRAS_COMUNES]
     
     return palabras
 
 
-def analizar_archivo(ruta_archivo, ignorar_palabras_comunes=True, mostrar_top=10):
+def contar_frecuencias(archivo, ignorar_palabras_comunes=True, tam_bloque=TAM_BLOQUE):
+    """
+    Cuenta la frecuencia de las palabras de un archivo abierto, leyéndolo por
+    bloques (la memoria depende del bloque y del vocabulario, no del archivo)
+    Da el mismo Counter que contar_palabras sobre el contenido completo
+    """
+    contador = Counter()
+    for texto in leer_por_bloques(archivo, tam_bloque):
+        # Las palabras de limpiar_texto + split son las secuencias de \w
+        contador.update(PATRON_PALABRA.findall(texto.lower()))
+    if ignorar_palabras_comunes:
+        for palabra in PALABRAS_COMUNES.intersection(contador):
+            del contador[palabra]
+    return contador
+
+
+def leer_tam_bloque(texto):
+    """
+    Convierte el argumento --bloque en un entero positivo, para argparse
+    """
+    try:
+        tam_bloque = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"debe ser un entero: {texto!r}") from None
+    if tam_bloque <= 0:
+        raise argparse.ArgumentTypeError(f"debe ser positivo: {tam_bloque}")
+    return tam_bloque
+
+
+def analizar_archivo(ruta_archivo, ignorar_palabras_comunes=True, mostrar_top=10, tam_bloque=TAM_BLOQUE):
     """
     Analiza un archivo de texto y cuenta las palabras
+    El archivo se lee por bloques de tam_bloque caracteres
     """
     try:
         # Verificar que el archivo existe
@@ -63,22 +95,16 @@ def analizar_archivo(ruta_archivo, ignorar_palabras_comunes=True, mostrar_top=10
             print(f"❌ Error: El archivo '{ruta_archivo}' no existe.")
             return None
         
-        # Leer el archivo
+        # Leer el archivo por bloques y contar la frecuencia de las palabras
         with open(ruta_archivo, 'r', encoding='utf-8') as archivo:
-            contenido = archivo.read()
-        
-        # Contar palabras
-        palabras = contar_palabras(contenido, ignorar_palabras_comunes)
+            contador = contar_frecuencias(archivo, ignorar_palabras_comunes, tam_bloque)
         
-        if not palabras:
+        if not contador:
             print("📄 El archivo está vacío o no contiene palabras válidas.")
             return None
         
-        # Contar frecuencia de palabras
-        contador = Counter(palabras)
-        
         # Estadísticas
-        total_palabras = len(palabras)
+        total_palabras = sum(contador.values())
         palabras_unicas = len(contador)
         
         # Mostrar resultados
@@ -120,6 +146,7 @@ Ejemplos de uso:
   python contador_palabras.py archivo.txt
   python contador_palabras.py archivo.txt --top 20
   python contador_palabras.py archivo.txt --incluir-comunes
+  python contador_palabras.py registros.log --bloque 4194304
         """
     )
     
@@ -128,6 +155,8 @@ Ejemplos de uso:
                        help='Número de palabras más frecuentes a mostrar (default: 10)')
     parser.add_argument('--incluir-comunes', action='store_true',
                        help='Incluir palabras comunes en el conteo')
+    parser.add_argument('--bloque', type=leer_tam_bloque, default=TAM_BLOQUE,
+                       help=f'Caracteres leídos por bloque (default: {TAM_BLOQUE})')
     
     args = parser.parse_args()
     
@@ -141,7 +170,8 @@ Ejemplos de uso:
     resultado = analizar_archivo(
         args.archivo, 
         ignorar_palabras_comunes=not args.incluir_comunes,
-        mostrar_top=args.top
+        mostrar_top=args.top,
+        tam_bloque=args.bloque
     )
     
     if resultado:
@@ -1,5 +1,12 @@
+import argparse
+import subprocess
+import sys
 import unittest
-from contador import contar_palabras
+from collections import Counter
+
+import pytest
+
+from contador import contar_archivo, contar_lineas, contar_palabras
 
 def test_contar_palabras():
     """Test simple para la función contar_palabras"""
@@ -21,5 +28,57 @@ def test_contar_palabras():
     
     print("✅ Todos los tests pasaron correctamente!")
 
+def test_contar_por_bloques(tmp_path):
+    """Test del conteo por bloques contra el conteo con el archivo completo"""
+    import contador_palabras
+    
+    texto = ("¡Hola, mundo! El análisis de registros_2024 es rápido.\r\n"
+             "ΟΔΟΣ ΣΟΦΟΣ ΑΣ.Β İstanbul straße\tPython 3.9\n\n"
+             + "palabra" * 50 + " fin de la prueba\n") * 3 + "sin salto final"
+    ruta = tmp_path / "texto.txt"
+    ruta.write_text(texto, encoding="utf-8")
+    contenido = ruta.read_text(encoding="utf-8")
+    
+    for tam_bloque in [1, 2, 3, 7, 64, 1 << 20]:
+        # Test 1: Líneas y palabras iguales a las del texto completo
+        esperado = (contar_lineas(contenido), contar_palabras(contenido))
+        assert contar_archivo(ruta, tam_bloque) == esperado, f"Falla con bloques de {tam_bloque}"
+        
+        # Test 2: Frecuencias iguales, con y sin palabras comunes
+        for ignorar in [True, False]:
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                frecuencias = contador_palabras.contar_frecuencias(archivo, ignorar, tam_bloque)
+            esperado = Counter(contador_palabras.contar_palabras(contenido, ignorar))
+            assert frecuencias == esperado, f"Falla con bloques de {tam_bloque}"
+            assert list(frecuencias) == list(esperado), "Mismo orden en los empates"
+    
+    # Test 3: Archivo vacío
+    (tmp_path / "vacio.txt").write_text("", encoding="utf-8")
+    assert contar_archivo(tmp_path / "vacio.txt") == (0, 0)
+
+def test_tam_bloque_no_positivo(tmp_path):
+    """Test del rechazo de bloques de tamaño cero o negativo"""
+    import contador_palabras
+    
+    ruta = tmp_path / "texto.txt"
+    ruta.write_text("hola mundo\n", encoding="utf-8")
+    
+    # Test 1: read(0) no leería nada y read(-1) todo el archivo
+    for tam_bloque in [0, -1]:
+        with pytest.raises(ValueError):
+            contar_archivo(ruta, tam_bloque)
+    
+    # Test 2: El argumento --bloque
+    assert contador_palabras.leer_tam_bloque("64") == 64
+    for texto in ["0", "-5", "x"]:
+        with pytest.raises(argparse.ArgumentTypeError):
+            contador_palabras.leer_tam_bloque(texto)
+    
+    # Test 3: El programa informa el error sin traza
+    resultado = subprocess.run([sys.executable, contador_palabras.__file__, str(ruta), "--bloque", "0"],
+                               capture_output=True, text=True)
+    assert resultado.returncode == 2 and "--bloque" in resultado.stderr
+    assert "Traceback" not in resultado.stderr
+
 if __name__ == "__main__":
     test_contar_palabras() 
\ No newline at end of file
@@ -37,8 +37,120 @@ def cuadrados(n):
     """
     return [i**2 for i in range(1, n + 1)]
 
+# Mayor n cuyo cuadrado entra en un entero con signo de 64 bits
+MAX_N_INT64 = 3037000499
+
+def iter_cuadrados(n, desde=1):
+    """
+    Generador perezoso de los cuadrados de desde..n (sin construir la lista).
+    
+    Args:
+        n (int): Último número (inclusive)
+        desde (int): Primer número (por defecto 1)
+        
+    Returns:
+        iterator: Los cuadrados de desde, desde + 1, ..., n
+    """
+    for i in range(desde, n + 1):
+        yield i * i
+
+def cuadrados_numpy(n, desde=1, tipo="int64"):
+    """
+    Genera los cuadrados de desde..n en un arreglo de NumPy.
+    
+    Args:
+        n (int): Último número (inclusive)
+        desde (int): Primer número (por defecto 1)
+        tipo (str): "int64" (lanza OverflowError si algún cuadrado no entra),
+            "object" (enteros de Python, sin límite) o "auto" (int64 si entra)
+        
+    Returns:
+        numpy.ndarray: Arreglo con los cuadrados
+    """
+    import numpy as np
+
+    if tipo not in ("int64", "object", "auto"):
+        raise ValueError(f"Tipo no válido: {tipo!r}")
+    entra = max(abs(desde), abs(n)) <= MAX_N_INT64 or n < desde
+    if tipo == "auto":
+        tipo = "int64" if entra else "object"
+    if tipo == "int64":
+        if not entra:
+            raise OverflowError(f"El cuadrado de {max(abs(desde), abs(n))} no entra en int64")
+        numeros = np.arange(desde, n + 1, dtype=np.int64)
+        return numeros * numeros
+    return np.array(list(iter_cuadrados(n, desde)), dtype=object)
+
+def suma_cuadrados(n, desde=1):
+    """
+    Suma de los cuadrados de desde..n en O(1), con n(n+1)(2n+1)/6.
+    
+    Args:
+        n (int): Último número (inclusive)
+        desde (int): Primer número natural (por defecto 1)
+        
+    Returns:
+        int: desde² + (desde + 1)² + ... + n²
+    """
+    if desde < 0:
+        raise ValueError("desde debe ser un número natural")
+    if n < desde:
+        return 0
+
+    def hasta(m):
+        return m * (m + 1) * (2 * m + 1) // 6
+
+    return hasta(n) - hasta(desde - 1)
+
+def media_cuadrados(n, desde=1):
+    """
+    Promedio de los cuadrados de desde..n en O(1).
+    
+    Args:
+        n (int): Último número (inclusive)
+        desde (int): Primer número natural (por defecto 1)
+        
+    Returns:
+        float: Promedio de los cuadrados (0.0 si el rango está vacío)
+    """
+    cantidad = n - desde + 1
+    return suma_cuadrados(n, desde) / cantidad if cantidad > 0 else 0.0
+
+def listar_cuadrados(n, destino=None, formato="texto"):
+    """
+    Escribe "i² = cuadrado" para i = 1..n por bloques (ver salida.py).
+    
+    Args:
+        n (int): Último número (inclusive)
+        destino: None (stdout), una ruta o un archivo abierto
+        formato (str): "texto", "csv" o "binario" (dos enteros de 64 bits por fila)
+        
+    Returns:
+        int: Cantidad de filas escritas
+    """
+    from operator import mul
+    from salida import escribir_filas
+
+    numeros = range(1, n + 1)
+    encabezado = ("n", "cuadrado") if formato == "csv" else None
+    return escribir_filas(zip(numeros, map(mul, numeros, numeros)), destino, formato,
+                          plantilla="{}² = {}", encabezado=encabezado)
+
 # Ejemplo de uso
 if __name__ == "__main__":
+    import sys
+    
+    # Modo listado: python ejercicio.autocompletar.py N [--formato csv] [--salida archivo]
+    if len(sys.argv) > 1:
+        import argparse
+        parser = argparse.ArgumentParser(description="Lista los cuadrados de 1..n")
+        parser.add_argument("n", type=int)
+        parser.add_argument("--formato", choices=("texto", "csv", "binario"), default="texto")
+        parser.add_argument("--salida", help="Archivo de salida (por defecto stdout)")
+        args = parser.parse_args()
+        listar_cuadrados(args.n, args.salida, args.formato)
+        sys.exit(0)
+    
     # Pedir al usuario el valor de n
     try:
         n = int(input("Ingrese el número de elementos (n): "))
@@ -54,10 +166,12 @@ if __name__ == "__main__":
             print(f"\nMétodo tradicional: {generar_cuadrados_tradicional(n)}")
             print(f"Método con map: {generar_cuadrados_map(n)}")
             
+            # Suma sin recorrer la lista
+            print(f"\nSuma de los cuadrados: {suma_cuadrados(n)}")
+            
             # Mostrar cada número y su cuadrado
             print(f"\nDesglose:")
-            for i, cuadrado in enumerate(lista_cuadrados, 1):
-                print(f"{i}² = {cuadrado}")
+            listar_cuadrados(n)
                 
     except ValueError:
         print("Por favor ingrese un número válido.")
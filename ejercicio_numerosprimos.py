@@ -1,176 +1,43 @@
 # Programa para determinar si un número es primo
 # Un número primo es aquel que solo es divisible por 1 y por sí mismo
+# Los algoritmos están en el paquete primos; este archivo es la interfaz
+# interactiva y no ejecuta nada al importarse
 
-def es_primo_basico(n):
-    """
-    Función básica para determinar si un número es primo
-    """
-    # Los números menores a 2 no son primos
-    if n < 2:
-        return False
-    
-    # Verificar divisibilidad desde 2 hasta n-1
-    for i in range(2, n):
-        if n % i == 0:
-            return False
-    
-    return True
-
-def es_primo_optimizado(n):
-    """
-    Función altamente optimizada para determinar si un número es primo
-    Aplica múltiples optimizaciones:
-    - Verificación rápida de casos especiales
-    - Solo verifica hasta la raíz cuadrada
-    - Solo verifica divisores de la forma 6k±1
-    - Cache de divisores pequeños
-    """
-    # Casos especiales rápidos
-    if n < 2:
-        return False
-    if n == 2 or n == 3:
-        return True
-    if n % 2 == 0 or n % 3 == 0:
-        return False
-    
-    # Cache de divisores pequeños para números grandes
-    if n < 1000:
-        # Para números pequeños, verificar divisores hasta raíz cuadrada
-        import math
-        limite = int(math.sqrt(n))
-        for i in range(5, limite + 1, 6):
-            if n % i == 0 or n % (i + 2) == 0:
-                return False
-        return True
-    else:
-        # Para números grandes, usar optimización 6k±1
-        import math
-        limite = int(math.sqrt(n))
-        # Verificar divisores de la forma 6k±1 (más eficiente)
-        for i in range(5, limite + 1, 6):
-            if n % i == 0:
-                return False
-            if i + 2 <= limite and n % (i + 2) == 0:
-                return False
-        return True
-
-
-def es_primo_miller_rabin(n, k=5):
-    """
-    Test de primalidad de Miller-Rabin (probabilístico)
-    Muy eficiente para números grandes
-    k: número de iteraciones (mayor k = mayor precisión)
-    """
-    if n < 2:
-        return False
-    if n == 2 or n == 3:
-        return True
-    if n % 2 == 0:
-        return False
-    
-    # Escribir n-1 como 2^r * d
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
-    
-    # Test de Miller-Rabin
-    import random
-    for _ in range(k):
-        a = random.randint(2, n - 2)
-        x = pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(r - 1):
-            x = (x * x) % n
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
+import importlib
+import sys
 
+import primos
 
-def criba_eratostenes(limite):
-    """
-    Implementación de la Criba de Eratóstenes
-    Encuentra todos los números primos hasta un límite dado
-    Muy eficiente para encontrar múltiples números primos
-    """
-    # Crear lista de booleanos inicializada en True
-    es_primo = [True] * (limite + 1)
-    es_primo[0] = es_primo[1] = False
-    
-    # Aplicar la criba
-    for i in range(2, int(limite ** 0.5) + 1):
-        if es_primo[i]:
-            # Marcar todos los múltiplos de i como no primos
-            for j in range(i * i, limite + 1, i):
-                es_primo[j] = False
-    
-    # Retornar lista de números primos
-    return [i for i in range(limite + 1) if es_primo[i]]
+# Constantes que este archivo definía antes de mover los algoritmos al
+# paquete primos y que el paquete no exporta: nombre -> submódulo
+_CONSTANTES_ANTERIORES = {
+    "BASES_MILLER_RABIN": "primalidad",
+    "PRIMOS_DIVISION_LOTE_HASTA": "lote",
+    "FIRMA_TABLA": "tabla",
+    "VERSION_TABLA": "tabla",
+    "ENCABEZADO_TABLA": "tabla",
+    "PRIMOS_FACTORIZACION_HASTA": "factorizacion",
+}
 
 
-def mostrar_primos_hasta(limite):
-    """
-    Muestra todos los números primos hasta un límite dado
-    Usa la criba de Eratóstenes para mayor eficiencia
-    """
-    if limite <= 1000:
-        # Para límites pequeños, usar criba de Eratóstenes
-        return criba_eratostenes(limite)
-    else:
-        # Para límites grandes, usar función optimizada
-        primos = []
-        for i in range(2, limite + 1):
-            if es_primo_optimizado(i):
-                primos.append(i)
-        return primos
-
-# Función principal para interactuar con el usuario
-def comparar_rendimiento(n):
+def __getattr__(nombre):
     """
-    Compara el rendimiento de las diferentes funciones de primalidad
+    Reexporta bajo demanda los nombres que antes se definían aquí
+    (from ejercicio_numerosprimos import criba_eratostenes sigue funcionando)
     """
-    import time
-    
-    print(f"\n=== COMPARACIÓN DE RENDIMIENTO PARA {n} ===")
-    
-    # Función básica
-    inicio = time.time()
-    resultado_basico = es_primo_basico(n)
-    tiempo_basico = time.time() - inicio
-    
-    # Función optimizada
-    inicio = time.time()
-    resultado_optimizado = es_primo_optimizado(n)
-    tiempo_optimizado = time.time() - inicio
-    
-    # Función Miller-Rabin (solo para números grandes)
-    if n > 1000:
-        inicio = time.time()
-        resultado_miller = es_primo_miller_rabin(n)
-        tiempo_miller = time.time() - inicio
-    else:
-        resultado_miller = resultado_optimizado
-        tiempo_miller = 0
-    
-    print(f"Función básica: {resultado_basico} (tiempo: {tiempo_basico:.6f}s)")
-    print(f"Función optimizada: {resultado_optimizado} (tiempo: {tiempo_optimizado:.6f}s)")
-    if n > 1000:
-        print(f"Miller-Rabin: {resultado_miller} (tiempo: {tiempo_miller:.6f}s)")
-    
-    if tiempo_basico > 0:
-        mejora = (tiempo_basico - tiempo_optimizado) / tiempo_basico * 100
-        print(f"Mejora de rendimiento: {mejora:.1f}%")
-    
-    return resultado_optimizado
+    if nombre in _CONSTANTES_ANTERIORES:
+        return getattr(importlib.import_module(f"primos.{_CONSTANTES_ANTERIORES[nombre]}"), nombre)
+    if nombre in primos.__all__:
+        return getattr(primos, nombre)
+    raise AttributeError(f"el módulo 'ejercicio_numerosprimos' no tiene el atributo '{nombre}'")
 
 
 def probar_funciones():
     """
     Función para probar que todas las funciones de primalidad funcionen correctamente
     """
+    from primos import es_primo_optimizado
+
     print("=== PRUEBAS DE FUNCIONES DE PRIMALIDAD ===")
     
     # Números conocidos para probar
@@ -211,6 +78,8 @@ def probar_funciones():
 
 
 def main():
+    from primos import comparar_rendimiento, mostrar_primos_hasta
+
     print("=== DETERMINADOR DE NÚMEROS PRIMOS OPTIMIZADO ===")
     print("Funciones disponibles:")
     print("1. Básica - Verificación completa")
@@ -246,40 +115,62 @@ def main():
             print("\n\n¡Hasta luego!")
             break
 
-# Ejecutar el programa si se ejecuta directamente
-if __name__ == "__main__":
-    # Ejecutar pruebas primero
-    probar_funciones()
-    print("\n" + "="*60)
-    # Luego ejecutar el programa principal
-    main()
 
-# Ejemplos de uso:
-print("\n=== EJEMPLOS DE USO ===")
-ejemplos = [2, 3, 4, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
+def mostrar_ejemplos():
+    """
+    Muestra ejemplos de uso e información sobre números primos
+    """
+    from primos import UMBRAL_DETERMINISTA, es_primo_optimizado
+
+    print("\n=== EJEMPLOS DE USO ===")
+    ejemplos = [2, 3, 4, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
 
-print("Números primos del 1 al 100:")
-for num in ejemplos:
-    print(f"{num} es primo: {es_primo_optimizado(num)}")
+    print("Números primos del 1 al 100:")
+    for num in ejemplos:
+        print(f"{num} es primo: {es_primo_optimizado(num)}")
 
-print("\nNúmeros no primos del 1 al 20:")
-for num in range(1, 21):
-    if not es_primo_optimizado(num):
-        print(f"{num} no es primo")
+    print("\nNúmeros no primos del 1 al 20:")
+    for num in range(1, 21):
+        if not es_primo_optimizado(num):
+            print(f"{num} no es primo")
 
-# Información adicional sobre números primos
-print("\n=== INFORMACIÓN ADICIONAL ===")
-print("• El 1 NO es considerado un número primo")
-print("• El 2 es el único número primo par")
-print("• Todos los demás números primos son impares")
-print("• Los números primos son infinitos (demostrado por Euclides)")
-print("• Los números primos son fundamentales en criptografía")
+    # Información adicional sobre números primos
+    print("\n=== INFORMACIÓN ADICIONAL ===")
+    print("• El 1 NO es considerado un número primo")
+    print("• El 2 es el único número primo par")
+    print("• Todos los demás números primos son impares")
+    print("• Los números primos son infinitos (demostrado por Euclides)")
+    print("• Los números primos son fundamentales en criptografía")
 
-print("\n=== OPTIMIZACIONES IMPLEMENTADAS ===")
-print("1. Verificación rápida de casos especiales (2, 3, números pares)")
-print("2. Solo verificar hasta la raíz cuadrada del número")
-print("3. Solo verificar divisores de la forma 6k±1 (excluye múltiplos de 2 y 3)")
-print("4. Cache de divisores pequeños para números grandes")
-print("5. Test de Miller-Rabin para números muy grandes (probabilístico)")
-print("6. Criba de Eratóstenes para encontrar múltiples números primos")
-print("7. Comparación de rendimiento entre diferentes algoritmos")
+    print("\n=== OPTIMIZACIONES IMPLEMENTADAS ===")
+    print(f"1. Debajo de {UMBRAL_DETERMINISTA}: división de prueba con rueda 2·3·5·7·11, hasta √n")
+    print(f"2. Desde {UMBRAL_DETERMINISTA}: Miller-Rabin con bases deterministas (n < 2^64) o BPSW")
+    print("3. Consulta O(1) en una tabla de primos en disco, si hay una activa")
+    print("4. Caché opcional delante de las pruebas (bitset denso y LRU)")
+    print("5. Criba segmentada (y en paralelo) para listar y contar muchos primos")
+    print("6. Comparación de rendimiento entre diferentes algoritmos")
+
+
+# Ejecutar el programa si se ejecuta directamente
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--servicio":
+        # Uso: python ejercicio_numerosprimos.py --servicio (peticiones JSON por stdin)
+        # El servicio se importa solo aquí para no cargar asyncio ni multiprocessing al inicio
+        import asyncio
+        from primos.servicio import servir_stdio
+        asyncio.run(servir_stdio())
+    elif len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        # Uso: python ejercicio_numerosprimos.py --benchmark [resultados.json|resultados.csv]
+        from primos import ejecutar_benchmark, guardar_resultados_benchmark, mostrar_resultados_benchmark
+        resultados = ejecutar_benchmark()
+        mostrar_resultados_benchmark(resultados)
+        if len(sys.argv) > 2:
+            guardar_resultados_benchmark(resultados, sys.argv[2])
+            print(f"\nResultados guardados en {sys.argv[2]}")
+    else:
+        # Ejecutar pruebas primero
+        probar_funciones()
+        print("\n" + "="*60)
+        # Luego ejecutar el programa principal
+        main()
+        mostrar_ejemplos()
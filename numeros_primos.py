@@ -1,6 +1,11 @@
 # Programa para determinar si un número es primo
 # Un número primo es aquel que solo es divisible por 1 y por sí mismo
 
+import math
+import sys
+
+from salida import escribir_filas
+
 def es_primo_basico(n):
     """
     Función básica para determinar si un número es primo
@@ -34,8 +39,7 @@ def es_primo_optimizado(n):
         return False
     
     # Verificar divisibilidad por números impares hasta la raíz cuadrada
-    import math
-    for i in range(3, int(math.sqrt(n)) + 1, 2):
+    for i in range(3, math.isqrt(n) + 1, 2):
         if n % i == 0:
             return False
     
@@ -89,27 +93,52 @@ def main():
             print("\n\n¡Hasta luego!")
             break
 
-# Ejecutar el programa si se ejecuta directamente
-if __name__ == "__main__":
-    main()
+def mostrar_ejemplos():
+    """
+    Muestra ejemplos de uso e información sobre números primos
+    """
+    print("\n=== EJEMPLOS DE USO ===")
+    ejemplos = [2, 3, 4, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
+
+    print("Números primos del 1 al 100:")
+    escribir_filas(((num, es_primo_optimizado(num)) for num in ejemplos), plantilla="{} es primo: {}")
 
-# Ejemplos de uso:
-print("\n=== EJEMPLOS DE USO ===")
-ejemplos = [2, 3, 4, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
+    print("\nNúmeros no primos del 1 al 20:")
+    escribir_filas(((num,) for num in range(1, 21) if not es_primo_optimizado(num)),
+                   plantilla="{} no es primo")
 
-print("Números primos del 1 al 100:")
-for num in ejemplos:
-    print(f"{num} es primo: {es_primo_optimizado(num)}")
+    # Información adicional sobre números primos
+    print("\n=== INFORMACIÓN ADICIONAL ===")
+    print("• El 1 NO es considerado un número primo")
+    print("• El 2 es el único número primo par")
+    print("• Todos los demás números primos son impares")
+    print("• Los números primos son infinitos (demostrado por Euclides)")
+    print("• Los números primos son fundamentales en criptografía")
 
-print("\nNúmeros no primos del 1 al 20:")
-for num in range(1, 21):
-    if not es_primo_optimizado(num):
-        print(f"{num} no es primo")
 
-# Información adicional sobre números primos
-print("\n=== INFORMACIÓN ADICIONAL ===")
-print("• El 1 NO es considerado un número primo")
-print("• El 2 es el único número primo par")
-print("• Todos los demás números primos son impares")
-print("• Los números primos son infinitos (demostrado por Euclides)")
-print("• Los números primos son fundamentales en criptografía") 
\ No newline at end of file
+def listar_primos(limite, formato="texto", destino=None):
+    """
+    Escribe los primos hasta limite (uno por fila) por bloques, con la
+    criba segmentada del paquete primos (ver salida.py)
+    Retorna la cantidad de primos escritos
+    """
+    from primos import criba_segmentada
+
+    encabezado = ("primo",) if formato == "csv" else None
+    return escribir_filas(((p,) for p in criba_segmentada(limite)), destino, formato,
+                          encabezado=encabezado)
+
+
+# Ejecutar el programa si se ejecuta directamente
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--servicio":
+        # Modo servicio: peticiones JSON por stdin, agrupadas en lotes (ver primos.servicio)
+        import asyncio
+        from primos.servicio import servir_stdio
+        asyncio.run(servir_stdio())
+    elif len(sys.argv) > 1 and sys.argv[1] == "--listar":
+        # Modo listado: --listar LIMITE [texto|csv|binario] [archivo], escrito por bloques
+        listar_primos(int(sys.argv[2]), *sys.argv[3:5])
+    else:
+        main()
+        mostrar_ejemplos()
@@ -0,0 +1,63 @@
+"""
+Biblioteca de números primos
+
+Importar el paquete no ejecuta ningún cálculo ni imprime nada: cada
+submódulo se importa recién cuando se usa alguna de sus funciones, y NumPy
+solo se carga la primera vez que la necesita una función vectorizada.
+
+    from primos import es_primo_optimizado, criba_segmentada
+"""
+
+import importlib
+
+# Nombre público -> submódulo que lo define
+_EXPORTACIONES = {
+    "primalidad": [
+        "PRIMOS_PEQUENOS", "UMBRAL_DETERMINISTA", "RUEDA_210", "RUEDA_2310",
+        "es_primo_basico", "es_primo_optimizado", "es_primo_rueda", "es_primo_miller_rabin",
+        "es_primo_bpsw", "es_primo_determinista",
+    ],
+    "criba": [
+        "TAM_SEGMENTO",
+        "criba_eratostenes", "criba_segmentada", "iter_primos", "mostrar_primos_hasta",
+        "primos_rueda_hasta",
+    ],
+    "conteo": ["contar_primos"],
+    "paralelo": [
+        "TAM_BLOQUE_PARALELO",
+        "contar_primos_paralelo", "sumar_primos_paralelo", "iter_bloques_primos_paralelo",
+    ],
+    "analisis": ["PATRONES", "analizar_primos"],
+    "multiplicativas": [
+        "FUNCIONES_MULTIPLICATIVAS",
+        "criba_lineal", "guardar_tablas_multiplicativas", "TablasMultiplicativas",
+    ],
+    "tabla": ["TablaPrimos", "guardar_tabla_primos", "usar_tabla_primos"],
+    "cache": ["CachePrimalidad", "activar_cache", "desactivar_cache", "estadisticas_cache"],
+    "lote": ["COTA_TABLA_LOTE", "son_primos", "comparar_rendimiento_lote"],
+    "factorizacion": ["COTA_SPF_LOTE", "factorizar", "factorizar_lote"],
+    "servicio": ["ServicioPrimos", "servir_stdio", "servir_socket"],
+    "benchmark": [
+        "MAX_N_BASICO",
+        "medir", "ejecutar_benchmark", "guardar_resultados_benchmark",
+        "mostrar_resultados_benchmark", "comparar_rendimiento",
+        "medir_importacion", "medir_sobrecarga_llamada", "medir_aceleracion_rueda",
+    ],
+}
+
+_MODULO_DE = {nombre: modulo for modulo, nombres in _EXPORTACIONES.items() for nombre in nombres}
+
+__all__ = sorted(_MODULO_DE)
+
+
+def __getattr__(nombre):
+    modulo = _MODULO_DE.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"el módulo 'primos' no tiene el atributo '{nombre}'")
+    valor = getattr(importlib.import_module(f".{modulo}", __name__), nombre)
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
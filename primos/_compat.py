@@ -0,0 +1,21 @@
+"""
+Carga diferida de dependencias opcionales
+NumPy tarda en importarse, así que solo se carga la primera vez que se usa
+"""
+
+_numpy = None
+_numpy_cargado = False
+
+
+def cargar_numpy():
+    """
+    Retorna el módulo numpy, o None si no está instalado
+    """
+    global _numpy, _numpy_cargado
+    if not _numpy_cargado:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy, _numpy_cargado = numpy, True
+    return _numpy
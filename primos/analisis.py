@@ -0,0 +1,168 @@
+"""
+Analítica de rangos de primos sobre la criba segmentada en paralelo:
+huecos máximos, pares gemelos / cousin / sexy y constelaciones (k-tuplas)
+
+Cada segmento se resume por separado (nada se materializa) y los resúmenes
+se combinan en orden; las tuplas que cruzan un borde se cuentan al combinar
+"""
+
+from itertools import compress
+from operator import sub
+
+from . import paralelo
+from .paralelo import TAM_BLOQUE_PARALELO, _criba_paralela
+
+# Patrones por defecto: desplazamientos respecto del primer primo de la tupla
+PATRONES = {
+    "gemelos": (0, 2),
+    "cousin": (0, 4),
+    "sexy": (0, 6),
+    "trillizos_0_2_6": (0, 2, 6),
+    "trillizos_0_4_6": (0, 4, 6),
+    "cuadruples": (0, 2, 6, 8),
+}
+
+# Cantidad máxima de posiciones que se guardan por patrón
+MAX_POSICIONES = 1000
+
+
+def _resumen_vacio(inicio, fin, patrones):
+    return {
+        "inicio": inicio, "fin": fin, "cantidad": 0, "primero": None, "ultimo": None,
+        "max_hueco": 0, "hueco_desde": None,
+        "conteos": dict.fromkeys(patrones, 0),
+        "posiciones": {nombre: [] for nombre in patrones},
+        "cabeza": [], "cola": [],
+    }
+
+
+def _resumir_segmento(inicio, tam, segmento, patrones, ancho, max_posiciones):
+    """
+    Resume un segmento de impares (índice i = número inicio + 2*i)
+    Las tuplas que no entran completas en el segmento se cuentan al combinar
+    max_posiciones: dict nombre -> cuántas posiciones faltan guardar
+    """
+    fin = inicio + 2 * (tam - 1)
+    resumen = _resumen_vacio(inicio, fin, patrones)
+    primos = list(compress(range(inicio, fin + 1, 2), segmento))
+    if not primos:
+        return resumen
+
+    resumen.update(cantidad=len(primos), primero=primos[0], ultimo=primos[-1])
+    if len(primos) > 1:
+        huecos = list(map(sub, primos[1:], primos))
+        maximo = max(huecos)
+        resumen.update(max_hueco=maximo, hueco_desde=primos[huecos.index(maximo)])
+    resumen["cabeza"] = [p for p in primos[:ancho] if p < inicio + ancho]
+    resumen["cola"] = [p for p in primos[-ancho:] if p > fin - ancho]
+
+    # Un byte por impar: como entero, el bit 8*i es la primalidad del índice i.
+    # Desplazar y combinar con AND marca los inicios de cada tupla completa
+    bits = int.from_bytes(segmento, "little")
+    for nombre, desplazamientos in patrones.items():
+        mascara = bits
+        for d in desplazamientos[1:]:
+            mascara &= bits >> (4 * d)
+        resumen["conteos"][nombre] = mascara.bit_count()
+        faltan = max_posiciones[nombre]
+        if faltan and mascara:
+            marcas = mascara.to_bytes(tam, "little")
+            posiciones = resumen["posiciones"][nombre]
+            i = marcas.find(1)
+            while i != -1 and len(posiciones) < faltan:
+                posiciones.append(inicio + 2 * i)
+                i = marcas.find(1, i + 1)
+    return resumen
+
+
+def _combinar(a, b, patrones, ancho, max_posiciones):
+    """
+    Combina los resúmenes de dos rangos consecutivos (a antes que b)
+    """
+    if a is None:
+        return b
+    combinado = _resumen_vacio(a["inicio"], b["fin"], patrones)
+    combinado["cantidad"] = a["cantidad"] + b["cantidad"]
+    combinado["primero"] = a["primero"] if a["cantidad"] else b["primero"]
+    combinado["ultimo"] = b["ultimo"] if b["cantidad"] else a["ultimo"]
+
+    huecos = [(a["max_hueco"], a["hueco_desde"]), (b["max_hueco"], b["hueco_desde"])]
+    if a["cantidad"] and b["cantidad"]:
+        huecos.append((b["primero"] - a["ultimo"], a["ultimo"]))
+    combinado["max_hueco"], combinado["hueco_desde"] = max(huecos, key=lambda h: h[0])
+
+    # Tuplas que empiezan en la cola de a y terminan en la cabeza de b
+    cercanos = a["cola"] + b["cabeza"]
+    conjunto = set(cercanos)
+    for nombre, desplazamientos in patrones.items():
+        cruzan = [p for p in a["cola"]
+                  if p + desplazamientos[-1] > a["fin"] and all(p + d in conjunto for d in desplazamientos)]
+        combinado["conteos"][nombre] = a["conteos"][nombre] + len(cruzan) + b["conteos"][nombre]
+        combinado["posiciones"][nombre] = (a["posiciones"][nombre] + cruzan
+                                           + b["posiciones"][nombre])[:max_posiciones]
+
+    extremos = sorted(set(a["cabeza"] + a["cola"] + b["cabeza"] + b["cola"]))
+    combinado["cabeza"] = [p for p in extremos if p < combinado["inicio"] + ancho]
+    combinado["cola"] = [p for p in extremos if p > combinado["fin"] - ancho]
+    return combinado
+
+
+def _analizar_bloque(inicio, cantidad, patrones, ancho, max_posiciones):
+    """
+    Resume un bloque en un proceso trabajador, segmento por segmento
+    """
+    resumen = None
+    faltan = dict.fromkeys(patrones, max_posiciones)
+    for inicio_segmento, tam, segmento in paralelo._segmentos_bloque(inicio, cantidad):
+        parcial = _resumir_segmento(inicio_segmento, tam, segmento, patrones, ancho, faltan)
+        resumen = _combinar(resumen, parcial, patrones, ancho, max_posiciones)
+        faltan = {nombre: max_posiciones - len(resumen["posiciones"][nombre]) for nombre in patrones}
+    return resumen
+
+
+def _validar_patrones(patrones):
+    """
+    Retorna los patrones como dict nombre -> tupla de desplazamientos
+    El segmento solo tiene impares (4 bits por número en la máscara), así
+    que los desplazamientos deben empezar en 0 y seguir pares y crecientes
+    """
+    validados = {}
+    for nombre, desplazamientos in patrones.items():
+        desplazamientos = tuple(desplazamientos)
+        if not desplazamientos or desplazamientos[0] != 0:
+            raise ValueError(f"El patrón {nombre!r} debe empezar en 0: {desplazamientos}")
+        for anterior, d in zip(desplazamientos, desplazamientos[1:]):
+            if not isinstance(d, int) or d % 2 or d <= anterior:
+                raise ValueError(f"Los desplazamientos del patrón {nombre!r} deben ser "
+                                 f"enteros pares, positivos y crecientes: {desplazamientos}")
+        validados[nombre] = desplazamientos
+    return validados
+
+
+def analizar_primos(hasta, desde=0, patrones=None, procesos=None,
+                    tam_bloque=TAM_BLOQUE_PARALELO, max_posiciones=MAX_POSICIONES):
+    """
+    Analiza los primos en [desde, hasta] con memoria constante
+    patrones: dict nombre -> desplazamientos (por defecto PATRONES)
+    Retorna la cantidad de primos, el primero y el último, el hueco máximo
+    entre primos consecutivos (y el primo donde empieza), y para cada patrón
+    la cantidad de tuplas y las primeras max_posiciones posiciones
+    Las tuplas se cuentan si todos sus elementos están en el rango
+    Lanza ValueError si un patrón no empieza en 0 o tiene desplazamientos
+    impares, no positivos o no crecientes
+    """
+    patrones = PATRONES if patrones is None else _validar_patrones(patrones)
+    ancho = max([max(d) for d in patrones.values()] + [1])
+
+    resumen = None
+    if desde <= 2 <= hasta:
+        resumen = _resumen_vacio(2, 2, patrones)
+        resumen.update(cantidad=1, primero=2, ultimo=2, cabeza=[2], cola=[2])
+    for parcial in _criba_paralela(hasta, _analizar_bloque, (patrones, ancho, max_posiciones),
+                                   procesos, tam_bloque, desde=desde):
+        resumen = _combinar(resumen, parcial, patrones, ancho, max_posiciones)
+
+    if resumen is None:
+        resumen = _resumen_vacio(desde, hasta, patrones)
+    return {clave: resumen[clave] for clave in
+            ("cantidad", "primero", "ultimo", "max_hueco", "hueco_desde", "conteos", "posiciones")}
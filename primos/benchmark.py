@@ -0,0 +1,268 @@
+"""
+Benchmark de los algoritmos de primalidad y de las cribas
+
+Uso: python -m primos.benchmark [resultados.json|resultados.csv]
+"""
+
+import csv
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from .criba import criba_eratostenes, criba_segmentada
+from .primalidad import (
+    RUEDA_210,
+    RUEDA_2310,
+    _es_primo_6k,
+    es_primo_basico,
+    es_primo_determinista,
+    es_primo_miller_rabin,
+    es_primo_optimizado,
+    es_primo_rueda,
+)
+
+# La función básica es O(n): el benchmark no la mide por encima de este valor
+MAX_N_BASICO = 10**6
+
+
+def medir(funcion, *args, repeticiones=30, calentamiento=3, minimo_ns=50_000):
+    """
+    Mide el tiempo de funcion(*args) con time.perf_counter_ns
+    - Ejecuta primero algunas llamadas de calentamiento que no se miden
+    - Agrupa varias llamadas por muestra hasta superar minimo_ns, para que
+      la resolución del reloj no domine en funciones de microsegundos
+    - Toma varias muestras y retorna estadísticas en nanosegundos por llamada
+    """
+    for _ in range(calentamiento):
+        funcion(*args)
+
+    # Calibrar cuántas llamadas entran en una muestra
+    llamadas = 1
+    while True:
+        inicio = time.perf_counter_ns()
+        for _ in range(llamadas):
+            funcion(*args)
+        if time.perf_counter_ns() - inicio >= minimo_ns or llamadas >= 1 << 20:
+            break
+        llamadas *= 2
+
+    muestras = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter_ns()
+        for _ in range(llamadas):
+            funcion(*args)
+        muestras.append((time.perf_counter_ns() - inicio) / llamadas)
+
+    muestras.sort()
+    percentiles = statistics.quantiles(muestras, n=100, method="inclusive") if len(muestras) > 1 else muestras * 99
+    return {
+        "repeticiones": repeticiones,
+        "llamadas_por_muestra": llamadas,
+        "min_ns": muestras[0],
+        "mediana_ns": statistics.median(muestras),
+        "p90_ns": percentiles[89],
+        "p99_ns": percentiles[98],
+        "max_ns": muestras[-1],
+    }
+
+
+def _mayor_primo_hasta(n):
+    """
+    Mayor primo menor o igual a n (el peor caso de la división de prueba)
+    """
+    while n > 2 and not es_primo_determinista(n):
+        n -= 1
+    return n
+
+
+def ejecutar_benchmark(tamanos=(10**3, 10**4, 10**5, 10**6, 10**7), repeticiones=30, calentamiento=3):
+    """
+    Mide los algoritmos para distintos tamaños de entrada
+    - Primalidad (básica, 6k±1, ruedas 210 y 2310, Miller-Rabin y
+      Miller-Rabin determinista)
+      sobre el mayor primo hasta cada tamaño
+    - Cribas (clásica y segmentada) hasta cada tamaño
+    La básica solo se mide hasta MAX_N_BASICO porque es O(n)
+    Retorna una lista de filas con el algoritmo, el tamaño y los tiempos
+    """
+    algoritmos_primalidad = {
+        "basico": es_primo_basico,
+        "6k±1": _es_primo_6k,
+        "rueda_210": lambda n: es_primo_rueda(n, RUEDA_210),
+        "rueda_2310": lambda n: es_primo_rueda(n, RUEDA_2310),
+        "miller_rabin": es_primo_miller_rabin,
+        "miller_rabin_determinista": es_primo_determinista,
+    }
+    algoritmos_criba = {
+        "criba": criba_eratostenes,
+        "criba_segmentada": lambda limite: sum(1 for _ in criba_segmentada(limite)),
+    }
+
+    resultados = []
+    for n in tamanos:
+        primo = _mayor_primo_hasta(n)
+        for nombre, funcion in algoritmos_primalidad.items():
+            if nombre == "basico" and n > MAX_N_BASICO:
+                continue
+            resultados.append({"algoritmo": nombre, "n": n,
+                               **medir(funcion, primo, repeticiones=repeticiones, calentamiento=calentamiento)})
+        # Las cribas son mucho más lentas por llamada: menos repeticiones
+        for nombre, funcion in algoritmos_criba.items():
+            resultados.append({"algoritmo": nombre, "n": n,
+                               **medir(funcion, n, repeticiones=max(3, repeticiones // 5), calentamiento=1)})
+    return resultados
+
+
+def guardar_resultados_benchmark(resultados, ruta):
+    """
+    Guarda los resultados de ejecutar_benchmark en JSON o CSV (según la extensión)
+    El JSON incluye la fecha, la versión de Python y la plataforma
+    """
+    if str(ruta).endswith(".csv"):
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=list(resultados[0]))
+            escritor.writeheader()
+            escritor.writerows(resultados)
+    else:
+        datos = {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "resultados": resultados,
+        }
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo, ensure_ascii=False, indent=2)
+
+
+def mostrar_resultados_benchmark(resultados):
+    """
+    Imprime una tabla con la mediana y los percentiles de cada medición
+    """
+    print(f"\n{'Algoritmo':<26} {'n':>12} {'mediana':>12} {'p90':>12} {'p99':>12}")
+    print("-" * 78)
+    for fila in resultados:
+        print(f"{fila['algoritmo']:<26} {fila['n']:>12} "
+              f"{_formatear_ns(fila['mediana_ns']):>12} {_formatear_ns(fila['p90_ns']):>12} "
+              f"{_formatear_ns(fila['p99_ns']):>12}")
+
+
+def _formatear_ns(ns):
+    """
+    Formatea un tiempo en nanosegundos con la unidad más legible
+    """
+    for unidad, escala in (("s", 1e9), ("ms", 1e6), ("µs", 1e3)):
+        if ns >= escala:
+            return f"{ns / escala:.2f} {unidad}"
+    return f"{ns:.0f} ns"
+
+
+def comparar_rendimiento(n):
+    """
+    Compara el rendimiento de las diferentes funciones de primalidad
+    Usa medir(): mediana de varias muestras tras un calentamiento
+    """
+    print(f"\n=== COMPARACIÓN DE RENDIMIENTO PARA {n} ===")
+
+    funciones = [("Función básica", es_primo_basico),
+                 ("Función optimizada", es_primo_optimizado),
+                 ("Miller-Rabin", es_primo_miller_rabin)]
+    tiempos = {}
+    for nombre, funcion in funciones:
+        if funcion is es_primo_basico and n > MAX_N_BASICO:
+            print(f"{nombre}: omitida (n > {MAX_N_BASICO})")
+            continue
+        resultado = funcion(n)
+        estadisticas = medir(funcion, n, repeticiones=10, calentamiento=1)
+        tiempos[nombre] = estadisticas["mediana_ns"]
+        print(f"{nombre}: {resultado} (mediana: {_formatear_ns(estadisticas['mediana_ns'])}, "
+              f"p90: {_formatear_ns(estadisticas['p90_ns'])})")
+
+    if tiempos.get("Función básica"):
+        mejora = (tiempos["Función básica"] - tiempos["Función optimizada"]) / tiempos["Función básica"] * 100
+        print(f"Mejora de rendimiento: {mejora:.1f}%")
+
+    return es_primo_optimizado(n)
+
+
+def medir_importacion(modulo="primos", repeticiones=10):
+    """
+    Mide el costo de importar un módulo en un intérprete nuevo
+    Compara `python -c "import modulo"` contra `python -c "pass"` y retorna
+    las medianas en nanosegundos y la diferencia (el costo de la importación)
+    """
+    def mediana_ns(codigo):
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter_ns()
+            subprocess.run([sys.executable, "-c", codigo], check=True)
+            tiempos.append(time.perf_counter_ns() - inicio)
+        return statistics.median(tiempos)
+
+    base = mediana_ns("pass")
+    con_importacion = mediana_ns(f"import {modulo}")
+    return {
+        "modulo": modulo,
+        "interprete_ns": base,
+        "con_importacion_ns": con_importacion,
+        "importacion_ns": con_importacion - base,
+    }
+
+
+def medir_sobrecarga_llamada(n=97, repeticiones=30):
+    """
+    Mide el costo por llamada de las funciones de primalidad para un n
+    pequeño, donde domina la sobrecarga (importaciones, asignaciones) y no
+    el algoritmo. Se compara contra una función vacía como referencia
+    """
+    def vacia(n):
+        return n
+
+    funciones = {
+        "referencia (función vacía)": vacia,
+        "es_primo_optimizado": es_primo_optimizado,
+        "es_primo_miller_rabin": es_primo_miller_rabin,
+        "es_primo_determinista": es_primo_determinista,
+    }
+    return [{"algoritmo": nombre, "n": n, **medir(funcion, n, repeticiones=repeticiones)}
+            for nombre, funcion in funciones.items()]
+
+
+def medir_aceleracion_rueda(tamanos=(10**4, 10**6, 10**8, 10**10, 10**12), repeticiones=15):
+    """
+    Aceleración de la división de prueba por rueda respecto de 6k±1
+    Retorna filas con las medianas y la aceleración de cada rueda
+    """
+    filas = []
+    for n in tamanos:
+        primo = _mayor_primo_hasta(n)
+        base = medir(_es_primo_6k, primo, repeticiones=repeticiones)["mediana_ns"]
+        fila = {"n": n, "6k±1_ns": base}
+        for nombre, rueda in (("rueda_210", RUEDA_210), ("rueda_2310", RUEDA_2310)):
+            mediana = medir(es_primo_rueda, primo, rueda, repeticiones=repeticiones)["mediana_ns"]
+            fila[f"{nombre}_ns"] = mediana
+            fila[f"aceleracion_{nombre}"] = base / mediana
+        filas.append(fila)
+    return filas
+
+
+if __name__ == "__main__":
+    resultados = ejecutar_benchmark()
+    resultados.extend(medir_sobrecarga_llamada())
+    mostrar_resultados_benchmark(resultados)
+
+    print("\nAceleración de la rueda respecto de 6k±1:")
+    for fila in medir_aceleracion_rueda():
+        print(f"n = {fila['n']:>14}: rueda 210 {fila['aceleracion_rueda_210']:.2f}x, "
+              f"rueda 2310 {fila['aceleracion_rueda_2310']:.2f}x")
+
+    importacion = medir_importacion()
+    print(f"\nImportar primos: {_formatear_ns(importacion['importacion_ns'])} "
+          f"(intérprete solo: {_formatear_ns(importacion['interprete_ns'])})")
+
+    if len(sys.argv) > 1:
+        guardar_resultados_benchmark(resultados, sys.argv[1])
+        print(f"\nResultados guardados en {sys.argv[1]}")
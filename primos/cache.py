@@ -0,0 +1,141 @@
+"""
+Caché de resultados de primalidad con métricas de aciertos
+"""
+
+import math
+import threading
+from collections import OrderedDict
+
+from . import primalidad
+from .criba import _cribar_segmento, _primos_impares_hasta
+from .tabla import _empaquetar_bits
+
+# Valores por defecto: bitset denso hasta 2^20 (64 KB) y LRU de 100000 entradas
+COTA_DENSA = 1 << 20
+TAM_LRU = 100_000
+
+
+class CachePrimalidad:
+    """
+    Caché delante de las pruebas de primalidad
+    - n <= cota_densa: bitset denso de impares (un bit por número, O(1))
+    - n > cota_densa: LRU acotada a tam_lru entradas, solo con respuestas
+      exactas (las probabilísticas se leen de ella pero no se guardan)
+    Lleva contadores de aciertos, fallos y desalojos para ajustar el tamaño
+    """
+
+    def __init__(self, cota_densa=COTA_DENSA, tam_lru=TAM_LRU):
+        if tam_lru < 1:
+            raise ValueError(f"El tamaño de la LRU debe ser positivo: {tam_lru}")
+        self.cota_densa = cota_densa
+        self.tam_lru = tam_lru
+        self._densa = self._construir_densa(cota_densa)
+        self._lru = OrderedDict()
+        self._candado = threading.Lock()
+        self.aciertos_densa = 0
+        self.aciertos_lru = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    @staticmethod
+    def _construir_densa(cota):
+        """
+        Bitset de primalidad de los impares hasta cota (bit i = número 2i + 1)
+        """
+        cantidad = cota // 2 + 1
+        segmento = _cribar_segmento(1, cantidad, _primos_impares_hasta(math.isqrt(cota)))
+        segmento[0] = 0
+        segmento.extend(bytes(-cantidad % 8))
+        return _empaquetar_bits(segmento)
+
+    def consultar(self, n, funcion, *args, **kwargs):
+        """
+        Retorna la primalidad de n desde la caché o calculándola con funcion
+        La respuesta calculada se guarda: funcion debe ser exacta
+        """
+        return self._consultar(n, funcion, args, kwargs, guardar=True)
+
+    def consultar_probabilistica(self, n, funcion, *args, **kwargs):
+        """
+        Como consultar, pero la respuesta de funcion (probabilística, por
+        ejemplo Miller-Rabin con bases al azar) no se guarda: si se guardara,
+        las pruebas exactas la servirían como si lo fuera
+        """
+        return self._consultar(n, funcion, args, kwargs, guardar=False)
+
+    def _consultar(self, n, funcion, args, kwargs, guardar):
+        if 0 <= n <= self.cota_densa:
+            # Se cuenta bajo el candado, igual que en la LRU, para que las
+            # estadísticas sean exactas con varios hilos
+            with self._candado:
+                self.aciertos_densa += 1
+            if n % 2 == 0:
+                return n == 2
+            i = n >> 1
+            return bool(self._densa[i >> 3] >> (i & 7) & 1)
+
+        with self._candado:
+            resultado = self._lru.get(n)
+            if resultado is not None:
+                self._lru.move_to_end(n)
+                self.aciertos_lru += 1
+                return resultado
+
+        resultado = funcion(n, *args, **kwargs)
+        with self._candado:
+            self.fallos += 1
+            if not guardar:
+                return resultado
+            self._lru[n] = resultado
+            if len(self._lru) > self.tam_lru:
+                self._lru.popitem(last=False)
+                self.desalojos += 1
+        return resultado
+
+    def estadisticas(self):
+        """
+        Retorna los contadores de la caché y la tasa de aciertos
+        """
+        with self._candado:
+            aciertos = self.aciertos_densa + self.aciertos_lru
+            consultas = aciertos + self.fallos
+            return {
+                "aciertos_densa": self.aciertos_densa,
+                "aciertos_lru": self.aciertos_lru,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "tamano_lru": len(self._lru),
+                "tasa_aciertos": aciertos / consultas if consultas else 0.0,
+            }
+
+    def limpiar(self):
+        """
+        Vacía la LRU y reinicia los contadores (el bitset denso se conserva)
+        """
+        with self._candado:
+            self._lru.clear()
+            self.aciertos_densa = self.aciertos_lru = self.fallos = self.desalojos = 0
+
+
+def activar_cache(cota_densa=COTA_DENSA, tam_lru=TAM_LRU):
+    """
+    Activa una caché delante de todas las pruebas de primalidad
+    (es_primo_basico, es_primo_optimizado, es_primo_miller_rabin,
+    es_primo_bpsw y es_primo_determinista). Retorna la caché activa
+    """
+    primalidad._cache = CachePrimalidad(cota_densa, tam_lru)
+    return primalidad._cache
+
+
+def desactivar_cache():
+    """
+    Desactiva la caché; las pruebas vuelven a calcular cada consulta
+    """
+    primalidad._cache = None
+
+
+def estadisticas_cache():
+    """
+    Contadores de la caché activa, o None si no hay ninguna
+    """
+    return primalidad._cache.estadisticas() if primalidad._cache is not None else None
@@ -0,0 +1,180 @@
+"""
+Cribas de Eratóstenes: clásica, segmentada e incremental (infinita)
+"""
+
+import math
+from itertools import compress
+
+from .primalidad import RUEDA_2310, es_primo_optimizado, es_primo_rueda
+
+# Tamaño de segmento de la criba segmentada (32 KiB, cabe en la caché L1)
+TAM_SEGMENTO = 1 << 15
+
+
+def criba_eratostenes(limite):
+    """
+    Implementación de la Criba de Eratóstenes
+    Encuentra todos los números primos hasta un límite dado
+    Muy eficiente para encontrar múltiples números primos
+    """
+    if limite < 2:
+        return []
+
+    # Crear lista de booleanos inicializada en True
+    es_primo = [True] * (limite + 1)
+    es_primo[0] = es_primo[1] = False
+    
+    # Aplicar la criba
+    for i in range(2, int(limite ** 0.5) + 1):
+        if es_primo[i]:
+            # Marcar todos los múltiplos de i como no primos
+            for j in range(i * i, limite + 1, i):
+                es_primo[j] = False
+    
+    # Retornar lista de números primos
+    return [i for i in range(limite + 1) if es_primo[i]]
+
+
+def _primos_impares_hasta(limite):
+    """
+    Criba simple que solo almacena números impares
+    Retorna los primos impares hasta el límite (se usa para los primos base)
+    """
+    if limite < 3:
+        return []
+    # El índice i representa al número impar 2*i + 1
+    tam = (limite - 1) // 2 + 1
+    es_primo = bytearray([1]) * tam
+    es_primo[0] = 0
+    for i in range(1, (math.isqrt(limite) - 1) // 2 + 1):
+        if es_primo[i]:
+            p = 2 * i + 1
+            inicio = p * p // 2
+            es_primo[inicio::p] = bytes(len(range(inicio, tam, p)))
+    return list(compress(range(1, limite + 1, 2), es_primo))
+
+
+def _cribar_segmento(inicio, cantidad, primos_base):
+    """
+    Criba un segmento de números impares (inicio debe ser impar)
+    Retorna un bytearray donde el índice i representa al número inicio + 2*i
+    primos_base: primos impares ordenados que cubran hasta √(último impar)
+    """
+    fin = inicio + 2 * (cantidad - 1)
+    segmento = bytearray([1]) * cantidad
+
+    for p in primos_base:
+        cuadrado = p * p
+        if cuadrado > fin:
+            break
+        if cuadrado >= inicio:
+            primero = cuadrado
+        else:
+            # Primer múltiplo impar de p dentro del segmento
+            primero = -(-inicio // p) * p
+            if primero % 2 == 0:
+                primero += p
+        indice = (primero - inicio) // 2
+        segmento[indice::p] = bytes(len(range(indice, cantidad, p)))
+
+    return segmento
+
+
+def criba_segmentada(limite, tam_segmento=TAM_SEGMENTO):
+    """
+    Criba de Eratóstenes segmentada (generador)
+    Solo almacena los números impares de cada segmento en un bytearray,
+    por lo que la memoria usada es O(√n + tam_segmento) sin importar el límite
+    tam_segmento: cantidad de impares por segmento (por defecto 32 KiB)
+    Lanza ValueError si tam_segmento no es positivo
+    """
+    if tam_segmento <= 0:
+        raise ValueError(f"El tamaño del segmento debe ser positivo: {tam_segmento}")
+    if limite < 2:
+        return
+    yield 2
+    if limite < 3:
+        return
+
+    primos_base = _primos_impares_hasta(math.isqrt(limite))
+
+    inicio = 3
+    while inicio <= limite:
+        # El segmento cubre los impares inicio, inicio + 2, ..., fin
+        fin = min(inicio + 2 * (tam_segmento - 1), limite)
+        cantidad = (fin - inicio) // 2 + 1
+        segmento = _cribar_segmento(inicio, cantidad, primos_base)
+        yield from compress(range(inicio, fin + 1, 2), segmento)
+        inicio += 2 * cantidad
+
+
+def iter_primos(desde=0, tam_segmento=TAM_SEGMENTO):
+    """
+    Generador infinito de números primos mayores o iguales a desde
+    Criba segmentos de impares a medida que se consumen y solo guarda los
+    primos base hasta √n (se amplían al doble cuando hacen falta), por lo que
+    la memoria es O(√n) y se puede retomar desde cualquier posición
+    Lanza ValueError si tam_segmento no es positivo
+    """
+    if tam_segmento <= 0:
+        raise ValueError(f"El tamaño del segmento debe ser positivo: {tam_segmento}")
+    if desde <= 2:
+        yield 2
+        desde = 3
+
+    inicio = desde | 1
+    primos_base = []
+    limite_base = 0
+
+    while True:
+        fin = inicio + 2 * (tam_segmento - 1)
+        raiz = math.isqrt(fin)
+        if raiz > limite_base:
+            limite_base = max(raiz, 2 * limite_base)
+            primos_base = _primos_impares_hasta(limite_base)
+
+        segmento = _cribar_segmento(inicio, tam_segmento, primos_base)
+        yield from compress(range(inicio, fin + 1, 2), segmento)
+        inicio = fin + 2
+
+
+def mostrar_primos_hasta(limite, metodo="auto"):
+    """
+    Muestra todos los números primos hasta un límite dado
+    metodo: "criba" (criba de Eratóstenes clásica), "segmentada" (criba
+    segmentada con memoria acotada), "optimizado" (prueba cada número),
+    "rueda" (prueba solo los candidatos coprimos con 2310, ver primos_rueda_hasta)
+    o "auto" (criba clásica hasta 1000 y segmentada para límites mayores)
+    """
+    if metodo == "auto":
+        metodo = "criba" if limite <= 1000 else "segmentada"
+
+    if metodo == "criba":
+        return criba_eratostenes(limite)
+    if metodo == "segmentada":
+        return list(criba_segmentada(limite))
+    if metodo == "optimizado":
+        primos = []
+        for i in range(2, limite + 1):
+            if es_primo_optimizado(i):
+                primos.append(i)
+        return primos
+    if metodo == "rueda":
+        return primos_rueda_hasta(limite)
+    raise ValueError(f"Método desconocido: {metodo}")
+
+
+def primos_rueda_hasta(limite, rueda=RUEDA_2310):
+    """
+    Primos hasta limite probando solo los candidatos que deja la rueda
+    (los coprimos con su módulo) con división de prueba por rueda
+    """
+    primos = [p for p in rueda.primos if p <= limite]
+    for base in range(0, limite + 1, rueda.modulo):
+        for r in rueda.residuos:
+            candidato = base + r
+            if candidato > limite:
+                break
+            if candidato > 1 and es_primo_rueda(candidato, rueda):
+                primos.append(candidato)
+    return primos
@@ -0,0 +1,133 @@
+"""
+Factorización de enteros: división de prueba, Pollard rho y tabla SPF
+"""
+
+import math
+from itertools import count
+
+from .criba import _primos_impares_hasta
+from .lote import _a_entero
+from .multiplicativas import criba_lineal
+from .primalidad import es_primo_determinista
+
+# Primos de la división de prueba de factorizar (tabla cacheada)
+PRIMOS_FACTORIZACION_HASTA = 1000
+_primos_factorizacion = None
+
+# Cota de la tabla de menor factor primo de factorizar_lote
+COTA_SPF_LOTE = 1 << 22
+_tabla_spf = None
+
+
+def _obtener_primos_factorizacion():
+    """
+    Retorna la tabla cacheada de primos para la división de prueba
+    """
+    global _primos_factorizacion
+    if _primos_factorizacion is None:
+        _primos_factorizacion = [2] + _primos_impares_hasta(PRIMOS_FACTORIZACION_HASTA)
+    return _primos_factorizacion
+
+
+def _pollard_brent(n):
+    """
+    Encuentra un divisor no trivial de n compuesto e impar
+    Pollard rho con la detección de ciclos de Brent, acumulando los
+    productos |x - y| para calcular un solo mcd cada m pasos
+    """
+    m = 128
+    for c in count(1):
+        y, r, q, g = 2, 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            # El producto acumulado se pasó: retroceder paso a paso
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def factorizar(n):
+    """
+    Descompone n en factores primos (lista ordenada, con repeticiones)
+    - División de prueba por la tabla cacheada de primos pequeños
+    - Miller-Rabin determinista (o BPSW) para reconocer factores primos
+    - Pollard rho (Brent) para separar los factores compuestos restantes
+    """
+    if n < 1:
+        raise ValueError(f"Solo se pueden factorizar enteros positivos: {n}")
+
+    factores = []
+    for p in _obtener_primos_factorizacion():
+        if p * p > n:
+            if n > 1:
+                factores.append(n)
+            return factores
+        while n % p == 0:
+            factores.append(p)
+            n //= p
+
+    pendientes = [n] if n > 1 else []
+    while pendientes:
+        m = pendientes.pop()
+        if es_primo_determinista(m):
+            factores.append(m)
+        else:
+            d = _pollard_brent(m)
+            pendientes.extend((d, m // d))
+    return sorted(factores)
+
+
+def _obtener_tabla_spf(cota):
+    """
+    Retorna la tabla compartida de menor factor primo (SPF), ampliándola
+    si no cubre la cota. Es un arreglo uint32 (NumPy) o array('I') de criba_lineal
+    """
+    global _tabla_spf
+    if _tabla_spf is not None and len(_tabla_spf) > cota:
+        return _tabla_spf
+
+    tam = min(max(1 << max(cota, 1).bit_length(), 1 << 16), COTA_SPF_LOTE)
+    spf = criba_lineal(tam, ["spf"])["spf"]
+    _tabla_spf = spf
+    return spf
+
+
+def factorizar_lote(valores):
+    """
+    Factoriza muchos números a la vez
+    Los valores hasta COTA_SPF_LOTE se descomponen con una tabla compartida
+    de menor factor primo; los demás usan factorizar
+    Retorna una lista con la factorización de cada valor
+    Lanza ValueError si algún valor no es entero (7.9 no se trunca a 7)
+    """
+    valores = [_a_entero(n) for n in valores]
+    pequenos = [n for n in valores if 1 <= n <= COTA_SPF_LOTE]
+    spf = _obtener_tabla_spf(max(pequenos)) if pequenos else None
+
+    resultado = []
+    for n in valores:
+        if spf is None or not 1 <= n < len(spf):
+            resultado.append(factorizar(n))
+            continue
+        factores = []
+        while n > 1:
+            p = int(spf[n])
+            factores.append(p)
+            n //= p
+        resultado.append(factores)
+    return resultado
@@ -0,0 +1,182 @@
+"""
+Primalidad en lote sobre arreglos de NumPy
+"""
+
+import math
+import random
+import time
+
+from ._compat import cargar_numpy
+from .primalidad import es_primo_determinista, es_primo_optimizado
+
+# Cota máxima de la tabla de primalidad compartida por son_primos (16 MB)
+COTA_TABLA_LOTE = 1 << 24
+
+# Primos usados en la división de prueba vectorizada de son_primos
+PRIMOS_DIVISION_LOTE_HASTA = 100
+
+# Bases de Miller-Rabin deterministas para n < 2^32 (versión vectorizada)
+BASES_MILLER_RABIN_32 = (2, 7, 61)
+
+# Tabla de primalidad de son_primos, se construye y amplía bajo demanda
+_tabla_lote = None
+
+
+def _criba_numpy(limite):
+    """
+    Criba de Eratóstenes sobre un arreglo booleano de NumPy
+    """
+    np = cargar_numpy()
+    es_primo = np.ones(limite + 1, dtype=bool)
+    es_primo[:2] = False
+    es_primo[4::2] = False
+    for i in range(3, math.isqrt(limite) + 1, 2):
+        if es_primo[i]:
+            es_primo[i * i::2 * i] = False
+    return es_primo
+
+
+def _obtener_tabla_lote(cota):
+    """
+    Retorna la tabla de primalidad compartida, ampliándola si no cubre la cota
+    La tabla crece en potencias de 2 hasta COTA_TABLA_LOTE
+    """
+    global _tabla_lote
+    if _tabla_lote is None or len(_tabla_lote) <= cota:
+        tam = min(max(1 << max(cota, 1).bit_length(), 1 << 16), COTA_TABLA_LOTE)
+        _tabla_lote = _criba_numpy(tam)
+    return _tabla_lote
+
+
+def _potencia_modular_vectorizada(base, exponentes, modulos):
+    """
+    Calcula base^exponentes % modulos elemento a elemento (modulos < 2^32)
+    """
+    np = cargar_numpy()
+    resultado = np.ones_like(modulos)
+    potencia = np.uint64(base) % modulos
+    exponentes = exponentes.copy()
+    while exponentes.any():
+        impar = (exponentes & np.uint64(1)).astype(bool)
+        resultado = np.where(impar, resultado * potencia % modulos, resultado)
+        potencia = potencia * potencia % modulos
+        exponentes >>= np.uint64(1)
+    return resultado
+
+
+def _miller_rabin_vectorizado(n):
+    """
+    Miller-Rabin determinista sobre un arreglo uint64 de impares 61 < n < 2^32
+    Los productos intermedios caben en 64 bits porque n < 2^32
+    """
+    np = cargar_numpy()
+    uno = np.uint64(1)
+    d = n - uno
+    r = np.zeros(n.shape, dtype=np.int64)
+    pares = (d & uno) == 0
+    while pares.any():
+        d[pares] >>= uno
+        r[pares] += 1
+        pares = (d & uno) == 0
+
+    resultado = np.ones(n.shape, dtype=bool)
+    for a in BASES_MILLER_RABIN_32:
+        x = _potencia_modular_vectorizada(a, d, n)
+        pasa = (x == uno) | (x == n - uno)
+        for i in range(1, int(r.max())):
+            x = x * x % n
+            pasa |= (x == n - uno) & (i < r)
+        resultado &= pasa
+    return resultado
+
+
+def _a_entero(n):
+    """
+    Convierte un valor de un lote a int; rechaza los que no son enteros (7.5)
+    (lo usan son_primos y factorizacion.factorizar_lote)
+    """
+    entero = int(n)
+    if entero != n:
+        raise ValueError(f"Solo se admiten enteros: {n!r}")
+    return entero
+
+
+def son_primos(valores):
+    """
+    Determina la primalidad de muchos números a la vez
+    valores: arreglo de NumPy o cualquier iterable de enteros
+    Retorna un arreglo booleano con la misma forma que la entrada
+    - Valores hasta COTA_TABLA_LOTE: consulta en una tabla de criba compartida
+    - Valores mayores: división de prueba vectorizada por primos pequeños y
+      Miller-Rabin determinista para los candidatos que sobreviven
+      (vectorizado por debajo de 2^32, uno por uno por encima)
+    Sin NumPy instalado retorna una lista de booleanos
+    Lanza ValueError si algún valor no es entero (7.0 se acepta, 7.5 no)
+    """
+    np = cargar_numpy()
+    if np is None:
+        return [es_primo_optimizado(_a_entero(n)) for n in valores]
+
+    if not isinstance(valores, np.ndarray):
+        valores = list(valores)
+    arreglo = np.asarray(valores)
+
+    # Enteros fuera de 64 bits (dtype object) o tipos no enteros: uno por uno
+    if arreglo.dtype.kind not in "iu":
+        resultado = np.fromiter((es_primo_optimizado(_a_entero(n)) for n in arreglo.ravel()),
+                                dtype=bool, count=arreglo.size)
+        return resultado.reshape(arreglo.shape)
+
+    plano = arreglo.ravel()
+    resultado = np.zeros(plano.size, dtype=bool)
+    if plano.size == 0:
+        return resultado.reshape(arreglo.shape)
+
+    # Valores pequeños: consulta directa en la tabla
+    cota = min(int(plano.max()), COTA_TABLA_LOTE)
+    tabla = _obtener_tabla_lote(cota)
+    pequenos = (plano >= 0) & (plano <= cota)
+    resultado[pequenos] = tabla[plano[pequenos]]
+
+    # Valores grandes: división de prueba vectorizada y luego Miller-Rabin
+    indices = np.flatnonzero(plano > cota)
+    if indices.size:
+        candidatos = plano[indices].astype(np.uint64)
+        for p in tabla[:PRIMOS_DIVISION_LOTE_HASTA + 1].nonzero()[0]:
+            vivos = candidatos % np.uint64(p) != 0
+            candidatos, indices = candidatos[vivos], indices[vivos]
+
+        bajos = candidatos < np.uint64(1 << 32)
+        if bajos.any():
+            resultado[indices[bajos]] = _miller_rabin_vectorizado(candidatos[bajos])
+        for i, n in zip(indices[~bajos].tolist(), candidatos[~bajos].tolist()):
+            resultado[i] = es_primo_determinista(n)
+
+    return resultado.reshape(arreglo.shape)
+
+
+def comparar_rendimiento_lote(cantidad=100000, maximo=10**9):
+    """
+    Compara son_primos contra un bucle de es_primo_optimizado elemento a elemento
+    """
+    np = cargar_numpy()
+    valores = [random.randint(0, maximo) for _ in range(cantidad)]
+    print(f"\n=== COMPARACIÓN EN LOTE: {cantidad} números hasta {maximo} ===")
+
+    inicio = time.perf_counter()
+    resultado_bucle = [es_primo_optimizado(n) for n in valores]
+    tiempo_bucle = time.perf_counter() - inicio
+
+    arreglo = np.array(valores, dtype=np.int64) if np is not None else valores
+    inicio = time.perf_counter()
+    resultado_lote = son_primos(arreglo)
+    tiempo_lote = time.perf_counter() - inicio
+
+    coinciden = list(resultado_bucle) == [bool(x) for x in resultado_lote]
+    print(f"Bucle es_primo_optimizado: {tiempo_bucle:.4f}s")
+    print(f"son_primos: {tiempo_lote:.4f}s")
+    if tiempo_lote > 0:
+        print(f"Aceleración: {tiempo_bucle / tiempo_lote:.1f}x")
+    print(f"Resultados coinciden: {coinciden}")
+
+    return {"bucle": tiempo_bucle, "lote": tiempo_lote, "coinciden": coinciden}
@@ -0,0 +1,226 @@
+"""
+Tablas de funciones multiplicativas con una criba lineal (de Euler):
+menor factor primo, φ(n) de Euler, μ(n) de Möbius y cantidad de divisores
+Las tablas se pueden guardar en disco y abrir mapeadas en memoria
+"""
+
+import math
+import mmap
+import os
+import struct
+from array import array
+
+from ._compat import cargar_numpy
+from .criba import _primos_impares_hasta
+
+# Función -> código de tipo de la tabla (array / NumPy)
+# La cantidad de divisores de n < 2^32 no pasa de 1344, así que entra en 16 bits
+FUNCIONES_MULTIPLICATIVAS = {"spf": "I", "phi": "I", "mu": "b", "divisores": "H"}
+
+# Bloque de índices que se procesa por paso en la versión con NumPy
+TAM_BLOQUE_MULTIPLICATIVAS = 1 << 20
+
+# Encabezado del archivo: firma, versión, límite y cantidad de tablas,
+# seguido de una entrada (nombre, tipo, desplazamiento) por tabla
+FIRMA_MULTIPLICATIVAS = b"MULT"
+VERSION_MULTIPLICATIVAS = 1
+ENCABEZADO_MULTIPLICATIVAS = struct.Struct("<4sIQI")
+ENTRADA_MULTIPLICATIVAS = struct.Struct("<12s4sQ")
+
+
+def _validar_funciones(funciones):
+    """
+    Normaliza la lista de funciones pedidas (None = todas)
+    """
+    if funciones is None:
+        return list(FUNCIONES_MULTIPLICATIVAS)
+    funciones = list(dict.fromkeys(funciones))
+    for nombre in funciones:
+        if nombre not in FUNCIONES_MULTIPLICATIVAS:
+            raise ValueError(f"Función multiplicativa desconocida: {nombre!r}")
+    return funciones
+
+
+def _criba_lineal_python(limite):
+    """
+    Criba lineal clásica: cada compuesto se marca una sola vez, con su
+    menor factor primo, y las funciones se deducen de n = p * i
+    exponentes[n] es el exponente del menor factor primo de n
+    """
+    tam = limite + 1
+    spf = array("I", bytes(4 * tam))
+    phi = array("I", bytes(4 * tam))
+    mu = array("b", bytes(tam))
+    divisores = array("H", bytes(2 * tam))
+    exponentes = array("B", bytes(tam))
+    if limite >= 1:
+        spf[1] = phi[1] = mu[1] = divisores[1] = 1
+
+    primos = []
+    for i in range(2, tam):
+        if spf[i] == 0:
+            spf[i], phi[i], mu[i], divisores[i], exponentes[i] = i, i - 1, -1, 2, 1
+            primos.append(i)
+        menor = spf[i]
+        for p in primos:
+            j = i * p
+            if p > menor or j > limite:
+                break
+            spf[j] = p
+            if p == menor:
+                phi[j] = phi[i] * p
+                exponentes[j] = exponentes[i] + 1
+                divisores[j] = divisores[i] // (exponentes[i] + 1) * (exponentes[i] + 2)
+            else:
+                phi[j] = phi[i] * (p - 1)
+                mu[j] = -mu[i]
+                exponentes[j] = 1
+                divisores[j] = divisores[i] * 2
+
+    return {"spf": spf, "phi": phi, "mu": mu, "divisores": divisores}
+
+
+def _criba_lineal_numpy(np, limite, funciones):
+    """
+    Misma recurrencia que la criba lineal, vectorizada por bloques
+    Para n en [inicio, 2*inicio) el cofactor m = n / spf(n) es menor que
+    inicio, así que cada bloque solo lee valores ya calculados
+    """
+    tam = limite + 1
+    spf = np.zeros(tam, dtype=np.uint32)
+    # De mayor a menor: el último primo que escribe es el menor factor
+    for p in reversed([2] + _primos_impares_hasta(math.isqrt(limite))):
+        spf[p * p::p] = p
+    sin_marcar = spf == 0
+    spf[sin_marcar] = np.flatnonzero(sin_marcar)
+    del sin_marcar
+
+    tablas = {"spf": spf}
+    calcular = [nombre for nombre in funciones if nombre != "spf"]
+    if not calcular:
+        return tablas
+    for nombre in calcular:
+        tablas[nombre] = np.zeros(tam, dtype=FUNCIONES_MULTIPLICATIVAS[nombre])
+        if limite >= 1:
+            tablas[nombre][1] = 1
+    phi, mu, divisores = tablas.get("phi"), tablas.get("mu"), tablas.get("divisores")
+    exponentes = np.zeros(tam, dtype=np.uint8) if divisores is not None else None
+
+    inicio = 2
+    while inicio < tam:
+        fin = min(2 * inicio, inicio + TAM_BLOQUE_MULTIPLICATIVAS, tam)
+        p = spf[inicio:fin]
+        m = np.arange(inicio, fin, dtype=np.uint32) // p
+        repetido = spf[m] == p
+        if phi is not None:
+            phi[inicio:fin] = phi[m] * np.where(repetido, p, p - 1)
+        if mu is not None:
+            mu[inicio:fin] = np.where(repetido, 0, -mu[m])
+        if divisores is not None:
+            e = exponentes[m]
+            d = divisores[m]
+            exponentes[inicio:fin] = np.where(repetido, e + 1, 1)
+            divisores[inicio:fin] = np.where(repetido, d // (e + 1) * (e + 2), d * 2)
+        inicio = fin
+    return tablas
+
+
+def criba_lineal(limite, funciones=None):
+    """
+    Calcula en una pasada las tablas de 0..limite de las funciones pedidas
+    ("spf", "phi", "mu", "divisores"; por defecto todas)
+    Retorna un dict nombre -> arreglo (NumPy si está instalado, si no array)
+    Por convención spf[1] = phi[1] = mu[1] = divisores[1] = 1 y todas valen 0 en 0
+    """
+    if not 0 <= limite < 1 << 32:
+        raise ValueError(f"El límite debe estar entre 0 y 2^32 - 1: {limite}")
+    funciones = _validar_funciones(funciones)
+
+    np = cargar_numpy()
+    if np is not None:
+        tablas = _criba_lineal_numpy(np, limite, funciones)
+    else:
+        tablas = _criba_lineal_python(limite)
+    return {nombre: tablas[nombre] for nombre in funciones}
+
+
+def guardar_tablas_multiplicativas(ruta, limite, funciones=None):
+    """
+    Calcula las tablas hasta limite y las guarda en un archivo binario
+    Cada tabla queda alineada a 64 bytes para poder mapearla directamente
+    """
+    funciones = _validar_funciones(funciones)
+    tablas = criba_lineal(limite, funciones)
+
+    desplazamiento = ENCABEZADO_MULTIPLICATIVAS.size + ENTRADA_MULTIPLICATIVAS.size * len(funciones)
+    entradas = []
+    for nombre in funciones:
+        desplazamiento += -desplazamiento % 64
+        entradas.append((nombre, desplazamiento))
+        desplazamiento += (limite + 1) * struct.calcsize(FUNCIONES_MULTIPLICATIVAS[nombre])
+
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(ENCABEZADO_MULTIPLICATIVAS.pack(
+            FIRMA_MULTIPLICATIVAS, VERSION_MULTIPLICATIVAS, limite, len(funciones)))
+        for nombre, inicio in entradas:
+            archivo.write(ENTRADA_MULTIPLICATIVAS.pack(
+                nombre.encode(), FUNCIONES_MULTIPLICATIVAS[nombre].encode(), inicio))
+        for nombre, inicio in entradas:
+            archivo.write(bytes(inicio - archivo.tell()))
+            archivo.write(memoryview(tablas[nombre]).cast("B"))
+
+    os.replace(temporal, ruta)
+
+
+class TablasMultiplicativas:
+    """
+    Tablas multiplicativas en disco mapeadas en memoria de solo lectura
+    tablas["phi"][n] lee φ(n) sin cargar el archivo completo; cada tabla es
+    un memoryview, así que numpy.asarray la convierte sin copiar
+    """
+
+    def __init__(self, ruta):
+        with open(ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            firma, version, limite, cantidad = ENCABEZADO_MULTIPLICATIVAS.unpack_from(self._mapa)
+        except struct.error:
+            firma = version = None
+        if firma != FIRMA_MULTIPLICATIVAS or version != VERSION_MULTIPLICATIVAS:
+            self._mapa.close()
+            raise ValueError(f"El archivo '{ruta}' no es una tabla multiplicativa válida")
+
+        self.ruta = ruta
+        self.limite = limite
+        self._vista = memoryview(self._mapa)
+        self._tablas = {}
+        for i in range(cantidad):
+            nombre, tipo, inicio = ENTRADA_MULTIPLICATIVAS.unpack_from(
+                self._mapa, ENCABEZADO_MULTIPLICATIVAS.size + i * ENTRADA_MULTIPLICATIVAS.size)
+            tipo = tipo.rstrip(b"\0").decode()
+            fin = inicio + (limite + 1) * struct.calcsize(tipo)
+            self._tablas[nombre.rstrip(b"\0").decode()] = self._vista[inicio:fin].cast(tipo)
+        self.funciones = list(self._tablas)
+
+    def __getitem__(self, nombre):
+        if nombre not in self._tablas:
+            raise KeyError(f"La tabla '{self.ruta}' no incluye {nombre!r}")
+        return self._tablas[nombre]
+
+    def __contains__(self, nombre):
+        return nombre in self._tablas
+
+    def close(self):
+        for tabla in self._tablas.values():
+            tabla.release()
+        self._tablas.clear()
+        self._vista.release()
+        self._mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
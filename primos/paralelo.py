@@ -0,0 +1,108 @@
+"""
+Criba segmentada repartida en varios procesos
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+
+from .criba import TAM_SEGMENTO, _cribar_segmento, _primos_impares_hasta
+
+# Cantidad de impares que criba cada tarea de la criba paralela
+TAM_BLOQUE_PARALELO = 1 << 22
+
+# Primos base de cada proceso trabajador de la criba paralela
+_primos_base_trabajador = None
+
+
+def _inicializar_trabajador(primos_base):
+    """
+    Guarda los primos base compartidos en el proceso trabajador
+    """
+    global _primos_base_trabajador
+    _primos_base_trabajador = primos_base
+
+
+def _segmentos_bloque(inicio, cantidad):
+    """
+    Criba un bloque de impares en un proceso trabajador, por segmentos del
+    tamaño de la caché. Genera (inicio, tam, segmento) para cada segmento
+    """
+    fin_bloque = inicio + 2 * cantidad
+    while inicio < fin_bloque:
+        tam = min(TAM_SEGMENTO, (fin_bloque - inicio) // 2)
+        yield inicio, tam, _cribar_segmento(inicio, tam, _primos_base_trabajador)
+        inicio += 2 * tam
+
+
+def _cribar_bloque(inicio, cantidad, modo):
+    """
+    Retorna la cantidad, la suma o la lista de primos de un bloque
+    """
+    resultado = [] if modo == "primos" else 0
+    for inicio, tam, segmento in _segmentos_bloque(inicio, cantidad):
+        if modo == "contar":
+            resultado += segmento.count(1)
+        elif modo == "sumar":
+            resultado += sum(compress(range(inicio, inicio + 2 * tam, 2), segmento))
+        else:
+            resultado.extend(compress(range(inicio, inicio + 2 * tam, 2), segmento))
+    return resultado
+
+
+def _criba_paralela(limite, funcion, args, procesos, tam_bloque, desde=3):
+    """
+    Reparte los impares desde max(desde, 3) hasta limite en bloques y ejecuta
+    funcion(inicio, cantidad, *args) para cada uno en un ProcessPoolExecutor.
+    Retorna los resultados de cada bloque en orden, con como máximo dos
+    bloques pendientes por proceso
+    """
+    if limite < 3:
+        return
+    primos_base = _primos_impares_hasta(math.isqrt(limite))
+    procesos = procesos or os.cpu_count() or 1
+
+    def bloques():
+        inicio = max(desde, 3) | 1
+        while inicio <= limite:
+            cantidad = min(tam_bloque, (limite - inicio) // 2 + 1)
+            yield inicio, cantidad
+            inicio += 2 * cantidad
+
+    with ProcessPoolExecutor(procesos, initializer=_inicializar_trabajador,
+                             initargs=(primos_base,)) as ejecutor:
+        pendientes = []
+        for inicio, cantidad in bloques():
+            pendientes.append(ejecutor.submit(funcion, inicio, cantidad, *args))
+            if len(pendientes) >= 2 * procesos:
+                yield pendientes.pop(0).result()
+        for futuro in pendientes:
+            yield futuro.result()
+
+
+def contar_primos_paralelo(limite, procesos=None, tam_bloque=TAM_BLOQUE_PARALELO):
+    """
+    Cuenta los primos hasta limite con la criba segmentada en varios procesos
+    procesos: cantidad de procesos (por defecto, uno por núcleo)
+    """
+    total = 1 if limite >= 2 else 0
+    return total + sum(_criba_paralela(limite, _cribar_bloque, ("contar",), procesos, tam_bloque))
+
+
+def sumar_primos_paralelo(limite, procesos=None, tam_bloque=TAM_BLOQUE_PARALELO):
+    """
+    Suma los primos hasta limite con la criba segmentada en varios procesos
+    """
+    total = 2 if limite >= 2 else 0
+    return total + sum(_criba_paralela(limite, _cribar_bloque, ("sumar",), procesos, tam_bloque))
+
+
+def iter_bloques_primos_paralelo(limite, procesos=None, tam_bloque=TAM_BLOQUE_PARALELO):
+    """
+    Generador de listas de primos hasta limite, en orden, cribadas en paralelo
+    Cada lista corresponde a un bloque de tam_bloque impares
+    """
+    if limite >= 2:
+        yield [2]
+    yield from _criba_paralela(limite, _cribar_bloque, ("primos",), procesos, tam_bloque)
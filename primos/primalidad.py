@@ -0,0 +1,351 @@
+"""
+Pruebas de primalidad para un solo número
+"""
+
+import functools
+import math
+import random
+from collections import namedtuple
+
+# Primos pequeños usados como rueda de división de prueba antes de Miller-Rabin
+PRIMOS_PEQUENOS = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47,
+                   53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+
+# Conjuntos mínimos de bases de Miller-Rabin que son deterministas por debajo
+# de cada cota (la última, de Jim Sinclair, cubre todo n < 2^64)
+BASES_MILLER_RABIN = (
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (25326001, (2, 3, 5)),
+    (3215031751, (2, 3, 5, 7)),
+    (1 << 64, (2, 325, 9375, 28178, 450775, 9780504, 1795265022)),
+)
+
+# A partir de este valor es_primo_optimizado usa la prueba determinista
+UMBRAL_DETERMINISTA = 1 << 20
+
+
+# Rueda de factorización: módulo (producto de los primos), sus primos y los
+# residuos coprimos con el módulo (primera_vuelta omite el residuo 1)
+Rueda = namedtuple("Rueda", "modulo primos residuos primera_vuelta")
+
+
+def _construir_rueda(primos):
+    """
+    Rueda de factorización para los primos dados
+    """
+    modulo = math.prod(primos)
+    residuos = tuple(r for r in range(1, modulo) if math.gcd(r, modulo) == 1)
+    return Rueda(modulo, tuple(primos), residuos, residuos[1:])
+
+
+# Ruedas precalculadas al cargar el módulo:
+# 2·3·5·7 = 210 deja 48 candidatos (descarta el 77%) y
+# 2·3·5·7·11 = 2310 deja 480 candidatos (descarta el 79%)
+RUEDA_210 = _construir_rueda((2, 3, 5, 7))
+RUEDA_2310 = _construir_rueda((2, 3, 5, 7, 11))
+
+# Tabla en disco activa para es_primo_optimizado (ver tabla.usar_tabla_primos)
+_tabla_disco = None
+
+# Caché activa delante de las pruebas de primalidad (ver cache.activar_cache)
+_cache = None
+
+
+def _con_cache(funcion=None, *, exacta=None):
+    """
+    Decorador que consulta la caché activa antes de ejecutar la prueba
+    Las llamadas internas entre pruebas usan funcion.__wrapped__ para que
+    cada consulta del usuario cuente una sola vez en las métricas
+    exacta(n, *args, **kwargs): si retorna False la respuesta es
+    probabilística y no se guarda en la caché (por defecto todas se guardan)
+    """
+    if funcion is None:
+        return functools.partial(_con_cache, exacta=exacta)
+
+    @functools.wraps(funcion)
+    def envoltura(n, *args, **kwargs):
+        if _cache is None:
+            return funcion(n, *args, **kwargs)
+        if exacta is not None and not exacta(n, *args, **kwargs):
+            return _cache.consultar_probabilistica(n, funcion, *args, **kwargs)
+        return _cache.consultar(n, funcion, *args, **kwargs)
+    return envoltura
+
+
+@_con_cache
+def es_primo_basico(n):
+    """
+    Función básica para determinar si un número es primo
+    """
+    # Los números menores a 2 no son primos
+    if n < 2:
+        return False
+    
+    # Verificar divisibilidad desde 2 hasta n-1
+    for i in range(2, n):
+        if n % i == 0:
+            return False
+    
+    return True
+
+
+@_con_cache
+def es_primo_optimizado(n):
+    """
+    Función altamente optimizada para determinar si un número es primo
+    Aplica múltiples optimizaciones:
+    - Verificación rápida de casos especiales
+    - Solo verifica hasta la raíz cuadrada
+    - Solo verifica divisores coprimos con 2310 (rueda 2·3·5·7·11)
+    - Miller-Rabin determinista (o BPSW) a partir de UMBRAL_DETERMINISTA
+    - Consulta O(1) en la tabla en disco si hay una activa
+    """
+    # Casos especiales rápidos
+    if n < 2:
+        return False
+    if _tabla_disco is not None and n <= _tabla_disco.limite:
+        return _tabla_disco.es_primo(n)
+
+    # Para números grandes, Miller-Rabin determinista / BPSW
+    if n >= UMBRAL_DETERMINISTA:
+        return es_primo_determinista.__wrapped__(n)
+
+    return es_primo_rueda(n)
+
+
+def es_primo_rueda(n, rueda=RUEDA_2310):
+    """
+    División de prueba con factorización por rueda
+    Tras descartar los primos de la rueda solo prueba divisores coprimos
+    con su módulo, hasta √n
+    rueda: RUEDA_2310 (por defecto) o RUEDA_210
+    """
+    if n < 2:
+        return False
+    for p in rueda.primos:
+        if n % p == 0:
+            return n == p
+
+    modulo, residuos = rueda.modulo, rueda.residuos
+    limite = math.isqrt(n)
+    # Primera vuelta: se salta el residuo 1
+    for d in rueda.primera_vuelta:
+        if d > limite:
+            return True
+        if n % d == 0:
+            return False
+
+    # Vueltas completas sin comparar cada divisor contra el límite
+    base = modulo
+    while base + modulo <= limite:
+        for r in residuos:
+            if n % (base + r) == 0:
+                return False
+        base += modulo
+
+    # Última vuelta parcial
+    for r in residuos:
+        d = base + r
+        if d > limite:
+            break
+        if n % d == 0:
+            return False
+    return True
+
+
+def _es_primo_6k(n):
+    """
+    División de prueba por divisores de la forma 6k±1 hasta √n
+    n debe ser mayor que 3 y no divisible por 2 ni por 3
+    Se conserva como referencia para medir la rueda
+    """
+    limite = math.isqrt(n)
+    for i in range(5, limite + 1, 6):
+        if n % i == 0 or n % (i + 2) == 0:
+            return False
+    return True
+
+
+@_con_cache(exacta=lambda n, k=5, determinista=False: determinista)
+def es_primo_miller_rabin(n, k=5, determinista=False):
+    """
+    Test de primalidad de Miller-Rabin (probabilístico)
+    Muy eficiente para números grandes
+    k: número de iteraciones (mayor k = mayor precisión)
+    determinista: si es True usa bases fijas (ver es_primo_determinista)
+    """
+    if determinista:
+        return es_primo_determinista.__wrapped__(n)
+    if n < 2:
+        return False
+    if n == 2 or n == 3:
+        return True
+    if n % 2 == 0:
+        return False
+    
+    # Escribir n-1 como 2^r * d
+    r, d = 0, n - 1
+    while d % 2 == 0:
+        r += 1
+        d //= 2
+    
+    # Test de Miller-Rabin
+    for _ in range(k):
+        a = random.randint(2, n - 2)
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = (x * x) % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _division_prueba(n):
+    """
+    División de prueba por la rueda de primos pequeños
+    Retorna True/False si decide la primalidad, o None si n sigue indeterminado
+    """
+    if n < 2:
+        return False
+    for p in PRIMOS_PEQUENOS:
+        if n % p == 0:
+            return n == p
+    if n < PRIMOS_PEQUENOS[-1] ** 2:
+        return True
+    return None
+
+
+def _es_probable_primo_fuerte(n, a, d, r):
+    """
+    Ronda de Miller-Rabin con base a, donde n - 1 = 2^r * d con d impar
+    """
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(r - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def _jacobi(a, n):
+    """
+    Símbolo de Jacobi (a/n) para n impar positivo
+    """
+    a %= n
+    resultado = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                resultado = -resultado
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            resultado = -resultado
+        a %= n
+    return resultado if n == 1 else 0
+
+
+def _es_lucas_fuerte(n):
+    """
+    Prueba fuerte de Lucas con los parámetros de Selfridge (método A)
+    n debe ser impar, sin factores pequeños y no ser un cuadrado perfecto
+    """
+    # Primer D de la secuencia 5, -7, 9, -11, ... con (D/n) = -1
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) < n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    # n + 1 = 2^s * d con d impar
+    d, s = n + 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    # Cálculo binario de U_d, V_d y Q^d módulo n
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = P * U + V, D * U + P * V
+            if U % 2:
+                U += n
+            if V % 2:
+                V += n
+            U, V = (U // 2) % n, (V // 2) % n
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+
+@_con_cache
+def es_primo_bpsw(n):
+    """
+    Prueba de primalidad de Baillie-PSW
+    Combina Miller-Rabin en base 2 con la prueba fuerte de Lucas
+    No se conoce ningún compuesto que la supere
+    """
+    resultado = _division_prueba(n)
+    if resultado is not None:
+        return resultado
+
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    if not _es_probable_primo_fuerte(n, 2, d, r):
+        return False
+
+    if math.isqrt(n) ** 2 == n:
+        return False
+    return _es_lucas_fuerte(n)
+
+
+@_con_cache
+def es_primo_determinista(n):
+    """
+    Test de primalidad determinista (sin números aleatorios)
+    - División de prueba por una rueda de primos pequeños
+    - Miller-Rabin con bases fijas para n < 2^64 (resultado exacto)
+    - Baillie-PSW para n >= 2^64
+    """
+    resultado = _division_prueba(n)
+    if resultado is not None:
+        return resultado
+
+    for cota, bases in BASES_MILLER_RABIN:
+        if n < cota:
+            break
+    else:
+        return es_primo_bpsw.__wrapped__(n)
+
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for a in bases:
+        a %= n
+        if a and not _es_probable_primo_fuerte(n, a, d, r):
+            return False
+    return True
@@ -0,0 +1,301 @@
+"""
+Servicio asyncio de primalidad con peticiones agrupadas en micro-lotes
+
+Protocolo: una petición JSON por línea y una respuesta JSON por línea
+    {"id": 1, "op": "es_primo", "n": 97}
+    {"id": 1, "resultado": true, "latencia_ms": 0.41}
+Operaciones: es_primo, factorizar, contar_primos, primos_hasta
+Las respuestas pueden llegar en otro orden: se asocian por "id"
+
+Uso:
+    python -m primos.servicio                      # stdin/stdout
+    python -m primos.servicio < peticiones.jsonl   # stdin desde un archivo
+    python -m primos.servicio --socket /tmp/primos.sock
+    python -m primos.servicio --puerto 8765
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import stat
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .conteo import contar_primos
+from .criba import mostrar_primos_hasta
+from .factorizacion import factorizar
+from .primalidad import es_primo_optimizado
+
+# Operaciones disponibles y función que las resuelve
+OPERACIONES = {
+    "es_primo": es_primo_optimizado,
+    "factorizar": factorizar,
+    "contar_primos": contar_primos,
+    "primos_hasta": mostrar_primos_hasta,
+}
+
+# primos_hasta responde con la lista completa: se limita su tamaño
+MAX_PRIMOS_HASTA = 10**7
+
+# Mayor n que admite cada operación, para que ninguna petición bloquee el
+# servicio: contar_primos(10**12) tarda unos 2 s (y usa int64), factorizar
+# hasta 2**64 deja factores de a lo sumo 32 bits para Pollard-Brent
+MAX_N = {
+    "es_primo": 1 << 2048,
+    "factorizar": 1 << 64,
+    "contar_primos": 10**12,
+    "primos_hasta": MAX_PRIMOS_HASTA,
+}
+
+# Un lote se envía al llegar a TAM_LOTE peticiones o tras ESPERA_LOTE_MS
+TAM_LOTE = 256
+ESPERA_LOTE_MS = 2
+
+# Peticiones sin responder por conexión antes de dejar de leer
+MAX_PENDIENTES = 4 * TAM_LOTE
+
+# Bytes pendientes de envío a partir de los cuales se espera al cliente
+LIMITE_ESCRITURA = 1 << 16
+
+
+def _procesar_lote(tareas):
+    """
+    Resuelve un lote de (operación, n) en un proceso trabajador
+    Retorna una lista de (True, resultado) o (False, mensaje de error)
+    """
+    resultados = []
+    for op, n in tareas:
+        try:
+            resultados.append((True, OPERACIONES[op](n)))
+        except Exception as e:
+            resultados.append((False, f"{type(e).__name__}: {e}"))
+    return resultados
+
+
+def _validar(peticion):
+    """
+    Valida una petición y retorna (op, n); lanza ValueError si es inválida
+    """
+    if not isinstance(peticion, dict):
+        raise ValueError("La petición debe ser un objeto JSON")
+    op, n = peticion.get("op"), peticion.get("n")
+    if op not in OPERACIONES:
+        raise ValueError(f"Operación desconocida: {op}")
+    if not isinstance(n, int) or isinstance(n, bool):
+        raise ValueError(f"'n' debe ser un entero: {n!r}")
+    if n > MAX_N[op]:
+        raise ValueError(f"{op} admite n <= {MAX_N[op]}")
+    return op, n
+
+
+class ServicioPrimos:
+    """
+    Agrupa las peticiones concurrentes en micro-lotes y los resuelve en un
+    ProcessPoolExecutor. Cada respuesta informa su latencia desde que llegó
+    """
+
+    def __init__(self, procesos=None, tam_lote=TAM_LOTE, espera_lote_ms=ESPERA_LOTE_MS):
+        self.procesos = procesos
+        self.tam_lote = tam_lote
+        self.espera_lote = espera_lote_ms / 1000
+        self._cola = None
+        self._ejecutor = None
+        self._despachador = None
+        self._lotes_en_curso = set()
+
+    async def __aenter__(self):
+        self._cola = asyncio.Queue()
+        self._ejecutor = ProcessPoolExecutor(self.procesos)
+        self._despachador = asyncio.create_task(self._despachar())
+        return self
+
+    async def __aexit__(self, *args):
+        self._despachador.cancel()
+        if self._lotes_en_curso:
+            await asyncio.gather(*self._lotes_en_curso, return_exceptions=True)
+        self._ejecutor.shutdown(cancel_futures=True)
+
+    async def resolver(self, peticion):
+        """
+        Resuelve una petición (dict) y retorna el dict de respuesta
+        """
+        inicio = time.perf_counter_ns()
+        respuesta = {"id": peticion.get("id")} if isinstance(peticion, dict) else {"id": None}
+        try:
+            tarea = _validar(peticion)
+        except ValueError as e:
+            respuesta["error"] = str(e)
+        else:
+            futuro = asyncio.get_running_loop().create_future()
+            await self._cola.put((tarea, futuro))
+            exito, valor = await futuro
+            respuesta["resultado" if exito else "error"] = valor
+        respuesta["latencia_ms"] = round((time.perf_counter_ns() - inicio) / 1e6, 3)
+        return respuesta
+
+    async def resolver_linea(self, linea):
+        """
+        Resuelve una línea JSON y retorna la línea JSON de respuesta
+        """
+        try:
+            peticion = json.loads(linea)
+        except ValueError as e:
+            # JSONDecodeError, o un entero con demasiados dígitos
+            return json.dumps({"id": None, "error": f"JSON inválido: {e}"}, ensure_ascii=False)
+        return json.dumps(await self.resolver(peticion), ensure_ascii=False)
+
+    async def _despachar(self):
+        """
+        Junta peticiones hasta completar un lote o agotar la espera y lo
+        envía a los procesos sin esperar la respuesta del lote anterior
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._cola.get()]
+            limite = loop.time() + self.espera_lote
+            while len(lote) < self.tam_lote:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+            tarea = asyncio.create_task(self._ejecutar_lote(lote))
+            self._lotes_en_curso.add(tarea)
+            tarea.add_done_callback(self._lotes_en_curso.discard)
+
+    async def _ejecutar_lote(self, lote):
+        """
+        Resuelve un lote en el ejecutor y completa los futuros de cada petición
+        """
+        tareas = [tarea for tarea, _ in lote]
+        try:
+            resultados = await asyncio.get_running_loop().run_in_executor(
+                self._ejecutor, _procesar_lote, tareas)
+        except Exception as e:
+            resultados = [(False, f"{type(e).__name__}: {e}")] * len(lote)
+        for (_, futuro), resultado in zip(lote, resultados):
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+
+async def _atender_flujo(servicio, lector, escribir):
+    """
+    Lee peticiones línea a línea y responde cada una apenas está lista,
+    sin esperar a las anteriores (permite encadenar peticiones)
+    escribir es una corrutina; con MAX_PENDIENTES respuestas sin enviar se
+    deja de leer hasta que el cliente las reciba
+    """
+    pendientes = set()
+
+    async def responder(linea):
+        await escribir(await servicio.resolver_linea(linea) + "\n")
+
+    while linea := await lector.readline():
+        if not linea.strip():
+            continue
+        if len(pendientes) >= MAX_PENDIENTES:
+            await asyncio.wait(pendientes, return_when=asyncio.FIRST_COMPLETED)
+        tarea = asyncio.create_task(responder(linea))
+        pendientes.add(tarea)
+        tarea.add_done_callback(pendientes.discard)
+    if pendientes:
+        await asyncio.gather(*pendientes)
+
+
+class _LectorEnHilo:
+    """
+    Lector de líneas para un stdin que no admite lectura asíncrona (un
+    archivo redirigido, /dev/null): cada línea se lee en un hilo
+    """
+
+    def __init__(self, flujo):
+        self._flujo = flujo
+
+    async def readline(self):
+        return await asyncio.get_running_loop().run_in_executor(None, self._flujo.readline)
+
+
+def _es_tuberia(flujo):
+    """
+    True si el flujo es una tubería, un socket o una terminal
+    """
+    try:
+        modo = os.fstat(flujo.fileno()).st_mode
+        return stat.S_ISFIFO(modo) or stat.S_ISSOCK(modo) or flujo.isatty()
+    except (OSError, ValueError):
+        return False
+
+
+async def servir_stdio(**opciones):
+    """
+    Atiende peticiones JSON por stdin y responde por stdout
+    """
+    if _es_tuberia(sys.stdin):
+        lector = asyncio.StreamReader()
+        await asyncio.get_running_loop().connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(lector), sys.stdin)
+    else:
+        lector = _LectorEnHilo(sys.stdin.buffer)
+
+    async def escribir(texto):
+        sys.stdout.write(texto)
+        sys.stdout.flush()
+
+    async with ServicioPrimos(**opciones) as servicio:
+        await _atender_flujo(servicio, lector, escribir)
+
+
+async def servir_socket(ruta=None, host="127.0.0.1", puerto=8765, **opciones):
+    """
+    Atiende peticiones JSON en un socket Unix (ruta) o TCP local (host, puerto)
+    Cada conexión puede enviar muchas peticiones sin esperar las respuestas
+    """
+    async with ServicioPrimos(**opciones) as servicio:
+        async def atender(lector, escritor):
+            async def escribir(texto):
+                escritor.write(texto.encode())
+                if escritor.transport.get_write_buffer_size() > LIMITE_ESCRITURA:
+                    await escritor.drain()
+
+            try:
+                await _atender_flujo(servicio, lector, escribir)
+                await escritor.drain()
+            except ConnectionError:
+                pass
+            finally:
+                escritor.close()
+
+        if ruta:
+            servidor = await asyncio.start_unix_server(atender, path=ruta)
+        else:
+            servidor = await asyncio.start_server(atender, host, puerto)
+        async with servidor:
+            await servidor.serve_forever()
+
+
+def main():
+    """
+    Punto de entrada por línea de comandos
+    """
+    parser = argparse.ArgumentParser(description="Servicio de primalidad por líneas JSON")
+    parser.add_argument("--socket", help="Ruta de un socket Unix")
+    parser.add_argument("--puerto", type=int, help="Puerto TCP local")
+    parser.add_argument("--procesos", type=int, help="Procesos trabajadores (default: uno por núcleo)")
+    args = parser.parse_args()
+
+    opciones = {"procesos": args.procesos}
+    try:
+        if args.socket or args.puerto:
+            asyncio.run(servir_socket(args.socket, puerto=args.puerto or 8765, **opciones))
+        else:
+            asyncio.run(servir_stdio(**opciones))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
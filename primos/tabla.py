@@ -0,0 +1,114 @@
+"""
+Tabla de primalidad persistente en disco, consultada con mmap
+"""
+
+import math
+import mmap
+import os
+import struct
+
+from . import primalidad
+from ._compat import cargar_numpy
+from .criba import TAM_SEGMENTO, _cribar_segmento, _primos_impares_hasta
+
+# Encabezado del archivo de tabla de primos: firma, versión y límite
+FIRMA_TABLA = b"PRIM"
+VERSION_TABLA = 1
+ENCABEZADO_TABLA = struct.Struct("<4sIQ")
+
+
+def _empaquetar_bits(segmento):
+    """
+    Empaqueta un bytearray de 0/1 (longitud múltiplo de 8) en bits,
+    con el bit menos significativo de cada byte como primer elemento
+    """
+    np = cargar_numpy()
+    if np is not None:
+        return np.packbits(np.frombuffer(segmento, dtype=np.uint8), bitorder="little").tobytes()
+    # Cada palabra de 8 bytes se reduce a un byte con una multiplicación
+    palabras = memoryview(segmento).cast("Q")
+    return bytes((w * 0x0102040810204080 >> 56) & 0xFF for w in palabras)
+
+
+def guardar_tabla_primos(ruta, limite, tam_segmento=TAM_SEGMENTO):
+    """
+    Construye una tabla de primalidad hasta limite y la guarda en disco
+    Solo se guardan los impares, un bit por número (limite / 16 bytes)
+    La criba se hace por segmentos, así que la memoria usada es acotada
+    """
+    tam_segmento = max(8, tam_segmento - tam_segmento % 8)
+    primos_base = _primos_impares_hasta(math.isqrt(limite))
+    temporal = f"{ruta}.tmp"
+
+    with open(temporal, "wb") as archivo:
+        archivo.write(ENCABEZADO_TABLA.pack(FIRMA_TABLA, VERSION_TABLA, limite))
+        inicio = 1
+        while inicio <= limite:
+            cantidad = min(tam_segmento, (limite - inicio) // 2 + 1)
+            segmento = _cribar_segmento(inicio, cantidad, primos_base)
+            if inicio == 1:
+                segmento[0] = 0
+            # Completar con ceros hasta un múltiplo de 8
+            segmento.extend(bytes(-cantidad % 8))
+            archivo.write(_empaquetar_bits(segmento))
+            inicio += 2 * cantidad
+
+    os.replace(temporal, ruta)
+
+
+class TablaPrimos:
+    """
+    Tabla de primalidad en disco mapeada en memoria de solo lectura
+    Varios procesos que abren el mismo archivo comparten las páginas en caché
+    """
+
+    def __init__(self, ruta):
+        with open(ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mapa) < ENCABEZADO_TABLA.size:
+            self._mapa.close()
+            raise ValueError(f"El archivo '{ruta}' no es una tabla de primos")
+        firma, version, limite = ENCABEZADO_TABLA.unpack_from(self._mapa)
+        if firma != FIRMA_TABLA or version != VERSION_TABLA:
+            self._mapa.close()
+            raise ValueError(f"El archivo '{ruta}' no es una tabla de primos válida")
+
+        self.ruta = ruta
+        self.limite = limite
+
+    def es_primo(self, n):
+        """
+        Consulta O(1) de la primalidad de n (0 <= n <= limite)
+        """
+        if n > self.limite or n < 0:
+            raise ValueError(f"{n} está fuera de la tabla (límite {self.limite})")
+        if n % 2 == 0:
+            return n == 2
+        i = n >> 1
+        return bool(self._mapa[ENCABEZADO_TABLA.size + (i >> 3)] >> (i & 7) & 1)
+
+    def __contains__(self, n):
+        return 0 <= n <= self.limite and self.es_primo(n)
+
+    def close(self):
+        self._mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def usar_tabla_primos(ruta):
+    """
+    Activa una tabla en disco para que es_primo_optimizado la consulte
+    Con ruta=None se desactiva. Retorna la tabla activa (o None)
+    """
+    if primalidad._tabla_disco is not None:
+        primalidad._tabla_disco.close()
+        primalidad._tabla_disco = None
+    if ruta is not None:
+        primalidad._tabla_disco = TablaPrimos(ruta)
+    return primalidad._tabla_disco
@@ -0,0 +1,135 @@
+# Etapa de salida por bloques para listados grandes (cuadrados, primos)
+# En vez de un print() por elemento, formatea miles de filas de una vez y
+# las escribe por un buffer grande a stdout o a un archivo
+#
+#   with EscritorFilas(formato="csv", encabezado=("n", "cuadrado")) as escritor:
+#       escritor.escribir(zip(numeros, cuadrados))
+
+import csv
+import io
+import sys
+from array import array
+from itertools import chain, islice, starmap
+
+FORMATOS = ("texto", "csv", "binario")
+
+# Filas que se formatean juntas y tamaño del buffer de escritura
+TAM_BLOQUE_SALIDA = 1 << 16
+TAM_BUFFER_SALIDA = 1 << 20
+
+
+class EscritorFilas:
+    """
+    Escribe filas (tuplas) en bloques a stdout o a un archivo
+    - texto: cada fila se formatea con plantilla (str.format, ej. "{}² = {}")
+    - csv: filas separadas por comas, con encabezado opcional
+    - binario: cada valor como entero de 64 bits little-endian, sin separadores
+    destino: None (stdout), una ruta o un archivo abierto
+    """
+
+    def __init__(self, destino=None, formato="texto", plantilla=None, encabezado=None,
+                 tam_bloque=TAM_BLOQUE_SALIDA, tam_buffer=TAM_BUFFER_SALIDA):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato no válido: {formato!r} (opciones: {', '.join(FORMATOS)})")
+        self.formato = formato
+        self.tam_bloque = tam_bloque
+        self.filas_escritas = 0
+        self._plantilla = None
+        if formato == "texto":
+            self._plantilla = (plantilla if plantilla is not None else "{}") + "\n"
+
+        # El texto se codifica una vez por bloque y se escribe como bytes,
+        # con la codificación del flujo (UTF-8 en los archivos propios); un
+        # flujo de texto sin .buffer (io.StringIO) recibe str
+        self._propio = isinstance(destino, (str, bytes)) or hasattr(destino, "__fspath__")
+        self._codificacion, self._errores, self._texto = "utf-8", "strict", False
+        if self._propio:
+            self._archivo = open(destino, "wb", buffering=tam_buffer)
+        else:
+            flujo = sys.stdout if destino is None else destino
+            # Vaciar lo que haya quedado de print() antes de escribir por debajo
+            if hasattr(flujo, "flush"):
+                flujo.flush()
+            self._codificacion = getattr(flujo, "encoding", None) or "utf-8"
+            self._errores = getattr(flujo, "errors", None) or "strict"
+            self._archivo = getattr(flujo, "buffer", flujo)
+            self._texto = self._archivo is flujo and isinstance(flujo, io.TextIOBase)
+            if self._texto and formato == "binario":
+                raise ValueError("El formato binario necesita un destino binario")
+
+        if encabezado is not None:
+            if formato == "csv":
+                self._archivo.write(self._codificar(self._csv([encabezado])))
+            elif formato == "texto":
+                self._archivo.write(self._codificar("\t".join(map(str, encabezado)) + "\n"))
+
+    def _codificar(self, texto):
+        return texto if self._texto else texto.encode(self._codificacion, self._errores)
+
+    def _csv(self, filas):
+        texto = io.StringIO()
+        csv.writer(texto, lineterminator="\n").writerows(filas)
+        return texto.getvalue()
+
+    def _formatear(self, bloque):
+        if self.formato == "texto":
+            return self._codificar("".join(starmap(self._plantilla.format, bloque)))
+        if self.formato == "csv":
+            return self._codificar(self._csv(bloque))
+        return array("q", chain.from_iterable(bloque)).tobytes()
+
+    def escribir(self, filas):
+        """
+        Escribe todas las filas de un iterable (puede ser un generador)
+        Retorna la cantidad de filas escritas en esta llamada
+        """
+        filas = iter(filas)
+        cantidad = 0
+        while True:
+            bloque = list(islice(filas, self.tam_bloque))
+            if not bloque:
+                break
+            self._archivo.write(self._formatear(bloque))
+            cantidad += len(bloque)
+        self.filas_escritas += cantidad
+        return cantidad
+
+    def escribir_texto(self, texto):
+        """
+        Escribe texto ya formateado (por ejemplo, un bloque de líneas)
+        con la misma codificación y el mismo buffer que las filas
+        """
+        if self.formato == "binario":
+            raise ValueError("escribir_texto no admite el formato binario")
+        self._archivo.write(self._codificar(texto))
+
+    def close(self):
+        if self._propio:
+            self._archivo.close()
+        else:
+            self._archivo.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def escribir_filas(filas, destino=None, formato="texto", plantilla=None, encabezado=None):
+    """
+    Atajo para escribir un iterable de filas de una vez
+    Retorna la cantidad de filas escritas
+    """
+    with EscritorFilas(destino, formato, plantilla, encabezado) as escritor:
+        return escritor.escribir(filas)
+
+
+def leer_binario(ruta, columnas):
+    """
+    Lee un archivo escrito en formato binario y retorna la lista de filas
+    """
+    valores = array("q")
+    with open(ruta, "rb") as archivo:
+        valores.frombytes(archivo.read())
+    return [tuple(valores[i:i + columnas]) for i in range(0, len(valores), columnas)]
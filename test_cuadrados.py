@@ -1,3 +1,7 @@
+import pytest
+
+from autocompletar import cargar_autocompletar
+
 def cuadrados(n):
     """
     Genera una lista con los cuadrados de los primeros n números naturales.
@@ -62,5 +66,70 @@ def probar_cuadrados():
     
     print("\n=== TODAS LAS PRUEBAS COMPLETADAS EXITOSAMENTE ===")
 
+def test_iter_cuadrados():
+    """Test del generador perezoso contra la lista"""
+    modulo = cargar_autocompletar()
+    for n in [0, 1, 5, 100]:
+        assert list(modulo.iter_cuadrados(n)) == modulo.generar_cuadrados(n) == cuadrados(n)
+    assert list(modulo.iter_cuadrados(7, desde=4)) == [16, 25, 36, 49]
+    assert list(modulo.iter_cuadrados(3, desde=5)) == [], "Rango vacío"
+
+
+def test_suma_y_media_cuadrados():
+    """Test de la suma y la media en forma cerrada"""
+    modulo = cargar_autocompletar()
+
+    # Test 1: Coinciden con recorrer los cuadrados
+    for n, desde in [(0, 1), (1, 1), (5, 1), (100, 1), (100, 37), (10, 0)]:
+        esperado = sum(i * i for i in range(desde, n + 1))
+        assert modulo.suma_cuadrados(n, desde) == esperado, f"Falla con {desde}..{n}"
+        cantidad = n - desde + 1
+        assert modulo.media_cuadrados(n, desde) == (esperado / cantidad if cantidad > 0 else 0.0)
+
+    # Test 2: Enteros exactos para n enormes, sin recorrer nada
+    n = 10**9
+    assert modulo.suma_cuadrados(n) == n * (n + 1) * (2 * n + 1) // 6
+    assert modulo.suma_cuadrados(n, n - 2) == (n - 2) ** 2 + (n - 1) ** 2 + n ** 2
+    with pytest.raises(ValueError):
+        modulo.suma_cuadrados(5, -1)
+
+
+def test_cuadrados_numpy():
+    """Test del modo NumPy: tipo del arreglo y desborde de int64"""
+    np = pytest.importorskip("numpy")
+    modulo = cargar_autocompletar()
+
+    # Test 1: Mismos valores que la lista, en int64
+    arreglo = modulo.cuadrados_numpy(100)
+    assert arreglo.dtype == np.int64 and arreglo.tolist() == cuadrados(100)
+    assert modulo.cuadrados_numpy(0).size == 0
+
+    # Test 2: El mayor cuadrado que entra en int64, y el primero que no
+    maximo = modulo.MAX_N_INT64
+    assert modulo.cuadrados_numpy(maximo, maximo).tolist() == [maximo ** 2]
+    with pytest.raises(OverflowError):
+        modulo.cuadrados_numpy(maximo + 1, maximo)
+
+    # Test 3: "auto" pasa a object cuando no entra; "object" es exacto siempre
+    grande = modulo.cuadrados_numpy(maximo + 1, maximo, tipo="auto")
+    assert grande.dtype == object and grande.tolist() == [maximo ** 2, (maximo + 1) ** 2]
+    assert modulo.cuadrados_numpy(5, tipo="auto").dtype == np.int64
+    assert modulo.cuadrados_numpy(3, tipo="object").tolist() == [1, 4, 9]
+    with pytest.raises(ValueError):
+        modulo.cuadrados_numpy(3, tipo="float")
+
+
+def test_listar_cuadrados(tmp_path):
+    """Test del listado por bloques en texto y CSV"""
+    modulo = cargar_autocompletar()
+    ruta = tmp_path / "cuadrados.txt"
+    assert modulo.listar_cuadrados(1000, ruta) == 1000
+    assert ruta.read_text(encoding="utf-8").splitlines() == [f"{i}² = {i * i}" for i in range(1, 1001)]
+
+    ruta = tmp_path / "cuadrados.csv"
+    modulo.listar_cuadrados(3, ruta, "csv")
+    assert ruta.read_text(encoding="utf-8").splitlines() == ["n,cuadrado", "1,1", "2,4", "3,9"]
+
+
 if __name__ == "__main__":
     probar_cuadrados() 
\ No newline at end of file
@@ -0,0 +1,618 @@
+import asyncio
+import csv
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+from itertools import islice
+
+import pytest
+
+import primos
+from primos import (
+    COTA_TABLA_LOTE,
+    PATRONES,
+    RUEDA_210,
+    RUEDA_2310,
+    TablaPrimos,
+    TablasMultiplicativas,
+    activar_cache,
+    analizar_primos,
+    contar_primos,
+    criba_lineal,
+    contar_primos_paralelo,
+    criba_eratostenes,
+    criba_segmentada,
+    desactivar_cache,
+    ejecutar_benchmark,
+    es_primo_basico,
+    es_primo_bpsw,
+    es_primo_determinista,
+    es_primo_miller_rabin,
+    es_primo_optimizado,
+    es_primo_rueda,
+    estadisticas_cache,
+    factorizar,
+    factorizar_lote,
+    guardar_resultados_benchmark,
+    guardar_tabla_primos,
+    guardar_tablas_multiplicativas,
+    iter_bloques_primos_paralelo,
+    iter_primos,
+    medir,
+    mostrar_primos_hasta,
+    primos_rueda_hasta,
+    son_primos,
+    sumar_primos_paralelo,
+    usar_tabla_primos,
+)
+from primos.primalidad import _es_primo_6k
+from primos.servicio import ServicioPrimos, servir_socket
+
+# Números de Carmichael (pasan el test de Fermat en toda base coprima)
+CARMICHAEL = [561, 1105, 1729, 2465, 2821, 6601, 8911, 10585, 15841, 29341, 41041,
+              46657, 52633, 62745, 63973, 75361, 101101, 115921, 126217, 162401,
+              172081, 188461, 252601, 278545, 294409, 314821, 334153, 340561,
+              399001, 410041, 449065, 488881, 512461, 3215031751, 9585921133193329]
+
+# Pseudoprimos fuertes: en base 2 y los menores que engañan a las primeras bases
+PSEUDOPRIMOS_FUERTES = [2047, 3277, 4033, 4681, 8321, 15841, 29341, 42799, 49141,
+                        52633, 65281, 74665, 80581, 85489, 88357, 90751, 1373653,
+                        25326001, 3215031751, 2152302898747, 3474749660383,
+                        341550071728321, 3825123056546413051,
+                        318665857834031151167461, 3317044064679887385961981]
+
+
+def test_criba_segmentada():
+    """Test de la criba segmentada contra la criba clásica"""
+
+    # Test 1: Límites pequeños y bordes
+    for limite in range(0, 200):
+        assert list(criba_segmentada(limite)) == criba_eratostenes(limite), f"Falla con límite {limite}"
+
+    # Test 2: Segmentos pequeños para forzar muchos cortes
+    for tam in (1, 2, 3, 7, 64):
+        assert list(criba_segmentada(5000, tam)) == criba_eratostenes(5000), f"Falla con segmento {tam}"
+
+    # Test 3: Límite mayor que un segmento
+    assert list(criba_segmentada(200000)) == criba_eratostenes(200000), "Debe coincidir con la criba clásica"
+
+    # Test 4: Un segmento vacío o negativo se rechaza en vez de no avanzar nunca
+    for tam in (0, -1):
+        with pytest.raises(ValueError):
+            list(criba_segmentada(100, tam))
+        with pytest.raises(ValueError):
+            next(iter_primos(10, tam))
+
+
+def test_mostrar_primos_hasta_metodos():
+    """Test de los métodos seleccionables de mostrar_primos_hasta"""
+    esperado = criba_eratostenes(3000)
+    for metodo in ("auto", "criba", "segmentada", "optimizado", "rueda"):
+        assert mostrar_primos_hasta(3000, metodo) == esperado, f"Falla el método {metodo}"
+
+
+def test_es_primo_determinista():
+    """Test de Miller-Rabin determinista y BPSW con casos difíciles"""
+
+    # Test 1: Coincide con la criba para números pequeños
+    primos = set(criba_eratostenes(20000))
+    for n in range(-5, 20000):
+        assert es_primo_determinista(n) == (n in primos), f"Falla con {n}"
+        assert es_primo_bpsw(n) == (n in primos), f"BPSW falla con {n}"
+
+    # Test 2: Pseudoprimos fuertes y números de Carmichael
+    compuestos = [561, 1105, 2047, 1373653, 25326001, 3215031751,
+                  3825123056546413051, 318665857834031151167461]
+    for n in compuestos:
+        assert not es_primo_determinista(n), f"{n} es compuesto"
+        assert not es_primo_bpsw(n), f"{n} es compuesto (BPSW)"
+
+    # Test 3: Primos grandes por debajo y por encima de 2^64
+    grandes = [2**31 - 1, 2**61 - 1, 18446744073709551557, 2**64 + 13, 2**89 - 1, 2**127 - 1]
+    for n in grandes:
+        assert es_primo_determinista(n), f"{n} es primo"
+        assert es_primo_optimizado(n), f"{n} es primo (optimizado)"
+        assert es_primo_miller_rabin(n, determinista=True), f"{n} es primo (Miller-Rabin)"
+
+    # Test 4: Productos de primos grandes y cuadrados de primos
+    assert not es_primo_determinista((2**61 - 1) * (2**89 - 1)), "Producto de dos primos"
+    assert not es_primo_determinista((2**31 - 1) ** 2), "Cuadrado de un primo"
+    assert not es_primo_bpsw((2**61 - 1) ** 2), "Cuadrado de un primo (BPSW)"
+
+
+def test_primalidad_diferencial():
+    """Test diferencial: todos los algoritmos deben coincidir entre sí"""
+    random.seed(2024)
+
+    # Test 1: Barrido exhaustivo contra la criba (la versión básica es O(n))
+    primos = set(criba_eratostenes(30000))
+    for n in range(-3, 30000):
+        esperado = n in primos
+        assert es_primo_optimizado(n) == esperado, f"Optimizado falla con {n}"
+        assert es_primo_miller_rabin(n, k=10) == esperado, f"Miller-Rabin falla con {n}"
+        assert es_primo_miller_rabin(n, determinista=True) == esperado, f"Miller-Rabin falla con {n}"
+        if n < 3000:
+            assert es_primo_basico(n) == esperado, f"Básico falla con {n}"
+
+    # Test 2: La criba coincide con la criba segmentada y con un recorrido
+    for limite in [0, 1, 2, 3, 4, 100, 65537, random.randrange(10**5, 10**6)]:
+        esperado = criba_eratostenes(limite)
+        assert list(criba_segmentada(limite)) == esperado, f"Falla con {limite}"
+        assert list(islice(iter_primos(), len(esperado))) == esperado, f"Falla con {limite}"
+
+    # Test 3: Enteros aleatorios hasta 10^10, con la división de prueba como referencia
+    for _ in range(3000):
+        n = random.randrange(2, 10**10)
+        esperado = es_primo_rueda(n)
+        assert es_primo_optimizado(n) == esperado, f"Optimizado falla con {n}"
+        assert es_primo_miller_rabin(n, k=10) == esperado, f"Miller-Rabin falla con {n}"
+        assert es_primo_determinista(n) == esperado, f"Determinista falla con {n}"
+        assert es_primo_bpsw(n) == esperado, f"BPSW falla con {n}"
+
+    # Test 4: Ventana de iter_primos lejos del origen
+    desde = random.randrange(10**9, 10**12)
+    ventana = list(islice(iter_primos(desde), 200))
+    siguiente = desde
+    for p in ventana:
+        while siguiente < p:
+            assert not es_primo_optimizado(siguiente), f"{siguiente} no es primo"
+            siguiente += 1
+        assert es_primo_optimizado(p) and es_primo_bpsw(p), f"{p} es primo"
+        siguiente += 1
+
+
+def test_primalidad_adversaria():
+    """Test con números de Carmichael, pseudoprimos fuertes y cuadrados de primos"""
+    random.seed(2025)
+    primos = criba_eratostenes(2000)
+    grandes = [1000003, 2**31 - 1, 10**9 + 7, 2**61 - 1, 2**89 - 1]
+    cuadrados = [p * p for p in primos + grandes]
+    semiprimos = [p * q for p, q in zip(grandes, grandes[1:])] + [p * (p + 2) for p in primos if p + 2 in primos]
+    compuestos = CARMICHAEL + PSEUDOPRIMOS_FUERTES + cuadrados + semiprimos
+
+    for n in compuestos:
+        assert not es_primo_optimizado(n), f"{n} es compuesto (optimizado)"
+        assert not es_primo_miller_rabin(n, k=20), f"{n} es compuesto (Miller-Rabin)"
+        assert not es_primo_miller_rabin(n, determinista=True), f"{n} es compuesto (Miller-Rabin determinista)"
+        assert not es_primo_bpsw(n), f"{n} es compuesto (BPSW)"
+        if n < 10**6:
+            assert not es_primo_basico(n), f"{n} es compuesto (básico)"
+            assert not es_primo_rueda(n), f"{n} es compuesto (rueda)"
+
+    # Los factores sí son primos
+    for p in grandes:
+        assert es_primo_optimizado(p) and es_primo_miller_rabin(p, k=20), f"{p} es primo"
+
+
+def test_regresion_rendimiento():
+    """Guardia de rendimiento: compara algoritmos entre sí para no depender de la máquina"""
+    def mediana(funcion, *args):
+        return medir(funcion, *args, repeticiones=7, calentamiento=1)["mediana_ns"]
+
+    # Test 1: La rueda no debe ser más lenta que la división 6k±1
+    p = 999999937
+    assert mediana(es_primo_rueda, p) < 1.25 * mediana(_es_primo_6k, p), "Regresión en es_primo_rueda"
+
+    # Test 2: Miller-Rabin determinista muy por debajo de la división de prueba
+    p = 999999999989
+    assert 20 * mediana(es_primo_determinista, p) < mediana(_es_primo_6k, p), "Regresión en es_primo_determinista"
+
+    # Test 3: La criba segmentada más rápida que la criba clásica (consumiendo el generador)
+    segmentada = mediana(lambda n: list(criba_segmentada(n)), 10**6)
+    assert segmentada < 0.8 * mediana(criba_eratostenes, 10**6), "Regresión en criba_segmentada"
+
+
+def test_son_primos():
+    """Test de la API de primalidad en lote"""
+    np = pytest.importorskip("numpy")
+
+    # Test 1: Iterable de enteros pequeños (consulta en la tabla)
+    valores = list(range(-10, 5000))
+    esperado = [es_primo_optimizado(n) for n in valores]
+    assert son_primos(iter(valores)).tolist() == esperado, "Debe coincidir con es_primo_optimizado"
+
+    # Test 2: Valores por encima de la tabla, debajo y encima de 2^32
+    rng = np.random.default_rng(0)
+    for maximo in (10**9, 10**13):
+        arreglo = rng.integers(COTA_TABLA_LOTE, maximo, size=3000)
+        esperado = [es_primo_determinista(int(n)) for n in arreglo]
+        assert son_primos(arreglo).tolist() == esperado, f"Falla con valores hasta {maximo}"
+
+    # Test 3: Forma de la entrada, arreglo vacío y enteros de más de 64 bits
+    assert son_primos(np.array([[2, 4], [7, 9]])).tolist() == [[True, False], [True, False]]
+    assert son_primos([]).size == 0, "Un lote vacío retorna un arreglo vacío"
+    assert son_primos([2**89 - 1, 2**89 + 1]).tolist() == [True, False]
+
+    # Test 4: Los valores no enteros se rechazan en lugar de truncarse
+    assert son_primos([7.0, 8.0]).tolist() == [True, False]
+    for valores in ([7.5], np.array([2, 7.5]), [float("nan")]):
+        with pytest.raises(ValueError):
+            son_primos(valores)
+
+
+def test_iter_primos():
+    """Test del generador infinito de primos"""
+
+    # Test 1: Los primeros primos coinciden con la criba
+    esperado = criba_eratostenes(100000)
+    assert list(islice(iter_primos(), len(esperado))) == esperado, "Debe coincidir con la criba"
+    assert list(islice(iter_primos(tam_segmento=5), 200)) == esperado[:200], "Falla con segmentos pequeños"
+
+    # Test 2: Retomar desde cualquier posición
+    for desde in (0, 1, 2, 3, 4, 97, 98, 5000, 65536):
+        primos = [p for p in esperado if p >= desde][:50]
+        assert list(islice(iter_primos(desde), 50)) == primos, f"Falla desde {desde}"
+
+    # Test 3: Posiciones grandes
+    primos = list(islice(iter_primos(10**12), 5))
+    assert primos[0] >= 10**12, "No debe retornar primos menores a desde"
+    assert all(es_primo_determinista(p) for p in primos), "Todos deben ser primos"
+    assert primos == sorted(primos), "Deben estar ordenados"
+    huecos = [n for n in range(10**12, primos[-1]) if es_primo_determinista(n) and n not in primos]
+    assert huecos == [], "No debe saltear primos"
+
+
+def test_tabla_primos(tmp_path):
+    """Test de la tabla de primos en disco mapeada en memoria"""
+    ruta = tmp_path / "primos.bin"
+    primos = set(criba_eratostenes(100001))
+
+    # Test 1: Consultas sobre toda la tabla, con segmentos que no son múltiplo de 8
+    guardar_tabla_primos(ruta, 100001, tam_segmento=1003)
+    with TablaPrimos(ruta) as tabla:
+        assert tabla.limite == 100001
+        for n in range(100002):
+            assert tabla.es_primo(n) == (n in primos), f"Falla con {n}"
+        assert 100003 not in tabla, "Fuera de la tabla no pertenece"
+
+    # Test 2: es_primo_optimizado usa la tabla activa y sigue funcionando fuera de ella
+    try:
+        usar_tabla_primos(ruta)
+        assert [es_primo_optimizado(n) for n in range(1000)] == [n in primos for n in range(1000)]
+        assert es_primo_optimizado(2**61 - 1), "Fuera de la tabla usa los otros métodos"
+    finally:
+        usar_tabla_primos(None)
+
+    # Test 3: Archivo inválido
+    otro = tmp_path / "otro.bin"
+    otro.write_bytes(b"no es una tabla de primos")
+    with pytest.raises(ValueError):
+        TablaPrimos(otro)
+
+
+def test_criba_paralela():
+    """Test de la criba paralela en varios procesos"""
+    primos = criba_eratostenes(200000)
+
+    # Test 1: Cantidad, suma y bloques con bloques pequeños para forzar muchas tareas
+    assert contar_primos_paralelo(200000, procesos=2, tam_bloque=5000) == len(primos)
+    assert sumar_primos_paralelo(200000, procesos=2, tam_bloque=5000) == sum(primos)
+    bloques = list(iter_bloques_primos_paralelo(200000, procesos=2, tam_bloque=5000))
+    assert [p for bloque in bloques for p in bloque] == primos, "Los bloques deben llegar en orden"
+
+    # Test 2: Límites pequeños
+    for limite in range(0, 30):
+        esperado = criba_eratostenes(limite)
+        assert contar_primos_paralelo(limite, procesos=1) == len(esperado), f"Falla con {limite}"
+        assert sumar_primos_paralelo(limite, procesos=1) == sum(esperado), f"Falla con {limite}"
+
+
+def test_analisis_primos():
+    """Test del análisis de huecos y tuplas contra un cálculo directo"""
+    def esperado(desde, hasta):
+        lista = [p for p in criba_eratostenes(hasta) if p >= desde]
+        conjunto = set(lista)
+        tuplas = {nombre: [p for p in lista if all(p + d in conjunto for d in desplazamientos)]
+                  for nombre, desplazamientos in PATRONES.items()}
+        huecos = [(b - a, a) for a, b in zip(lista, lista[1:])]
+        max_hueco, hueco_desde = max(huecos, key=lambda h: h[0]) if huecos else (0, None)
+        return {
+            "cantidad": len(lista),
+            "primero": lista[0] if lista else None,
+            "ultimo": lista[-1] if lista else None,
+            "max_hueco": max_hueco,
+            "hueco_desde": hueco_desde,
+            "conteos": {nombre: len(t) for nombre, t in tuplas.items()},
+            "posiciones": {nombre: t[:50] for nombre, t in tuplas.items()},
+        }
+
+    # Test 1: Bloques pequeños para forzar tuplas y huecos que cruzan bordes
+    for desde, hasta, tam_bloque in [(0, 100000, 7), (1000, 50000, 333), (3, 20000, 2), (0, 100000, 1 << 22)]:
+        resultado = analizar_primos(hasta, desde, procesos=1, tam_bloque=tam_bloque, max_posiciones=50)
+        assert resultado == esperado(desde, hasta), f"Falla con {(desde, hasta, tam_bloque)}"
+
+    # Test 2: Rangos mínimos
+    for desde, hasta in [(0, 1), (2, 3), (5, 5), (90, 97), (0, 30)]:
+        assert analizar_primos(hasta, desde, procesos=1, max_posiciones=50) == esperado(desde, hasta)
+
+    # Test 3: Varios procesos
+    resultado = analizar_primos(200000, procesos=2, tam_bloque=5000, max_posiciones=50)
+    assert resultado == esperado(0, 200000)
+    assert resultado["conteos"]["gemelos"] == 2160
+
+    # Test 4: Patrones propios; los desplazamientos impares darían conteos erróneos
+    resultado = analizar_primos(10000, procesos=1, patrones={"primos_10": [0, 10]})
+    assert resultado["conteos"]["primos_10"] == sum(1 for p in range(10001) if es_primo_determinista(p)
+                                                     and es_primo_determinista(p + 10) and p + 10 <= 10000)
+    for patron in [(0, 3), (2, 6), (0, 6, 4), (0, 0), (0, -2), (), (0, 2.0)]:
+        with pytest.raises(ValueError):
+            analizar_primos(100, procesos=1, patrones={"malo": patron})
+
+
+def test_contar_primos(monkeypatch):
+    """Test de π(x) contra la criba, con y sin NumPy"""
+    primos = criba_eratostenes(100000)
+    casos = list(range(0, 2000)) + [9999, 10000, 65537, 99999, 100000]
+
+    for sin_numpy in (False, True):
+        if sin_numpy:
+            monkeypatch.setattr("primos.conteo.cargar_numpy", lambda: None)
+        for x in casos:
+            esperado = sum(1 for p in primos if p <= x)
+            assert contar_primos(x) == esperado, f"Falla con x = {x} (sin NumPy: {sin_numpy})"
+
+    # Valores conocidos de π(x)
+    assert contar_primos(10**9) == 50847534, "π(10^9) = 50847534"
+
+
+def test_factorizar():
+    """Test de la factorización con división de prueba y Pollard rho"""
+
+    # Test 1: El producto de los factores es n y todos son primos
+    casos = list(range(1, 3000)) + [600851475143, 2**64 + 1, 10**20 + 1,
+                                    (2**61 - 1) * (2**31 - 1), 1000003 * 1000033 * 1000037,
+                                    (2**89 - 1) * 1000003**2, 3825123056546413051]
+    for n in casos:
+        factores = factorizar(n)
+        assert factores == sorted(factores), f"Los factores de {n} deben estar ordenados"
+        assert math.prod(factores) == n, f"El producto de los factores debe ser {n}"
+        assert all(es_primo_determinista(p) for p in factores), f"Factor no primo para {n}"
+
+    # Test 2: Valores inválidos
+    with pytest.raises(ValueError):
+        factorizar(0)
+
+    # Test 3: El lote coincide con la versión de a uno, dentro y fuera de la tabla SPF
+    valores = list(range(1, 5000)) + [2**61 - 1, 600851475143]
+    assert factorizar_lote(valores) == [factorizar(n) for n in valores], "El lote debe coincidir"
+
+    # Test 4: El lote no trunca los valores no enteros
+    assert factorizar_lote([12.0, 7]) == [[2, 2, 3], [7]]
+    for invalidos in ([7.9], [4, 2.5], [float("nan")]):
+        with pytest.raises(ValueError):
+            factorizar_lote(invalidos)
+
+
+def test_criba_lineal(tmp_path, monkeypatch):
+    """Test de las tablas de funciones multiplicativas"""
+    def esperado(n):
+        if n == 0:
+            return (0, 0, 0, 0)
+        factores = factorizar(n) if n > 1 else []
+        phi = sum(1 for k in range(1, n + 1) if math.gcd(k, n) == 1)
+        mu = 0 if len(set(factores)) < len(factores) else (-1) ** len(factores)
+        divisores = sum(1 for k in range(1, n + 1) if n % k == 0)
+        return (factores[0] if factores else 1, phi, mu, divisores)
+
+    limite = 1000
+    valores = [esperado(n) for n in range(limite + 1)]
+
+    def filas(tablas):
+        columnas = [tablas[nombre] for nombre in ("spf", "phi", "mu", "divisores")]
+        return [tuple(int(c[n]) for c in columnas) for n in range(len(columnas[0]))]
+
+    # Test 1: Con NumPy (si está) y con la criba en Python puro
+    assert filas(criba_lineal(limite)) == valores
+    monkeypatch.setattr("primos.multiplicativas.cargar_numpy", lambda: None)
+    assert filas(criba_lineal(limite)) == valores
+    monkeypatch.undo()
+
+    # Test 2: Límites pequeños y funciones no válidas
+    for n in range(4):
+        assert filas(criba_lineal(n)) == valores[:n + 1], f"Falla con {n}"
+    with pytest.raises(ValueError):
+        criba_lineal(10, ["sigma"])
+
+    # Test 3: Guardar y abrir mapeado en memoria
+    ruta = tmp_path / "multiplicativas.bin"
+    guardar_tablas_multiplicativas(ruta, limite, ["phi", "mu"])
+    with TablasMultiplicativas(ruta) as tablas:
+        assert tablas.limite == limite and tablas.funciones == ["phi", "mu"]
+        assert [tablas["phi"][n] for n in range(limite + 1)] == [v[1] for v in valores]
+        assert list(tablas["mu"]) == [v[2] for v in valores]
+        assert "spf" not in tablas
+    (tmp_path / "otro.bin").write_bytes(b"no es una tabla")
+    with pytest.raises(ValueError):
+        TablasMultiplicativas(tmp_path / "otro.bin")
+
+
+def test_benchmark(tmp_path):
+    """Test del arnés de benchmark y de la exportación de resultados"""
+
+    # Test 1: Estadísticas ordenadas y coherentes
+    estadisticas = medir(es_primo_optimizado, 1000003, repeticiones=5, calentamiento=1)
+    assert estadisticas["repeticiones"] == 5
+    assert 0 < estadisticas["min_ns"] <= estadisticas["mediana_ns"] <= estadisticas["p90_ns"] \
+        <= estadisticas["p99_ns"] <= estadisticas["max_ns"], "Los percentiles deben estar ordenados"
+
+    # Test 2: Barrido de tamaños y exportación a JSON y CSV
+    resultados = ejecutar_benchmark(tamanos=(100, 1000), repeticiones=5, calentamiento=1)
+    algoritmos = {fila["algoritmo"] for fila in resultados}
+    assert {"basico", "6k±1", "miller_rabin", "criba", "criba_segmentada"} <= algoritmos
+
+    guardar_resultados_benchmark(resultados, tmp_path / "resultados.json")
+    datos = json.loads((tmp_path / "resultados.json").read_text(encoding="utf-8"))
+    assert datos["resultados"] == resultados, "El JSON debe conservar los resultados"
+
+    guardar_resultados_benchmark(resultados, tmp_path / "resultados.csv")
+    with open(tmp_path / "resultados.csv", encoding="utf-8") as archivo:
+        filas = list(csv.DictReader(archivo))
+    assert len(filas) == len(resultados), "El CSV debe tener una fila por medición"
+
+
+def test_importacion_sin_efectos():
+    """Test de que importar los módulos de primos no ejecuta nada"""
+    codigo = "import sys, primos; print('primos.criba' in sys.modules)"
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    assert salida == "False\n", "Importar el paquete no debe cargar los submódulos"
+
+    codigo = "import sys, ejercicio_numerosprimos, numeros_primos; print('numpy' in sys.modules)"
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    assert salida == "False\n", "Importar los programas no debe imprimir nada ni cargar NumPy"
+
+    codigo = "import sys, ejercicio_numerosprimos; print('asyncio' in sys.modules, 'multiprocessing' in sys.modules)"
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    assert salida == "False False\n", "El servicio solo se importa con --servicio"
+
+    codigo = ("import sys, ejercicio_numerosprimos; "
+              "print(sorted(m for m in sys.modules if m.startswith('primos.')))")
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    assert salida == "[]\n", "Importar el programa no debe cargar los submódulos (ni benchmark)"
+
+    # Los nombres públicos se cargan bajo demanda
+    assert "es_primo_optimizado" in dir(primos)
+    with pytest.raises(AttributeError):
+        primos.no_existe
+
+    # El programa sigue exponiendo los nombres que antes definía
+    import ejercicio_numerosprimos
+    from ejercicio_numerosprimos import BASES_MILLER_RABIN, criba_eratostenes, es_primo_basico
+    assert criba_eratostenes(30) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    assert es_primo_basico(97) and BASES_MILLER_RABIN[0] == (2047, (2,))
+    assert ejercicio_numerosprimos.contar_primos(100) == 25
+    with pytest.raises(AttributeError):
+        ejercicio_numerosprimos.no_existe
+
+
+def test_cache_primalidad(monkeypatch):
+    """Test de la caché de primalidad y sus contadores"""
+    try:
+        cache = activar_cache(cota_densa=1000, tam_lru=3)
+        primos_conocidos = set(criba_eratostenes(1000))
+
+        # Test 1: Valores pequeños desde el bitset denso
+        assert [es_primo_optimizado(n) for n in range(1001)] == [n in primos_conocidos for n in range(1001)]
+        assert estadisticas_cache()["aciertos_densa"] == 1001
+
+        # Test 2: Valores grandes en la LRU, compartida por todas las pruebas
+        grandes = [2**61 - 1, 2**61 + 1, 1000003]
+        assert [es_primo_determinista(n) for n in grandes] == [True, False, True]
+        assert es_primo_optimizado(2**61 - 1) and es_primo_miller_rabin(1000003)
+        estadisticas = estadisticas_cache()
+        assert (estadisticas["fallos"], estadisticas["aciertos_lru"]) == (3, 2), "Una consulta = un conteo"
+
+        # Test 3: Desalojo al superar el tamaño de la LRU
+        assert es_primo_bpsw(2**89 - 1)
+        estadisticas = estadisticas_cache()
+        assert estadisticas["desalojos"] == 1 and estadisticas["tamano_lru"] == 3
+        assert 0 < estadisticas["tasa_aciertos"] < 1
+
+        # Test 4: Contadores exactos con varios hilos en ambos caminos
+        from concurrent.futures import ThreadPoolExecutor
+        cache.limpiar()
+        valores = list(range(1001)) + grandes
+        with ThreadPoolExecutor(8) as hilos:
+            list(hilos.map(lambda _: [es_primo_optimizado(n) for n in valores], range(16)))
+        estadisticas = estadisticas_cache()
+        assert estadisticas["aciertos_densa"] == 16 * 1001
+        assert estadisticas["aciertos_lru"] + estadisticas["fallos"] == 16 * len(grandes)
+
+        # Test 5: Una respuesta de Miller-Rabin con bases al azar no se guarda,
+        # así que no la reciben las pruebas exactas; la exacta sí la recibe él
+        import primos.primalidad as primalidad_modulo
+        cache.limpiar()
+        pseudoprimo = 3215031751  # fuerte para las bases 2, 3, 5 y 7
+        with monkeypatch.context() as parche:
+            parche.setattr(primalidad_modulo.random, "randint", lambda a, b: 2)
+            assert es_primo_miller_rabin(pseudoprimo, k=1)
+        assert estadisticas_cache()["tamano_lru"] == 0
+        assert not es_primo_determinista(pseudoprimo) and not es_primo_bpsw(pseudoprimo)
+        assert not es_primo_optimizado(pseudoprimo) and not es_primo_miller_rabin(pseudoprimo, k=1)
+        assert not es_primo_miller_rabin(pseudoprimo, determinista=True)
+        estadisticas = estadisticas_cache()
+        assert (estadisticas["fallos"], estadisticas["aciertos_lru"]) == (2, 4)
+
+        cache.limpiar()
+        assert estadisticas_cache()["fallos"] == 0
+    finally:
+        desactivar_cache()
+    assert estadisticas_cache() is None
+
+
+def test_rueda():
+    """Test de la división de prueba con ruedas 210 y 2310"""
+    esperado = criba_eratostenes(30000)
+    conjunto = set(esperado)
+
+    for rueda in (RUEDA_210, RUEDA_2310):
+        # Test 1: Fracción de candidatos que deja la rueda
+        assert len(rueda.residuos) == {210: 48, 2310: 480}[rueda.modulo]
+
+        # Test 2: Números individuales y rangos
+        for n in list(range(-2, 30000)) + [2**31 - 1, 2309 * 2311, 211 * 211]:
+            assert es_primo_rueda(n, rueda) == (n in conjunto or n == 2**31 - 1), f"Falla con {n}"
+        assert primos_rueda_hasta(30000, rueda) == esperado, f"Falla el rango con la rueda {rueda.modulo}"
+
+    assert mostrar_primos_hasta(5000, "rueda") == criba_eratostenes(5000)
+
+
+def test_servicio(tmp_path):
+    """Test del servicio asyncio con micro-lotes"""
+
+    async def escenario():
+        async with ServicioPrimos(procesos=1, tam_lote=8) as servicio:
+            # Test 1: Peticiones concurrentes, agrupadas en varios lotes
+            peticiones = [{"id": n, "op": "es_primo", "n": n} for n in range(50)]
+            respuestas = await asyncio.gather(*(servicio.resolver(p) for p in peticiones))
+            assert [r["resultado"] for r in respuestas] == [es_primo_optimizado(n) for n in range(50)]
+            assert all(r["latencia_ms"] >= 0 for r in respuestas), "Cada respuesta informa su latencia"
+
+            # Test 2: Otras operaciones y errores
+            respuesta = await servicio.resolver({"id": "a", "op": "factorizar", "n": 360})
+            assert respuesta["resultado"] == [2, 2, 2, 3, 3, 5]
+            assert "error" in await servicio.resolver({"id": "b", "op": "factorizar", "n": 0})
+            assert "error" in await servicio.resolver({"id": "c", "op": "raiz", "n": 4})
+            assert "error" in json.loads(await servicio.resolver_linea("no es json"))
+            assert "error" in json.loads(await servicio.resolver_linea('{"op": "es_primo", "n": %s}' % ("9" * 5000)))
+
+            # Test 3: Cada operación rechaza los n demasiado grandes sin calcular
+            for op, n in [("factorizar", 2**64 + 1), ("contar_primos", 10**13), ("primos_hasta", 10**8),
+                          ("es_primo", 2**2049)]:
+                respuesta = await servicio.resolver({"id": op, "op": op, "n": n})
+                assert "admite" in respuesta["error"], f"Falla el límite de {op}"
+
+        # Test 4: Socket Unix con peticiones encadenadas en una conexión (más que MAX_PENDIENTES)
+        ruta = str(tmp_path / "primos.sock")
+        servidor = asyncio.create_task(servir_socket(ruta, procesos=1))
+        while not os.path.exists(ruta):
+            await asyncio.sleep(0.01)
+        lector, escritor = await asyncio.open_unix_connection(ruta)
+        escritor.write(b'{"id": -1, "op": "contar_primos", "n": 1000}\n')
+        escritor.write("".join(f'{{"id": {n}, "op": "es_primo", "n": {n}}}\n' for n in range(3000)).encode())
+        await escritor.drain()
+        respuestas = {}
+        for _ in range(3001):
+            respuesta = json.loads(await lector.readline())
+            respuestas[respuesta["id"]] = respuesta["resultado"]
+        assert respuestas[-1] == 168 and sum(respuestas[n] for n in range(3000)) == 430
+        escritor.close()
+        servidor.cancel()
+
+    asyncio.run(escenario())
+
+    # Test 5: stdin redirigido desde un archivo común (no es una tubería)
+    peticiones = tmp_path / "peticiones.jsonl"
+    peticiones.write_text('{"id": 1, "op": "es_primo", "n": 97}\n\n{"id": 2, "op": "factorizar", "n": 360}\n')
+    with open(peticiones, "rb") as entrada:
+        salida = subprocess.run([sys.executable, "-m", "primos.servicio", "--procesos", "1"], stdin=entrada,
+                                capture_output=True, text=True, timeout=60, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    respuestas = {r["id"]: r["resultado"] for r in map(json.loads, salida.splitlines())}
+    assert respuestas == {1: True, 2: [2, 2, 2, 3, 3, 5]}
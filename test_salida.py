@@ -0,0 +1,62 @@
+import csv
+import io
+
+import pytest
+
+from salida import EscritorFilas, escribir_filas, leer_binario
+
+
+def test_salida_por_bloques(tmp_path, capsys):
+    """Test del escritor por bloques en texto, CSV y binario"""
+    import numeros_primos
+    from primos import criba_eratostenes
+
+    filas = [(n, n * n) for n in range(1, 1001)]
+
+    # Test 1: Bloques pequeños en los tres formatos, a archivo
+    with EscritorFilas(tmp_path / "s.txt", plantilla="{}² = {}", tam_bloque=7) as escritor:
+        assert escritor.escribir(iter(filas)) == len(filas)
+    esperado = "".join(f"{n}² = {c}\n" for n, c in filas)
+    assert (tmp_path / "s.txt").read_text(encoding="utf-8") == esperado
+
+    with EscritorFilas(tmp_path / "s.csv", "csv", encabezado=("n", "cuadrado"), tam_bloque=7) as escritor:
+        escritor.escribir(filas)
+    with open(tmp_path / "s.csv", newline="", encoding="utf-8") as archivo:
+        assert [tuple(map(int, f)) for f in list(csv.reader(archivo))[1:]] == filas
+
+    with EscritorFilas(tmp_path / "s.bin", "binario", tam_bloque=7) as escritor:
+        escritor.escribir(filas)
+    assert leer_binario(tmp_path / "s.bin", 2) == filas
+
+    # Test 2: A stdout, después de un print, sin desordenar la salida
+    print("antes")
+    assert numeros_primos.listar_primos(30) == 10
+    assert capsys.readouterr().out.split() == ["antes"] + [str(p) for p in criba_eratostenes(30)]
+
+    with pytest.raises(ValueError):
+        EscritorFilas(formato="xml")
+
+
+def test_salida_codificacion():
+    """Test de la codificación según el flujo de destino"""
+    filas = [(2, 4), (3, 9)]
+
+    # Test 1: Se respeta la codificación declarada por el flujo (consola cp1252)
+    consola = io.TextIOWrapper(io.BytesIO(), encoding="cp1252")
+    escribir_filas(filas, consola, plantilla="{}² = {}")
+    assert consola.buffer.getvalue() == "2² = 4\n3² = 9\n".encode("cp1252")
+
+    # Test 2: Y su política de errores
+    ascii_ = io.TextIOWrapper(io.BytesIO(), encoding="ascii", errors="replace")
+    escribir_filas(filas, ascii_, plantilla="{}² = {}")
+    assert ascii_.buffer.getvalue() == b"2? = 4\n3? = 9\n"
+
+    # Test 3: Un flujo de texto sin .buffer recibe str; uno binario, UTF-8
+    texto = io.StringIO()
+    escribir_filas(filas, texto, "csv", encabezado=("n", "cuadrado"))
+    assert texto.getvalue() == "n,cuadrado\n2,4\n3,9\n"
+    binario = io.BytesIO()
+    escribir_filas(filas, binario, plantilla="{}² = {}")
+    assert binario.getvalue().decode("utf-8") == "2² = 4\n3² = 9\n"
+    with pytest.raises(ValueError):
+        EscritorFilas(io.StringIO(), "binario")